@@ -98,6 +98,79 @@ def run_simulation(params, N=200, seed=0, return_samples=False):
     del imp, res, vola; gc.collect()
     return None, summary
 ''',
+"src/sim/sketch.py": '''# src/sim/sketch.py
+# Mergeable quantile sketch (merging t-digest, arcsin scale function).
+# Memory is bounded by ~delta centroids, independent of the number of samples.
+from pathlib import Path
+import numpy as np
+
+class QuantileSketch:
+    def __init__(self, delta=200, buffer_size=None):
+        self.delta = float(delta)
+        self.buffer_size = int(buffer_size or 10 * delta)
+        self.means = np.empty(0); self.weights = np.empty(0)
+        self._buf = []; self._buf_n = 0
+        self.count = 0; self.min = np.inf; self.max = -np.inf
+
+    def update(self, values, weights=None):
+        x = np.asarray(values, dtype=float).ravel()
+        w = np.ones_like(x) if weights is None else np.asarray(weights, dtype=float).ravel()
+        keep = np.isfinite(x); x, w = x[keep], w[keep]
+        if x.size == 0: return self
+        self.count += w.sum(); self.min = min(self.min, x.min()); self.max = max(self.max, x.max())
+        self._buf.append((x, w)); self._buf_n += x.size
+        if self._buf_n >= self.buffer_size: self._compress()
+        return self
+
+    def merge(self, other):
+        other._compress()
+        if other.means.size:
+            self._buf.append((other.means, other.weights)); self._buf_n += other.means.size
+            self.count += other.count; self.min = min(self.min, other.min); self.max = max(self.max, other.max)
+            self._compress()
+        return self
+
+    def _compress(self):
+        if not self._buf: return
+        x = np.concatenate([self.means] + [b[0] for b in self._buf])
+        w = np.concatenate([self.weights] + [b[1] for b in self._buf])
+        self._buf = []; self._buf_n = 0
+        order = np.argsort(x, kind="mergesort"); x, w = x[order], w[order]
+        cw = np.cumsum(w); total = cw[-1]
+        q = (cw - 0.5 * w) / total
+        # k1 scale: small centroids in the tails, large ones around the median
+        k = self.delta / (2 * np.pi) * np.arcsin(np.clip(2 * q - 1, -1, 1))
+        group = np.floor(k - k[0]).astype(np.int64)
+        group = np.concatenate([[0], np.cumsum(np.diff(group) != 0)])  # k is monotone -> dense ids
+        wsum = np.bincount(group, weights=w)
+        self.means = np.bincount(group, weights=w * x) / wsum
+        self.weights = wsum
+
+    def quantile(self, qs):
+        self._compress()
+        qs = np.atleast_1d(np.asarray(qs, dtype=float))
+        if self.means.size == 0: return np.full(qs.shape, np.nan)
+        if self.means.size == 1: return np.full(qs.shape, self.means[0])
+        cw = np.cumsum(self.weights)
+        pos = np.concatenate([[0.0], cw - 0.5 * self.weights, [self.count]])
+        vals = np.concatenate([[self.min], self.means, [self.max]])
+        return np.interp(qs * self.count, pos, vals)
+
+class ParquetSink:
+    """Optional raw-sample export: appends chunks to one Parquet file (needs pyarrow)."""
+    def __init__(self, path, columns):
+        import pyarrow as pa, pyarrow.parquet as pq
+        self._pa, self._pq = pa, pq
+        self.path = Path(path); self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.columns = list(columns)
+        self.schema = pa.schema([(c, pa.float32()) for c in self.columns])
+        self._writer = pq.ParquetWriter(str(self.path), self.schema)
+    def write(self, block):
+        arrays = [self._pa.array(np.asarray(block[:, j], dtype=np.float32)) for j in range(len(self.columns))]
+        self._writer.write_table(self._pa.Table.from_arrays(arrays, schema=self.schema))
+    def close(self):
+        if self._writer is not None: self._writer.close(); self._writer = None
+''',
 "src/sim/extended.py": '''import numpy as np, pandas as pd, gc
 # src/sim/extended.py
 import time
@@ -107,6 +180,10 @@ import numpy as np
 import pandas as pd
 from ..utils.validators import sanitize_params
 from ..config import DATA_DIR
+from .sketch import QuantileSketch, ParquetSink
+
+COLS = ["importkosten_mult", "netto_resilienz", "system_volatilitaet"]
+QUANTILES = [0.05, 0.5, 0.95]
 
 def _compute_bases_extended(p):
     base_import = 1.0 + 0.6*p["USD_Dominanz"] + 0.5*p["Liquiditaetsaufschlag"] - 0.3*p["CBDC_Nutzung"]
@@ -126,12 +203,15 @@ def _compute_bases_extended(p):
 
 def run_simulation_extended(params, N=200, seed=0, return_samples=False,
                             use_chunk=None, chunk=50,
-                            save_samples_to_csv=False, csv_name=None):
+                            save_samples_to_parquet=False, parquet_name=None,
+                            sketch_delta=200):
     """
     Generate N samples for importkosten_mult, netto_resilienz, system_volatilitaet.
-    If save_samples_to_csv is True, samples are appended to CSV in DATA_DIR and
-    the function returns (csv_path, summary) when return_samples=True or (csv_path, summary) otherwise.
-    If return_samples=True and save_samples_to_csv=False, returns (samples_df, summary).
+    In chunk mode without return_samples the summary (p05/median/p95) comes from
+    mergeable quantile sketches updated per chunk: one pass, O(1) memory, no spill.
+    If save_samples_to_parquet is True, raw samples are streamed to a Parquet file
+    in DATA_DIR (optional sink) and (parquet_path, summary) is returned.
+    If return_samples=True, returns (samples_df, summary) with exact percentiles.
     """
     rng = np.random.default_rng(int(seed))
     p = sanitize_params(params)
@@ -139,136 +219,121 @@ def run_simulation_extended(params, N=200, seed=0, return_samples=False,
     N = int(max(0, N))
     use_chunk = (use_chunk if use_chunk is not None else (N > 2000))
     chunk = int(max(1, chunk))
-    csv_path = None
-
-    if save_samples_to_csv:
-        DATA_DIR.mkdir(parents=True, exist_ok=True)
-        if csv_name is None:
-            csv_name = f"samples_ext_seed{int(seed)}_N{N}_{int(time.time())}.csv"
-        csv_path = Path(DATA_DIR) / csv_name
-        # ensure header will be written on first chunk
-        if csv_path.exists():
-            csv_path.unlink()
-
-    imp_parts = []
-    res_parts = []
-    vola_parts = []
-    generated = 0
-    first_chunk = True
 
-    if use_chunk and N > 0:
+    if N == 0:
+        empty = pd.DataFrame(index=COLS, data={"p05":[float("nan")]*3,"median":[float("nan")]*3,"p95":[float("nan")]*3})
+        if return_samples:
+            return pd.DataFrame(columns=COLS), empty
+        return None, empty
+
+    sink = None
+    if save_samples_to_parquet:
+        if parquet_name is None:
+            parquet_name = f"samples_ext_seed{int(seed)}_N{N}_{int(time.time())}.parquet"
+        sink = ParquetSink(Path(DATA_DIR) / parquet_name, COLS)
+
+    def _draw(m):
+        imp = rng.normal(loc=base_import, scale=0.05, size=m).astype(np.float32)
+        res = rng.normal(loc=base_resil,  scale=0.03, size=m).astype(np.float32)
+        vola = rng.normal(loc=base_vola,   scale=0.02, size=m).astype(np.float32)
+        return np.column_stack([imp, res, np.clip(vola, 0.0, None)])
+
+    # streaming: sketches instead of keeping every value in memory
+    stream = use_chunk and not return_samples
+    # chunk size only bounds memory; larger draws keep per-chunk overhead low
+    step = max(chunk, 65536) if stream else (chunk if use_chunk else N)
+    sketches = [QuantileSketch(delta=sketch_delta) for _ in COLS] if stream else None
+    parts = []
+    generated = 0
+    try:
         while generated < N:
-            m = min(chunk, N - generated)
-            imp = rng.normal(loc=base_import, scale=0.05, size=m).astype(np.float32)
-            res = rng.normal(loc=base_resil,  scale=0.03, size=m).astype(np.float32)
-            vola = rng.normal(loc=base_vola,   scale=0.02, size=m).astype(np.float32)
-            vola = np.clip(vola, 0.0, None)
-
-            if save_samples_to_csv:
-                df_chunk = pd.DataFrame({
-                    "importkosten_mult": imp,
-                    "netto_resilienz": res,
-                    "system_volatilitaet": vola
-                })
-                df_chunk.to_csv(csv_path, mode="a", index=False, header=first_chunk)
-                first_chunk = False
-                del df_chunk
+            m = min(step, N - generated)
+            block = _draw(m)
+            if sink is not None:
+                sink.write(block)
+            if stream:
+                for j, sk in enumerate(sketches):
+                    sk.update(block[:, j])
             else:
-                imp_parts.append(imp); res_parts.append(res); vola_parts.append(vola)
-
+                parts.append(block)
             generated += m
+    finally:
+        if sink is not None:
+            sink.close()
 
+    if stream:
+        qs = np.array([sk.quantile(QUANTILES) for sk in sketches])
+        samples = None
     else:
-        if N > 0:
-            imp = rng.normal(loc=base_import, scale=0.05, size=N).astype(np.float32)
-            res = rng.normal(loc=base_resil,  scale=0.03, size=N).astype(np.float32)
-            vola = rng.normal(loc=base_vola,   scale=0.02, size=N).astype(np.float32)
-            vola = np.clip(vola, 0.0, None)
-            if save_samples_to_csv:
-                df = pd.DataFrame({
-                    "importkosten_mult": imp,
-                    "netto_resilienz": res,
-                    "system_volatilitaet": vola
-                })
-                DATA_DIR.mkdir(parents=True, exist_ok=True)
-                df.to_csv(Path(DATA_DIR) / (csv_name or "samples.csv"), index=False)
-                del df
-            else:
-                imp_parts.append(imp); res_parts.append(res); vola_parts.append(vola)
+        samples = np.concatenate(parts) if len(parts) > 1 else parts[0]
+        qs = np.percentile(samples, [q * 100 for q in QUANTILES], axis=0).T  # one call for all columns
+        del parts
 
-    # If no samples were generated (N == 0)
-    if len(imp_parts) == 0 and not save_samples_to_csv:
-        empty = pd.DataFrame(index=["importkosten_mult","netto_resilienz","system_volatilitaet"],
-                             data={"p05":[float("nan")]*3,"median":[float("nan")]*3,"p95":[float("nan")]*3})
-        if return_samples:
-            return pd.DataFrame(columns=["importkosten_mult","netto_resilienz","system_volatilitaet"]), empty
-        return None, empty
-
-    # If samples were stored in memory, concatenate
-    if not save_samples_to_csv:
-        imp_all = np.concatenate(imp_parts).astype(np.float32)
-        res_all = np.concatenate(res_parts).astype(np.float32)
-        vola_all = np.concatenate(vola_parts).astype(np.float32)
-    else:
-        # read back CSV to compute summary in a memory-efficient way using chunks
-        csv_path = Path(csv_path) if csv_path is not None else None
-        if csv_path is None or not csv_path.exists():
-            # fallback: no CSV present
-            imp_all = np.array([], dtype=np.float32)
-            res_all = np.array([], dtype=np.float32)
-            vola_all = np.array([], dtype=np.float32)
-        else:
-            # compute percentiles by streaming through CSV in chunks
-            imp_vals = []
-            res_vals = []
-            vola_vals = []
-            for chunk_df in pd.read_csv(csv_path, chunksize=100000):
-                imp_vals.append(chunk_df["importkosten_mult"].to_numpy(dtype=np.float32))
-                res_vals.append(chunk_df["netto_resilienz"].to_numpy(dtype=np.float32))
-                vola_vals.append(chunk_df["system_volatilitaet"].to_numpy(dtype=np.float32))
-            imp_all = np.concatenate(imp_vals) if len(imp_vals) else np.array([], dtype=np.float32)
-            res_all = np.concatenate(res_vals) if len(res_vals) else np.array([], dtype=np.float32)
-            vola_all = np.concatenate(vola_vals) if len(vola_vals) else np.array([], dtype=np.float32)
-
-    # compute percentiles and summary
-    q05 = (np.percentile(imp_all,5) if imp_all.size else float("nan"),
-           np.percentile(res_all,5) if res_all.size else float("nan"),
-           np.percentile(vola_all,5) if vola_all.size else float("nan"))
-    q50 = (np.percentile(imp_all,50) if imp_all.size else float("nan"),
-           np.percentile(res_all,50) if res_all.size else float("nan"),
-           np.percentile(vola_all,50) if vola_all.size else float("nan"))
-    q95 = (np.percentile(imp_all,95) if imp_all.size else float("nan"),
-           np.percentile(res_all,95) if res_all.size else float("nan"),
-           np.percentile(vola_all,95) if vola_all.size else float("nan"))
-
-    summary = pd.DataFrame({
-        "p05":[q05[0],q05[1],q05[2]],
-        "median":[q50[0],q50[1],q50[2]],
-        "p95":[q95[0],q95[1],q95[2]]
-    }, index=["importkosten_mult","netto_resilienz","system_volatilitaet"])
+    summary = pd.DataFrame(qs, index=COLS, columns=["p05", "median", "p95"])
 
     if return_samples:
-        if save_samples_to_csv:
-            # return csv path and summary
-            return csv_path, summary
-        samples = pd.DataFrame({
-            "importkosten_mult": imp_all,
-            "netto_resilienz": res_all,
-            "system_volatilitaet": vola_all
-        })
-        del imp_parts, res_parts, vola_parts, imp_all, res_all, vola_all
-        gc.collect()
-        return samples, summary
+        if sink is not None:
+            return sink.path, summary
+        return pd.DataFrame(samples, columns=COLS), summary
 
-    del imp_parts, res_parts, vola_parts, imp_all, res_all, vola_all
+    del samples
     gc.collect()
+    if sink is not None:
+        return sink.path, summary
     return None, summary
 
 ''',
+"src/sim/parallel.py": '''# src/sim/parallel.py
+# Deterministischer Multi-Prozess-Runner: Blöcke fester Größe mit eigenen Strömen aus
+# SeedSequence(seed).spawn(k); Ergebnis ist unabhängig von der Anzahl Worker.
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np, pandas as pd
+from ..utils.validators import sanitize_params
+from .extended import _compute_bases_extended
+
+COLS = ["importkosten_mult", "netto_resilienz", "system_volatilitaet"]
+
+def _compute_bases(p):
+    base_import = 1.0 + 0.6*p["USD_Dominanz"] + 0.5*p["Liquiditaetsaufschlag"] - 0.3*p["CBDC_Nutzung"]
+    base_resil  = 0.5 + 0.5*p["Golddeckung"] + 0.3*p["Alternativnetz_Abdeckung"] + 0.1*p["CBDC_Nutzung"]
+    base_vola   = 0.03 + 0.08*p["FX_Schockempfindlichkeit"] + 0.05*(1-p["Zugangsresilienz"])
+    return base_import, base_resil, base_vola
+
+def _sim_block(task):
+    n, seed_seq, p, extended = task
+    rng = np.random.default_rng(seed_seq)
+    b_imp, b_res, b_vola = _compute_bases_extended(p) if extended else _compute_bases(p)
+    imp  = rng.normal(loc=b_imp,  scale=0.05, size=n).astype(np.float32)
+    res  = rng.normal(loc=b_res,  scale=0.03, size=n).astype(np.float32)
+    vola = rng.normal(loc=b_vola, scale=0.02, size=n).astype(np.float32)
+    if extended: vola = np.clip(vola, 0.0, None)
+    return np.column_stack([imp, res, vola])
+
+def run_simulation_parallel(params, N=200, seed=0, n_workers=None, block_size=10000,
+                            extended=False, return_samples=False):
+    """
+    Wie run_simulation / run_simulation_extended, aber über einen Prozess-Pool verteilt.
+    Die Zufallsströme hängen nur von seed und block_size ab, nicht von n_workers.
+    """
+    p = sanitize_params(params); N = int(max(0, N)); block_size = int(max(1, block_size))
+    sizes = [block_size] * (N // block_size) + ([N % block_size] if N % block_size else [])
+    tasks = [(n, ss, p, extended) for n, ss in zip(sizes, np.random.SeedSequence(int(seed)).spawn(len(sizes)))]
+    n_workers = max(1, min(int(n_workers or os.cpu_count() or 1), len(tasks) or 1))
+    if n_workers == 1: parts = [_sim_block(t) for t in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers) as ex: parts = list(ex.map(_sim_block, tasks))
+    data = np.concatenate(parts) if parts else np.empty((0, 3), dtype=np.float32)
+    samples = pd.DataFrame(data, columns=COLS)
+    summary = samples.quantile([0.05,0.5,0.95]).T; summary.columns = ["p05","median","p95"]
+    if return_samples: return samples, summary
+    return None, summary
+''',
 "src/sim/dynamic.py": '''from .extended import run_simulation_extended
 from .extended import run_simulation_extended
 from .core import run_simulation
-from ..utils.validators import sanitize_params
+from ..utils.validators import sanitize_params, merge_with_defaults
+import numpy as np
 import pandas as pd
 
 PRESET_SCENARIOS = {"Baseline (keine Trends)": {"annual_trends": {}, "shock_events": []}}
@@ -285,7 +350,7 @@ def simulate_dynamic_years(
     allow_0_2_for_verschuldung=True,
     use_chunk_for_large_N=True,
     chunk=100,
-    force_csv=False
+    export_samples=False
 ):
     annual_trends = annual_trends or {}
     shock_events = shock_events or []
@@ -315,7 +380,7 @@ def simulate_dynamic_years(
         local_seed = int(seed) + year
 
         if extended:
-            use_csv = (int(N) > 5000) or bool(force_csv)
+            # large N streams through quantile sketches; raw samples only on request
             use_chunk = (use_chunk_for_large_N and int(N) > 2000)
             _, summary = run_simulation_extended(
                 p,
@@ -324,8 +389,8 @@ def simulate_dynamic_years(
                 return_samples=False,
                 use_chunk=use_chunk,
                 chunk=chunk,
-                save_samples_to_csv=use_csv,
-                csv_name=f"dyn_seed{local_seed}_year{year}.csv" if use_csv else None
+                save_samples_to_parquet=bool(export_samples),
+                parquet_name=f"dyn_seed{local_seed}_year{year}.parquet" if export_samples else None
             )
         else:
             _, summary = run_simulation(p, N=N, seed=local_seed, return_samples=False)
@@ -352,6 +417,104 @@ def simulate_dynamic_years(
         })
 
     return pd.DataFrame(results)
+
+# --- vectorized panel: (countries x years x params) tensor, one batched draw ---
+PANEL_KEYS = ["USD_Dominanz", "Liquiditaetsaufschlag", "CBDC_Nutzung", "Golddeckung",
+              "Alternativnetz_Abdeckung", "FX_Schockempfindlichkeit", "Zugangsresilienz",
+              "innovation", "fachkraefte", "energie", "stabilitaet", "verschuldung", "demokratie"]
+# same bounds as sanitize_params
+PANEL_BOUNDS = {k: (0.0, 1.0) for k in PANEL_KEYS}
+PANEL_BOUNDS["FX_Schockempfindlichkeit"] = (0.0, 2.0)
+PANEL_BOUNDS["verschuldung"] = (0.0, 2.0)
+
+def build_param_tensor(countries, years=20, annual_trends=None, shock_events=None,
+                       country_trends=None, clamp=True, allow_0_2_for_verschuldung=True):
+    """
+    countries: dict name -> params (e.g. from profiles.yaml/presets).
+    Returns (names, tensor) with tensor shape (countries, years, len(PANEL_KEYS)).
+    Trends/shocks accumulate year over year exactly like simulate_dynamic_years,
+    including keys missing from a country's params: like the loop, such a key
+    starts at 0.0 once a trend/shock touches it (with clamp, only if touched in
+    year 1 - afterwards the first sanitize has already filled in the default).
+    """
+    names = list(countries.keys())
+    C, Y, K = len(names), int(years), len(PANEL_KEYS)
+    base = np.array([[float(merge_with_defaults(countries[n]).get(k, 0.0)) for k in PANEL_KEYS]
+                     for n in names]).reshape(C, K)
+
+    delta = np.zeros((C, Y, K)); touched = np.zeros((C, Y, K), dtype=bool)
+    for k, d in (annual_trends or {}).items():
+        if k in PANEL_KEYS: delta[:, :, PANEL_KEYS.index(k)] += float(d); touched[:, :, PANEL_KEYS.index(k)] = True
+    for ci, n in enumerate(names):
+        for k, d in ((country_trends or {}).get(n) or {}).items():
+            if k in PANEL_KEYS: delta[ci, :, PANEL_KEYS.index(k)] += float(d); touched[ci, :, PANEL_KEYS.index(k)] = True
+    for e in shock_events or []:
+        if isinstance(e, dict) and "year" in e and "changes" in e and 1 <= int(e["year"]) <= Y:
+            for k, d in e["changes"].items():
+                if k in PANEL_KEYS:
+                    delta[:, int(e["year"]) - 1, PANEL_KEYS.index(k)] += float(d)
+                    touched[:, int(e["year"]) - 1, PANEL_KEYS.index(k)] = True
+    # keys missing from a country's params start at 0.0 in the loop (p.get(k, 0.0) + delta)
+    missing = np.array([[k not in (countries[n] or {}) for k in PANEL_KEYS] for n in names]).reshape(C, K)
+
+    lo = np.array([PANEL_BOUNDS[k][0] for k in PANEL_KEYS]); hi = np.array([PANEL_BOUNDS[k][1] for k in PANEL_KEYS])
+    iv = PANEL_KEYS.index("verschuldung")
+    if not clamp:
+        # run_simulation* still sanitizes each year's copy, without carrying the clip forward;
+        # a missing key keeps its default until first touched, then accumulates from 0.0
+        cum = np.cumsum(delta, axis=1)
+        from_zero = missing[:, None, :] & (np.cumsum(touched, axis=1) > 0)
+        return names, np.clip(np.where(from_zero, cum, base[:, None, :] + cum), lo, hi)
+    # clipping is path dependent (clipped value carries forward) -> cheap loop over years only
+    out = np.empty((C, Y, K)); cur = np.where(missing & touched[:, 0], 0.0, base)
+    for y in range(Y):
+        cur = np.clip(cur + delta[:, y], lo, hi)
+        if not allow_0_2_for_verschuldung: cur[:, iv] = cur[:, iv] / 2.0
+        out[:, y] = cur
+    return names, out
+
+def _panel_bases(T, extended=False):
+    g = {k: T[..., i] for i, k in enumerate(PANEL_KEYS)}
+    imp = 1.0 + 0.6*g["USD_Dominanz"] + 0.5*g["Liquiditaetsaufschlag"] - 0.3*g["CBDC_Nutzung"]
+    res = 0.5 + 0.5*g["Golddeckung"] + 0.3*g["Alternativnetz_Abdeckung"] + 0.1*g["CBDC_Nutzung"]
+    vola = 0.03 + 0.08*g["FX_Schockempfindlichkeit"] + 0.05*(1-g["Zugangsresilienz"])
+    if extended:
+        d = g["demokratie"]
+        imp = imp + 0.4*(1-g["innovation"])
+        res = res + 0.3*g["fachkraefte"] + 0.2*g["stabilitaet"] + 0.25*d
+        vola = np.maximum(0.0, vola + 0.05*g["energie"] + 0.05*g["verschuldung"] - 0.02*d)
+        imp = np.maximum(0.0, imp - 0.05*d) - 0.2*g["innovation"]*d
+        res = res + 0.15*g["fachkraefte"]*d
+        imp, res, vola = np.maximum(0.0, imp), np.maximum(0.0, res), np.maximum(0.0, vola)
+    return np.stack([imp, res, vola], axis=-1)
+
+def simulate_dynamic_panel(countries, years=20, N=200, seed=42, extended=False,
+                           annual_trends=None, shock_events=None, country_trends=None,
+                           clamp=True, allow_0_2_for_verschuldung=True, quantiles=(0.05, 0.5, 0.95)):
+    """
+    Vectorized counterpart of simulate_dynamic_years for many countries at once.
+    All (countries x years x N x 3) samples are drawn in one batched call.
+    Returns a long DataFrame: Land, Jahr, Importkosten, Resilienz, Volatilitaet (medians)
+    plus <col>_p05 / <col>_p95 columns.
+    """
+    names, T = build_param_tensor(countries, years, annual_trends, shock_events, country_trends,
+                                  clamp, allow_0_2_for_verschuldung)
+    C, Y = T.shape[0], T.shape[1]
+    loc = _panel_bases(T, extended).astype(np.float32)          # (C, Y, 3)
+    scale = np.array([0.05, 0.03, 0.02], dtype=np.float32)
+    rng = np.random.default_rng(int(seed))
+    z = rng.standard_normal((C, Y, int(N), 3), dtype=np.float32)
+    z *= scale; z += loc[:, :, None, :]
+    if extended: np.clip(z[..., 2], 0.0, None, out=z[..., 2])
+    q = np.quantile(z, list(quantiles), axis=2)                # (Q, C, Y, 3)
+    del z
+    cols = ["Importkosten", "Resilienz", "VolatilitÃ¤t"]
+    out = pd.DataFrame({"Land": np.repeat(names, Y), "Jahr": np.tile(np.arange(1, Y + 1), C)})
+    for qi, qq in enumerate(quantiles):
+        suffix = "" if qq == 0.5 else f"_p{int(round(qq * 100)):02d}"
+        for j, c in enumerate(cols):
+            out[c + suffix] = q[qi, :, :, j].reshape(-1)
+    return out
 ''',
 "src/utils/validators.py": '''import numpy as np
 from ..config import default_params
@@ -486,6 +486,8 @@ from risk_dashboard.core.regime_model import (
     build_regime_timeline,
     compute_regime_transition_matrix,
     next_regime_distribution,
+    regime_forecast,
+    regime_outlook,
 )
 from risk_dashboard.core.etl import load_etf_universe_prices
 from risk_dashboard.core.asset_packages import parse_etf_input
@@ -995,6 +997,16 @@ with tab_risk:
     st.subheader("Wahrscheinlichkeit nächstes Regime")
     st.bar_chart(next_dist)
 
+    st.subheader("Regime-Ausblick (1–36 Monate)")
+    outlook_h = st.slider("Horizont (Monate)", 1, 36, 12)
+    outlook = regime_outlook(trans_matrix, current_regime, horizon=36)
+    st.line_chart(outlook.loc[:outlook_h])
+    forecast = regime_forecast(trans_matrix, horizon=36)
+    st.dataframe(pd.DataFrame({
+        "Stationäre Verteilung": forecast["stationary"],
+        "Erwartete Verweildauer": forecast["expected_duration"],
+    }).style.format("{:.2f}"))
+
 with tab_hmm:
     st.header("HMM-Regime-Modell")
 
@@ -13,6 +13,7 @@ from risk_dashboard.core.data_loader import (
     filter_valid_tickers
 )
 from risk_dashboard.core.ticker_cache import validate_ticker_with_cache
+from risk_dashboard.core.metrics import performance_kernel
 from risk_dashboard.data_cache import load_price_data_cached_with_used
 
 
@@ -23,21 +24,14 @@ def compute_metrics(close_series: pd.Series, trading_days: int = 252, rf: float
     if close_series.empty:
         raise ValueError("Close-Serie ist leer oder enthält keine numerischen Werte")
 
-    rets = close_series.pct_change().dropna()
-    ann_ret = (1 + rets.mean()) ** trading_days - 1
-    ann_vol = rets.std() * (trading_days ** 0.5)
-    sharpe = (ann_ret - rf) / ann_vol if ann_vol != 0 else float("nan")
-
-    cum = (1 + rets).cumprod()
-    peak = cum.cummax()
-    drawdown = (cum - peak) / peak
-    max_dd = drawdown.min()
+    m = performance_kernel(close_series, kind="values", periods_per_year=trading_days,
+                           rf=rf, sharpe_basis="compound").iloc[0]
 
     return {
-        "annual_return": float(ann_ret),
-        "annual_vol": float(ann_vol),
-        "sharpe": float(sharpe),
-        "max_drawdown": float(max_dd)
+        "annual_return": float(m["ann_return"]),
+        "annual_vol": float(m["vol"]),
+        "sharpe": float(m["sharpe"]),
+        "max_drawdown": float(m["max_drawdown"])
     }
 
 def _normalize_input_tickers(raw: str) -> List[str]:
@@ -0,0 +1,222 @@
+# core/backend/ki_history.py
+"""
+Rollierende KI-Score-Historie für ganze Universen.
+
+Für jeden Tag wird der KI-Score (ki_panel / compute_ki_score) auf dem
+Fenster der letzten `window` Kurse berechnet. Statt jedes Fenster neu
+auszuwerten, laufen Σr, Σr², Σy, Σy², Σt·y als kumulierte Summen mit –
+jeder Tag ist damit eine O(1)-Differenz. Nur der Max Drawdown braucht das
+laufende Maximum innerhalb des Fensters (vektorisiert über alle Fenster).
+
+Historien werden pro Name als Parquet + JSON abgelegt und bei neuen Kursen
+nur um die neuen Tage fortgeschrieben.
+"""
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from risk_dashboard.core.ki_panel import right_align, normalize_factors, combine_factors, MIN_POINTS
+from risk_dashboard.core.store_io import data_version, load_store, save_store
+
+KI_HISTORY_DIR = Path("cache") / "ki_history"
+
+DEFAULT_WINDOW = 252
+
+FACTORS = ("momentum", "volatility", "drawdown", "sharpe", "trend_stability")
+
+# (name, window) -> (history, meta)
+_MEMORY: dict = {}
+
+
+# ---------------------------------------------------------
+# Rollierende Faktoren
+# ---------------------------------------------------------
+
+def _window_sum(X: np.ndarray, w: int) -> np.ndarray:
+    """Summe über die letzten w Zeilen (Zeile e: X[e-w+1 .. e]), davor NaN."""
+    C = np.vstack([np.zeros((1, X.shape[1])), np.cumsum(X, axis=0)])
+    out = np.full(X.shape, np.nan)
+    if X.shape[0] >= w:
+        out[w - 1:] = C[w:] - C[:-w]
+    return out
+
+
+def _window_drawdown(A: np.ndarray, w: int) -> np.ndarray:
+    """|Max Drawdown| je Fenster der Länge w (laufendes Maximum ab Fensterbeginn)."""
+    T, N = A.shape
+    out = np.full((T, N), np.nan)
+    if T < w:
+        return out
+    for j in range(N):
+        win = sliding_window_view(A[:, j], w)
+        peak = np.maximum.accumulate(win, axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out[w - 1:, j] = np.abs((win / peak - 1).min(axis=1))
+    return out
+
+
+def _rolling_raw_factors(A: np.ndarray, w: int) -> tuple:
+    """
+    Rohfaktoren für jedes Fenster [e-w+1, e] eines rechtsbündigen Panels.
+    Liefert (dict Faktor -> T x N, Maske der vollständigen Fenster).
+    """
+    T, N = A.shape
+    full = _window_sum(np.isfinite(A).astype(float), w) == w
+
+    # Momentum: letzter Kurs / Kurs vor 89 Tagen
+    momentum = np.full((T, N), np.nan)
+    if T >= 90:
+        momentum[89:] = A[89:] / A[:-89] - 1
+
+    # Renditen im Fenster: w-1 Werte, R[i] = A[i+1] / A[i] - 1
+    with np.errstate(divide="ignore", invalid="ignore"):
+        R = A[1:] / A[:-1] - 1
+    m = w - 1
+    R0 = np.nan_to_num(R)
+    s1 = np.vstack([np.full((1, N), np.nan), _window_sum(R0, m)])
+    s2 = np.vstack([np.full((1, N), np.nan), _window_sum(R0 * R0, m)])
+    mean = s1 / m
+    with np.errstate(invalid="ignore"):
+        vol = np.sqrt(np.clip((s2 - s1 * mean) / (m - 1), 0.0, None))
+
+    # Trend-R²: Kurse je Spalte zentriert (R² ist verschiebungsinvariant)
+    with np.errstate(invalid="ignore"):
+        Y = np.nan_to_num(A - np.nanmean(A, axis=0))
+    t = np.arange(T, dtype=float)[:, None]
+    sy = _window_sum(Y, w)
+    syy = _window_sum(Y * Y, w)
+    sty = _window_sum(t * Y, w)
+    t_mean = t - (w - 1) / 2.0                       # Mittelwert von t im Fenster
+    sxx = w * (w * w - 1) / 12.0
+    sxy = sty - t_mean * sy
+    with np.errstate(divide="ignore", invalid="ignore"):
+        syy_c = syy - sy * sy / w
+        r2 = sxy * sxy / (sxx * syy_c)
+
+    raw = {
+        "momentum": momentum,
+        "volatility": vol,
+        "sharpe": mean / (vol + 1e-9),
+        "drawdown": _window_drawdown(A, w),
+        "trend_stability": r2,
+    }
+    return {key: np.where(full, val, np.nan) for key, val in raw.items()}, full
+
+
+def rolling_ki_scores(prices: pd.DataFrame, window: int = DEFAULT_WINDOW,
+                      return_factors: bool = False):
+    """
+    KI-Score-Historie: für jeden Tag der Score auf den letzten `window` Kursen
+    der jeweiligen Spalte (entspricht compute_ki_score(series.iloc[e-window+1:e+1])).
+
+    Returns
+    -------
+    DataFrame (Index = Datum, Spalten = Assets) mit NaN vor dem ersten vollen Fenster,
+    bei return_factors=True zusätzlich dict Faktor -> DataFrame der normierten Faktoren.
+    """
+    if window < MIN_POINTS:
+        raise ValueError(f"window muss mindestens {MIN_POINTS} Kurse umfassen.")
+
+    A, n = right_align(prices)
+    raw, full = _rolling_raw_factors(A, window)
+    norm = normalize_factors(raw)
+    score = np.where(full, combine_factors(norm), np.nan)
+
+    # rechtsbündige Zeilen zurück auf die Handelstage jeder Spalte
+    valid = prices.notna().to_numpy() & np.isfinite(prices.to_numpy(dtype=float))
+    T = A.shape[0]
+
+    def to_frame(values):
+        out = np.full(prices.shape, np.nan)
+        for j in np.flatnonzero(n):
+            out[valid[:, j], j] = values[T - n[j]:, j]
+        return pd.DataFrame(out, index=prices.index, columns=prices.columns)
+
+    scores = to_frame(score)
+    if not return_factors:
+        return scores
+    return scores, {key: to_frame(np.where(full, norm[key], np.nan)) for key in FACTORS}
+
+
+# ---------------------------------------------------------
+# Persistenz & inkrementelles Fortschreiben
+# ---------------------------------------------------------
+
+def _paths(name: str, window: int, store_dir=None):
+    store_dir = Path(store_dir) if store_dir is not None else KI_HISTORY_DIR
+    return store_dir / f"{name}_{window}.parquet", store_dir / f"{name}_{window}.json"
+
+
+def _tail_start(prices: pd.DataFrame, n_old: int, window: int) -> int:
+    """Erste Zeile, ab der jede Spalte noch `window` Kurse vor den neuen Tagen hat."""
+    start = n_old
+    valid = prices.notna().to_numpy()
+    for j in range(valid.shape[1]):
+        pos = np.flatnonzero(valid[:n_old, j])
+        start = min(start, pos[-window] if len(pos) >= window else 0)
+    return start
+
+
+def get_ki_history(prices: pd.DataFrame, name: str = "default", window: int = DEFAULT_WINDOW,
+                   store_dir=None) -> pd.DataFrame:
+    """
+    KI-Score-Historie für das Panel, einmal pro Datenversion.
+    - gleiche Version im Speicher/auf Platte -> direkt verwenden
+    - Panel = gespeicherte Historie + neue Tage -> nur die neuen Tage berechnen
+    - sonst -> komplette Neuberechnung
+    """
+    prices = prices.sort_index()
+    version = data_version(prices)
+    cols = [str(c) for c in prices.columns]
+    parquet_path, meta_path = _paths(name, window, store_dir)
+
+    hist, meta = _MEMORY.get((name, window), (None, None))
+    if hist is None:
+        stored = load_store([parquet_path], meta_path)
+        if stored is not None:
+            (hist,), meta = stored
+
+    usable = hist is not None and meta.get("columns") == cols
+    if usable and meta["data_version"] == version:
+        _MEMORY[(name, window)] = (hist, meta)
+        return hist.copy()
+
+    n_old = int(meta["n_rows"]) if usable else 0
+    if usable and len(prices) > n_old and data_version(prices.iloc[:n_old]) == meta["data_version"]:
+        start = _tail_start(prices, n_old, window)
+        tail = rolling_ki_scores(prices.iloc[start:], window=window).iloc[n_old - start:]
+        hist = pd.concat([hist, tail])
+    else:
+        hist = rolling_ki_scores(prices, window=window)
+
+    meta = {
+        "name": name,
+        "window": int(window),
+        "columns": cols,
+        "n_rows": int(len(prices)),
+        "data_version": version,
+        "start": str(prices.index.min()) if len(prices) else None,
+        "end": str(prices.index.max()) if len(prices) else None,
+    }
+    _MEMORY[(name, window)] = (hist, meta)
+
+    save_store({parquet_path: hist}, meta_path, meta)
+    return hist.copy()
+
+
+def ki_history_summary(history: pd.DataFrame, lookback: int = 21) -> pd.DataFrame:
+    """Letzter rollierender Score und Veränderung über `lookback` Handelstage je Asset."""
+    last = history.apply(lambda s: s.dropna().iloc[-1] if s.notna().any() else np.nan)
+    prev = history.apply(
+        lambda s: s.dropna().iloc[-1 - lookback] if s.notna().sum() > lookback else np.nan
+    )
+    return pd.DataFrame({
+        "ki_score_rolling": last,
+        f"ki_score_change_{lookback}d": last - prev,
+    })
+
+
+def clear_ki_history_cache():
+    """Leert den In-Memory-Cache (abgelegte Dateien bleiben erhalten)."""
+    _MEMORY.clear()
@@ -0,0 +1,16 @@
+# core/backend/ki_panel.py
+"""Kompatibilität: der Panel-Kernel liegt in core/ki_panel.py (ohne das core.backend-Paket)."""
+from risk_dashboard.core.ki_panel import (  # noqa: F401
+    FACTOR_RANGES,
+    FACTOR_WEIGHTS,
+    MIN_POINTS,
+    combine_factors,
+    max_drawdown,
+    normalize_factors,
+    panel_engine_ki_scores,
+    panel_ki_scores,
+    panel_profile_scores,
+    panel_raw_factors,
+    right_align,
+    trend_r2,
+)
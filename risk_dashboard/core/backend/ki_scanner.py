@@ -1,6 +1,8 @@
 # core/backend/ki_scanner.py
 import pandas as pd
-from core.data.assets import get_asset_metrics, get_bitcoin_metrics
+from core.data.assets import ASSET_BENCHMARKS, fetch_price_panel, get_asset_metrics_many
+from core.backend.ki_history import get_ki_history, ki_history_summary
+from risk_dashboard.core.etf_similarity import get_similarity_index, similar_etfs
 from core.visualization.radar_plotly_assets import plot_asset_radar
 
 REGIONS = {
@@ -41,22 +43,47 @@ def scan_assets(asset_string: str, profile: str, region: str):
             return pd.DataFrame({"Fehler": ["Keine Assets eingegeben"]}), None
         symbols = [s.strip().upper() for s in asset_string.split(",")]
 
-    rows = []
-    for symbol in symbols:
-        if symbol == "BTC-USD":
-            metrics = get_bitcoin_metrics()
-        else:
-            metrics = get_asset_metrics(symbol)
-        if metrics is not None:
-            rows.append(metrics)
+    # Ein Panel-Download für alle Symbole und Benchmarks
+    symbols = list(dict.fromkeys(s for s in symbols if s))
+    panel = fetch_price_panel(symbols + [b for b in ASSET_BENCHMARKS.values() if b not in symbols])
 
-    if not rows:
+    df = get_asset_metrics_many(symbols, benchmarks=ASSET_BENCHMARKS, prices=panel)
+    if df.empty:
         return pd.DataFrame({"Fehler": ["Keine gültigen Assets gefunden"]}), None
+    present = list(df["symbol"])
 
-    df = pd.DataFrame(rows)
+    rows = df.to_dict("records")
     df = compute_ki_score(df, profile)
+
+    # Verlauf des KI-Scores (persistiert, bei neuen Kursen nur fortgeschrieben)
+    try:
+        history = get_ki_history(panel[present], name=f"scan_{region or 'custom'}")
+        df = df.join(ki_history_summary(history), on="symbol")
+    except Exception:
+        pass
+
+    # Ähnlichstes Asset im Scan (Korrelationsdistanz der Renditeprofile)
+    try:
+        index = get_similarity_index(panel[present], name=f"scan_{region or 'custom'}")
+        nearest = {s: similar_etfs(index, s, k=1) for s in present}
+        df["aehnlichstes_asset"] = df["symbol"].map(
+            {s: r["ticker"].iloc[0] for s, r in nearest.items() if not r.empty})
+        df["korrelation_aehnlichstes"] = df["symbol"].map(
+            {s: r["correlation"].iloc[0] for s, r in nearest.items() if not r.empty})
+    except Exception:
+        pass
+
     df = df.sort_values("ki_score", ascending=False)
 
     fig = plot_asset_radar(rows, mode="experte")
 
-    return df, fig
\ No newline at end of file
+    return df, fig
+
+
+def find_similar_assets(symbol: str, region: str = "Global", k: int = 5) -> pd.DataFrame:
+    """Die k ähnlichsten Assets der Region zu einem Symbol (Korrelationsdistanz)."""
+    symbol = symbol.strip().upper()
+    symbols = list(dict.fromkeys([symbol] + REGIONS.get(region, REGIONS["Global"])))
+    panel = fetch_price_panel(symbols)
+    index = get_similarity_index(panel, name=f"similar_{region}")
+    return similar_etfs(index, symbol, k=k)
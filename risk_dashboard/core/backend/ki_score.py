@@ -3,6 +3,8 @@
 import numpy as np
 import pandas as pd
 
+from risk_dashboard.core.ki_panel import panel_ki_scores
+
 def normalize(value, min_val, max_val):
     # Series — float
     if isinstance(value, pd.Series):
@@ -33,67 +35,21 @@ def compute_ki_score(price_series: pd.Series, return_factors=False):
     """
     Berechnet einen KI-Score (0‑100) aus einer Preiszeitreihe.
     Wenn return_factors=True, werden zusätzlich die normierten Faktoren zurückgegeben.
+    Einspaltiger Aufruf von ki_panel.panel_ki_scores (für viele Assets direkt das Panel nutzen).
     """
+    if isinstance(price_series, pd.DataFrame):
+        price_series = price_series.iloc[:, 0]
 
-    # Sicherheitscheck: mindestens 120 Datenpunkte
-    if len(price_series) < 120:
-        return 0 if not return_factors else (0, {
-            "momentum": 0,
-            "volatility": 0,
-            "drawdown": 0,
-            "sharpe": 0,
-            "trend_stability": 0
-        })
-
-    # 1. Renditen
-    returns = price_series.pct_change().dropna()
-
-    # 2. Momentum (letzte 90 Tage)
-    try:
-        momentum = price_series.iloc[-1] / price_series.iloc[-90] - 1
-    except Exception:
-        momentum = 0
-    momentum_norm = normalize(to_float(momentum), -0.2, 0.3)
-
-    # 3. Volatilität
-    vol = to_float(returns.std())
-    vol_norm = normalize(vol, 0.005, 0.05)
-
-    # 4. Sharpe Ratio
-    sharpe = to_float(returns.mean()) / (to_float(returns.std()) + 1e-9)
-    sharpe_norm = normalize(sharpe, -1, 2)
-
-    # 5. Max Drawdown
-    roll_max = price_series.cummax()
-    drawdown = to_float(((price_series - roll_max) / roll_max).min())
-    drawdown_norm = normalize(abs(drawdown), 0, 0.5)
-
-    # 6. Trendstabilität (R²)
-    x = np.arange(len(price_series))
-    y = price_series.values
-    slope, intercept = np.polyfit(x, y, 1)
-    y_pred = slope * x + intercept
-    r2 = 1 - np.sum((y - y_pred)**2) / np.sum((y - y.mean())**2)
-    trend_stability_norm = normalize(to_float(r2), 0, 1)
-
-    # 7. KI-Score (robust)
-    score = (
-        to_float(momentum_norm) * 25 +
-        (1 - to_float(vol_norm)) * 20 +
-        (1 - to_float(drawdown_norm)) * 20 +
-        to_float(sharpe_norm) * 20 +
-        to_float(trend_stability_norm) * 15
-    )
-
-    score = max(0, min(100, float(score)))
+    res = panel_ki_scores(price_series, return_factors=True).iloc[0]
+    score = float(res["ki_score"])
 
     if return_factors:
         return score, {
-            "momentum": float(momentum_norm),
-            "volatility": float(vol_norm),
-            "drawdown": float(drawdown_norm),
-            "sharpe": float(sharpe_norm),
-            "trend_stability": float(trend_stability_norm)
+            "momentum": float(res["momentum"]),
+            "volatility": float(res["volatility"]),
+            "drawdown": float(res["drawdown"]),
+            "sharpe": float(res["sharpe"]),
+            "trend_stability": float(res["trend_stability"])
         }
 
     return score
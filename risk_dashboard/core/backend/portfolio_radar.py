@@ -1,19 +1,14 @@
 # core/backend/portfolio_radar.py
 import pandas as pd
-from core.data.assets import get_asset_metrics
+from core.data.assets import get_asset_metrics_many
 from core.visualization.radar_plotly_assets import plot_asset_radar
 
 def build_portfolio_metrics(symbols: list[str], weights: list[float]):
-    rows = []
-    for s in symbols:
-        m = get_asset_metrics(s)
-        if m:
-            rows.append(m)
-    if not rows:
+    df = get_asset_metrics_many(symbols)
+    if df.empty:
         return None, None
 
-    df = pd.DataFrame(rows)
-    w = pd.Series(weights, index=df["symbol"]).reindex(df["symbol"]).fillna(0)
+    w = pd.Series(weights, index=[s.strip().upper() for s in symbols]).reindex(df["symbol"]).fillna(0)
     df["weight"] = w.values
 
     agg = {}
@@ -24,11 +19,7 @@ def build_portfolio_metrics(symbols: list[str], weights: list[float]):
     return df, agg
 
 def portfolio_radar(symbols: list[str], weights: list[float]):
-    rows = []
-    for s in symbols:
-        m = get_asset_metrics(s)
-        if m:
-            rows.append(m)
-    if not rows:
+    df = get_asset_metrics_many(symbols)
+    if df.empty:
         return None
-    return plot_asset_radar(rows, mode="experte")
\ No newline at end of file
+    return plot_asset_radar(df.to_dict("records"), mode="experte")
\ No newline at end of file
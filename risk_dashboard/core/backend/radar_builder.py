@@ -9,7 +9,7 @@ from core.data.etf import get_etf_metrics
 from core.data.portfolio import get_portfolio_metrics
 from core.utils.normalize import normalize_metrics_list
 from core.utils.pdf import export_radar_pdf
-from core.data.assets import get_asset_metrics, get_bitcoin_metrics
+from core.data.assets import ASSET_BENCHMARKS, get_asset_metrics_many
 from core.visualization.radar_plotly_assets import plot_asset_radar
 
 
@@ -91,21 +91,23 @@ def build_asset_radar(selected_assets, custom_symbol, mode):
 
     assets = list(set(assets))
 
+    # Ein Panel-Download für alle Assets; Korrelationen nur für Bitcoin (wie bisher)
+    df = get_asset_metrics_many(assets, benchmarks=ASSET_BENCHMARKS if "BTC-USD" in assets else None)
+    corr_cols = [c for c in ASSET_BENCHMARKS if c in df.columns]
+
     rows = []
     lexicon_rows = []
 
-    for symbol in assets:
+    for row in df.to_dict("records"):
+        symbol = row["symbol"]
         if symbol == "BTC-USD":
-            metrics = get_bitcoin_metrics()
             lex = get_bitcoin_lexicon()
         else:
-            metrics = get_asset_metrics(symbol)
+            for col in corr_cols:
+                row.pop(col, None)
             lex = [{"Kennzahl": "Allgemein", "Beschreibung": f"Kennzahlen für {symbol}"}]
 
-        if metrics is None:
-            continue
-
-        rows.append(metrics)
+        rows.append({k: (None if pd.isna(v) else v) for k, v in row.items()})
         lexicon_rows.extend(lex)
 
     if not rows:
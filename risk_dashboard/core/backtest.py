@@ -16,6 +16,7 @@ PROJECT_ROOT = Path(__file__).resolve().parents[1]
 logger = logging.getLogger(__name__)
 
 from risk_dashboard.core.data import etf
+from risk_dashboard.core.metrics import performance_kernel
 from risk_dashboard.core.utils import prepare_prices_for_backtest, extract_close_series, compute_market_value_from_holdings
 
 try:
@@ -217,15 +218,9 @@ def compute_metrics_from_series(portfolio_values: pd.Series, trading_days: int =
     if returns.empty:
         return {"cagr": float("nan"), "vol": float("nan"), "sharpe": float("nan"), "max_dd": float("nan")}
     days = (portfolio_values.index[-1] - portfolio_values.index[0]).days
-    total_return = portfolio_values.iloc[-1] / portfolio_values.iloc[0] - 1
-    cagr = (1 + total_return) ** (365.0 / days) - 1 if days > 0 else float("nan")
-    vol = returns.std() * np.sqrt(trading_days)
-    sharpe = (returns.mean() * trading_days) / vol if vol > 0 else float("nan")
-    cum = (1 + returns).cumprod()
-    peak = cum.cummax()
-    drawdown = cum / peak - 1
-    max_dd = drawdown.min()
-    return {"cagr": cagr, "vol": vol, "sharpe": sharpe, "max_dd": max_dd}
+    m = performance_kernel(portfolio_values, kind="values", periods_per_year=trading_days,
+                           years=days / 365.0 if days > 0 else np.nan).iloc[0]
+    return {"cagr": m["cagr"], "vol": m["vol"], "sharpe": m["sharpe"], "max_dd": m["max_drawdown"]}
 
 def run_portfolio_backtest (
     prices_df: pd.DataFrame,
@@ -317,6 +312,63 @@ def run_portfolio_backtest (
     }
 
 
+def run_weight_panel_backtest(prices_df: pd.DataFrame, weights) -> Dict[str, Any]:
+    """
+    Vektorisierter Backtest für Gewichts-Panels (z.B. screening.factor_panel / top_n_weights).
+
+    prices_df: Kurse (Datum x Ticker).
+    weights: DataFrame (Rebalancing-Termine x Ticker) oder dict Name -> DataFrame.
+    Wie run_portfolio_backtest wird zum Schlusskurs jedes Termins auf die Zielgewichte
+    umgeschichtet, dazwischen driften die Bestände mit den Kursen. Titel ohne Kurs am
+    Termin fallen heraus (Rest wird renormiert); vor dem ersten Termin bzw. ohne
+    Gewichte bleibt das Portfolio in Cash.
+
+    Returns dict mit portfolio_value (Datum x Strategie) und metrics (Strategie x Kennzahl).
+    """
+    panels = weights if isinstance(weights, dict) else {"portfolio": weights}
+    price = prices_df.sort_index().ffill()
+    P = price.to_numpy(dtype=float)
+    T = len(price)
+
+    values = {}
+    for name, W in panels.items():
+        W = W.reindex(columns=price.columns).fillna(0.0).sort_index()
+        rows = price.index.searchsorted(W.index, side="left")
+        keep = rows < T
+        rows, Wm = rows[keep], W.to_numpy(dtype=float)[keep]
+
+        # Zielgewichte nur auf Titel mit Kurs am Termin, renormiert
+        P_reb = P[rows]
+        Wm = np.where(np.isfinite(P_reb), Wm, 0.0)
+        total = Wm.sum(axis=1, keepdims=True)
+        Wm = np.where(total > 0, Wm / np.where(total > 0, total, 1.0), 0.0)
+        invested = total[:, 0] > 0
+
+        # Periode je Zeile (-1 = vor dem ersten Termin)
+        pid = np.searchsorted(rows, np.arange(T), side="right") - 1
+        active = pid >= 0
+        k = np.maximum(pid, 0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rel = np.nan_to_num(P / P_reb[k])
+        growth = np.where(invested[k], np.einsum("tj,tj->t", Wm[k], rel), 1.0)
+        growth = np.where(active, growth, 1.0)
+
+        # Wert zu Beginn jeder Periode: Wachstum der Vorperiode bis zum Termin
+        with np.errstate(divide="ignore", invalid="ignore"):
+            step = np.nan_to_num(P_reb[1:] / P_reb[:-1])
+        period_end = np.where(invested[:-1], np.einsum("kj,kj->k", Wm[:-1], step), 1.0)
+        start_value = np.concatenate([[1.0], np.cumprod(period_end)])
+
+        values[name] = np.where(active, start_value[k] * growth, 1.0)
+
+    pv = pd.DataFrame(values, index=price.index)
+    if pv.empty:
+        return {"portfolio_value": pv, "metrics": pd.DataFrame()}
+    days = (pv.index[-1] - pv.index[0]).days
+    metrics = performance_kernel(pv, kind="values", years=days / 365.0 if days > 0 else np.nan)
+    return {"portfolio_value": pv, "metrics": metrics}
+
+
 def call_run_portfolio_backtest_safe(func, price_close, weights_for_backtest, macro_df):
     sig = inspect.signature(func)
     params = sig.parameters
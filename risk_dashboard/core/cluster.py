@@ -3,12 +3,12 @@
 from __future__ import annotations
 from typing import Dict, List
 import numpy as np
-from sklearn.cluster import KMeans
 import plotly.express as px
 import pandas as pd
 import matplotlib.pyplot as plt
 
-from risk_dashboard.core.risk_model import compute_risk_scores
+from risk_dashboard.core.risk_model import compute_risk_scores, risk_scores_table
+from risk_dashboard.core.cluster_service import derived, get_clusters, result_for_model
 
 
 # ---------------------------------------------------------
@@ -47,26 +47,20 @@ def extract_vector(scores: dict) -> np.ndarray:
 # Cluster-Berechnung
 # ---------------------------------------------------------
 
-def cluster_risk_dimensions(presets: dict, k: int = 3):
-    X = []
-    lands = []
-    for land, params in presets.items():
-        scores = compute_risk_scores(params)
-        X.append([
-            scores["political_security"],
-            scores["strategische_autonomie"],
-            scores["total"]
-        ])
-        lands.append(land)
+RISK_CLUSTER_FEATURES = ["political_security", "strategische_autonomie", "total"]
 
-    X = np.array(X)
 
-    model = KMeans(n_clusters=k, random_state=42)
-    labels = model.fit_predict(X)
+def cluster_risk_dimensions(presets: dict, k: int = 3):
+    """
+    Clustert die Länder nach politischem Risiko, Autonomie und Gesamtrisiko.
+    Ergebnis kommt aus dem Cluster-Service (einmal pro Presets-Stand und k).
+    """
+    table = risk_scores_table(presets)[RISK_CLUSTER_FEATURES]
+    result = get_clusters(table, k=k, name="risk_dimensions", random_state=42)
 
-    clusters = {land: int(label) for land, label in zip(lands, labels)}
+    clusters = {land: int(label) for land, label in result["labels"].items()}
 
-    return clusters, model
+    return clusters, result["model"]
 
 
 # ---------------------------------------------------------
@@ -114,6 +108,17 @@ def interpret_cluster(center: np.ndarray) -> str:
     return md
 
 
+def cluster_interpretations(presets: Dict[str, dict], k: int = 3) -> Dict[int, str]:
+    """
+    Interpretation je Cluster für ein Clustering über alle CLUSTER_DIMS;
+    einmal pro Presets-Stand und k berechnet und aus dem Cluster-Service ausgeliefert.
+    """
+    table = risk_scores_table(presets)[CLUSTER_DIMS]
+    result = get_clusters(table, k=k, name="risk_profiles", random_state=42)
+    return derived(result, "interpretations",
+                   lambda r: {cid: interpret_cluster(c) for cid, c in enumerate(r["centers"])})
+
+
 # ---------------------------------------------------------
 # Cluster-Heatmap
 # ---------------------------------------------------------
@@ -124,16 +129,16 @@ def cluster_heatmap(presets: Dict[str, dict], k: int = 3):
     Land | Cluster | political_security | strategische_autonomie | total
     """
     clusters, _ = cluster_risk_dimensions(presets, k)
+    table = risk_scores_table(presets)
     rows = []
 
-    for land, params in presets.items():
-        scores = compute_risk_scores(params)
+    for land, scores in table.iterrows():
         rows.append([
             land,
             clusters[land],
-            round(scores["political_security"], 3),
-            round(scores["strategische_autonomie"], 3),
-            round(scores["total"], 3)
+            round(float(scores["political_security"]), 3),
+            round(float(scores["strategische_autonomie"]), 3),
+            round(float(scores["total"]), 3)
         ])
 
     return rows
@@ -145,10 +150,10 @@ def cluster_scatterplot(presets: dict, k: int = 3):
     Punktgröße = Gesamtrisiko
     """
     clusters, model = cluster_risk_dimensions(presets, k)
+    table = risk_scores_table(presets)
     rows = []
 
-    for land, params in presets.items():
-        scores = compute_risk_scores(params)
+    for land, scores in table.iterrows():
         rows.append({
             "Land": land,
             "Cluster": clusters[land],
@@ -205,6 +210,23 @@ def etf_mapping_for_cluster(cid: int) -> str:
 """
 
 def describe_clusters(presets, clusters, model):
+    """
+    Cluster-Lexikon (Markdown). Stammt das Modell aus dem Cluster-Service,
+    wird der Text einmal pro Ergebnis berechnet und wiederverwendet.
+    """
+    result = result_for_model(model)
+    if result is None:
+        return _describe_clusters(clusters, model)
+    return derived(result, "lexicon", lambda r: _describe_clusters(clusters, model))
+
+
+def cluster_lexicon(presets: Dict[str, dict], k: int = 3) -> str:
+    """Cluster-Lexikon für die Risiko-Dimensionen (cluster_risk_dimensions)."""
+    clusters, model = cluster_risk_dimensions(presets, k)
+    return describe_clusters(presets, clusters, model)
+
+
+def _describe_clusters(clusters, model):
     centers = model.cluster_centers_  # shape: (k, 3)
     lines = ["# Cluster-Lexikon", ""]
 
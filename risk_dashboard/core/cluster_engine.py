@@ -1,10 +1,12 @@
 #risk_dashboard/core/cluster_engine.py
-from sklearn.cluster import KMeans
 import pandas as pd
 
+from risk_dashboard.core.cluster_service import get_clusters
+
+
 def compute_clusters(presets_all, k=3):
     df = pd.DataFrame(presets_all).T
-    model = KMeans(n_clusters=k, n_init="auto")
-    labels = model.fit_predict(df)
-    df["cluster"] = labels
-    return df
\ No newline at end of file
+    features = df.apply(pd.to_numeric, errors="coerce").dropna(axis=1, how="any")
+    result = get_clusters(features, k=k, name="presets_raw", random_state=0)
+    df["cluster"] = result["labels"].reindex(df.index).to_numpy()
+    return df
@@ -0,0 +1,113 @@
+# risk_dashboard/core/cluster_service.py
+"""
+Gemeinsamer Clustering-Service für cluster.py und cluster_engine.
+
+Ergebnisse (Labels, Zentren, Modell) werden pro Feature-Version (Hash der
+Feature-Tabelle) und k einmal berechnet und an alle Aufrufer ausgegeben.
+Ändern sich die Presets, wird mit MiniBatchKMeans ab den bisherigen Zentren
+neu geclustert und die Cluster-Nummern per Zuordnung (Hungarian) an die
+vorherigen Zentren angeglichen – Labels bleiben über Reruns stabil.
+"""
+from collections import OrderedDict
+from typing import Callable, Optional
+
+import numpy as np
+import pandas as pd
+from scipy.optimize import linear_sum_assignment
+from scipy.spatial.distance import cdist
+from sklearn.cluster import KMeans, MiniBatchKMeans
+
+from risk_dashboard.core.store_io import data_version
+
+# (name, version, k) -> Ergebnis
+_RESULTS: "OrderedDict[tuple, dict]" = OrderedDict()
+_RESULTS_MAX = 64
+
+# (name, k) -> letzte Zentren (für Warm-Start und stabile Labels)
+_LAST_CENTERS: dict = {}
+
+
+def _align_to_previous(model, prev_centers: np.ndarray) -> np.ndarray:
+    """Permutiert Zentren/Labels des Modells so, dass Cluster i nahe am alten Cluster i liegt."""
+    new_centers = model.cluster_centers_
+    _, perm = linear_sum_assignment(cdist(prev_centers, new_centers))
+    # perm[i] = neuer Index, der zum alten Cluster i passt
+    inverse = np.empty_like(perm)
+    inverse[perm] = np.arange(len(perm))
+    model.cluster_centers_ = new_centers[perm]
+    model.labels_ = inverse[model.labels_]
+    return model.labels_
+
+
+def get_clusters(features: pd.DataFrame, k: int = 3, name: str = "default",
+                 random_state: int = 42, warm_start: bool = True) -> dict:
+    """
+    Clustert die Zeilen von features (Index = Land) einmal pro Datenversion.
+
+    Returns
+    -------
+    dict
+        labels  : pd.Series (Index = Land, int)
+        centers : ndarray (k x Features)
+        model   : gefittetes (MiniBatch)KMeans
+        version : Hash der Feature-Tabelle
+        warm_started : bool
+    """
+    features = features.astype(float)
+    version = data_version(features)
+    key = (name, version, int(k))
+
+    hit = _RESULTS.get(key)
+    if hit is not None:
+        _RESULTS.move_to_end(key)
+        return hit
+
+    X = features.to_numpy()
+    prev = _LAST_CENTERS.get((name, int(k))) if warm_start else None
+    warm = prev is not None and prev.shape == (k, X.shape[1]) and len(X) >= k
+
+    if warm:
+        model = MiniBatchKMeans(n_clusters=k, init=prev, n_init=1, random_state=random_state)
+        model.fit(X)
+        labels = _align_to_previous(model, prev)
+    else:
+        model = KMeans(n_clusters=k, random_state=random_state)
+        labels = model.fit_predict(X)
+
+    result = {
+        "labels": pd.Series(labels.astype(int), index=features.index, name="cluster"),
+        "centers": model.cluster_centers_,
+        "model": model,
+        "version": version,
+        "warm_started": warm,
+        "derived": {},
+    }
+
+    _LAST_CENTERS[(name, int(k))] = np.array(model.cluster_centers_, copy=True)
+    _RESULTS[key] = result
+    while len(_RESULTS) > _RESULTS_MAX:
+        _RESULTS.popitem(last=False)
+    return result
+
+
+def derived(result: dict, what: str, fn: Callable[[dict], object]):
+    """Abgeleitete Größen (z.B. Cluster-Profile) einmal pro Ergebnis berechnen."""
+    if what not in result["derived"]:
+        result["derived"][what] = fn(result)
+    return result["derived"][what]
+
+
+def result_for_model(model) -> Optional[dict]:
+    """Gecachtes Ergebnis, zu dem ein (von get_clusters geliefertes) Modell gehört."""
+    for result in _RESULTS.values():
+        if result["model"] is model:
+            return result
+    return None
+
+
+def clear_cluster_cache(name: Optional[str] = None):
+    """Leert Ergebnisse (und Warm-Start-Zentren) – alle oder nur für name."""
+    for key in [k for k in _RESULTS if name is None or k[0] == name]:
+        del _RESULTS[key]
+    for key in [k for k in _LAST_CENTERS if name is None or k[0] == name]:
+        del _LAST_CENTERS[key]
@@ -202,6 +202,22 @@ def monte_carlo_portfolio(weights: np.ndarray, mu: np.ndarray, cov: np.ndarray,
     cvar95 = port_returns[port_returns <= var95].mean() if np.any(port_returns <= var95) else var95
     return {"sim_mean": float(port_returns.mean()), "var95": float(var95), "cvar95": float(cvar95), "sim_returns": port_returns}
 
+def monte_carlo_portfolio_parallel(weights: np.ndarray, mu: np.ndarray, cov: np.ndarray, n: int = 10000,
+                                   seed: int = 0, n_workers: int = None, block_size: int = 10000) -> dict:
+    """
+    Wie monte_carlo_portfolio, aber über einen Prozess-Pool verteilt.
+    Ergebnisse hängen nur von seed und block_size ab, nicht von n_workers.
+    """
+    from risk_dashboard.core.portfolio_sim.parallel_mc import run_parallel_mc, portfolio_return_block
+
+    res = run_parallel_mc(portfolio_return_block, n, seed=seed, n_workers=n_workers, block_size=block_size,
+                          weights=np.asarray(weights, dtype=float), mu=np.asarray(mu, dtype=float),
+                          cov=np.asarray(cov, dtype=float))
+    port_returns = res["samples"]
+    var95 = np.percentile(port_returns, 5)
+    cvar95 = port_returns[port_returns <= var95].mean() if np.any(port_returns <= var95) else var95
+    return {"sim_mean": float(res["mean"]), "var95": float(var95), "cvar95": float(cvar95), "sim_returns": port_returns}
+
 # ---------------------------
 # Beispiel-Helper: Erzeuge Kovarianzmatrix aus Volatilitäten und Korrelation
 # ---------------------------
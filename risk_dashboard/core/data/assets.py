@@ -7,8 +7,10 @@ from core.data.db_assets import ETF_DB, STOCK_DB, find_asset
 import pandas as pd
 from typing import Optional
 import logging
+import warnings
 
 from risk_dashboard.data_utils import fetch_prices_from_yf, flatten_yf_dataframe
+from risk_dashboard.core.ki_panel import right_align, max_drawdown
 
 logger = logging.getLogger(__name__)
 
@@ -62,19 +64,21 @@ def sanitize_price_data(data):
 
     return None
 
+def _resolve_symbol(symbol: str) -> str:
+    """ETF_DB-Korrektur (Ticker/ISIN -> Yahoo-Symbol, z.B. EIMI -> EIMI.L)."""
+    symbol = symbol.strip().upper()
+    for etf in ETF_DB:
+        if etf.get("Ticker") == symbol or etf.get("ISIN") == symbol:
+            return etf["Yahoo"]
+    return symbol
+
 def fetch_price_history(symbol: str, period: str = "5y") -> Optional[pd.Series]:
     """
     Lädt historische Kursdaten. Nutzt ETF_DB zur Korrektur (z.B. EIMI -> EIMI.L).
     Gibt Series mit Schlusskursen (index = DatetimeIndex) oder None zurück.
     """
     try:
-        symbol = symbol.strip().upper()
-
-        # ETF_DB lookup (wie bisher)
-        for etf in ETF_DB:
-            if etf.get("Ticker") == symbol or etf.get("ISIN") == symbol:
-                symbol = etf["Yahoo"]
-                break
+        symbol = _resolve_symbol(symbol)
 
         # zentrale Fetch-Funktion verwenden
         df = fetch_prices_from_yf(symbol, start=None, end=None, interval="1d", auto_adjust=True)
@@ -116,6 +120,101 @@ def fetch_price_history(symbol: str, period: str = "5y") -> Optional[pd.Series]:
         return None
 
 
+def fetch_price_panel(symbols) -> pd.DataFrame:
+    """
+    Lädt die Kurse mehrerer Symbole mit einem einzigen Download.
+    Gibt ein Panel (Index = Datum, Spalten = übergebene Symbole) zurück;
+    Symbole ohne Daten fehlen.
+    """
+    symbols = [s.strip().upper() for s in symbols if s and s.strip()]
+    yahoo = {s: _resolve_symbol(s) for s in symbols}
+    if not yahoo:
+        return pd.DataFrame()
+
+    try:
+        df = fetch_prices_from_yf(list(dict.fromkeys(yahoo.values())), start=None, end=None,
+                                  interval="1d", auto_adjust=True)
+    except Exception as e:
+        logger.exception("Error fetching panel %s: %s", symbols, e)
+        return pd.DataFrame()
+    if df is None or df.empty:
+        return pd.DataFrame()
+
+    cols = {str(c).upper(): c for c in df.columns}
+    # Einzel-Download ohne Ticker-Ebene: Spalten sind Felder (Close, ...)
+    if len(yahoo) == 1 and next(iter(yahoo.values())) not in cols:
+        series = sanitize_price_data(df)
+        if series is None:
+            return pd.DataFrame()
+        panel = series.to_frame(name=symbols[0])
+    else:
+        panel = pd.DataFrame({s: df[cols[y]] for s, y in yahoo.items() if y in cols})
+
+    panel = panel.apply(pd.to_numeric, errors="coerce").dropna(how="all")
+    panel = panel.loc[:, panel.notna().any()]
+    try:
+        panel.index = pd.to_datetime(panel.index)
+    except Exception:
+        pass
+    return panel.sort_index()
+
+
+def panel_returns(prices: pd.DataFrame) -> pd.DataFrame:
+    """Tagesrenditen je Spalte auf der eigenen Historie (wie series.dropna().pct_change())."""
+    return prices.ffill().pct_change(fill_method=None).where(prices.notna())
+
+
+def panel_asset_metrics(prices: pd.DataFrame, risk_free_rate: float = 0.02) -> pd.DataFrame:
+    """
+    Kennzahlen wie get_asset_metrics für alle Spalten eines Preis-Panels auf einmal.
+    Jede Spalte wird auf ihre eigene Historie reduziert; zu kurze Historien -> NaN.
+
+    Returns
+    -------
+    DataFrame (Index = symbol)
+        performance_1y, performance_3y, volatility_90d, sharpe,
+        max_drawdown, trend_sma_ratio
+    """
+    A, n = right_align(prices)
+    T = A.shape[0]
+
+    def last(k):
+        if T < k:
+            return np.full(A.shape[1], np.nan)
+        out = A[-k].copy()
+        out[n < k] = np.nan
+        return out
+
+    def window_mean(k):
+        out = np.nanmean(A[-k:], axis=0) if T >= k else np.full(A.shape[1], np.nan)
+        return np.where(n >= k, out, np.nan)
+
+    with np.errstate(divide="ignore", invalid="ignore"), warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        R = A[1:] / A[:-1] - 1
+        vol_90 = np.nanstd(R[-90:], axis=0, ddof=1) * np.sqrt(252) * 100
+        vol = np.nanstd(R, axis=0, ddof=1) * np.sqrt(252)
+        excess = np.nanmean(R, axis=0) * 252 - risk_free_rate
+
+        metrics = pd.DataFrame({
+            "performance_1y": (last(1) / last(252) - 1) * 100,
+            "performance_3y": (last(1) / last(252 * 3) - 1) * 100,
+            "volatility_90d": np.where(n >= 90, vol_90, np.nan),
+            "sharpe": np.where(vol > 0, excess / np.where(vol > 0, vol, 1.0), np.nan),
+            "max_drawdown": np.where(n > 0, max_drawdown(A) * 100, np.nan),
+            "trend_sma_ratio": window_mean(50) / window_mean(200),
+        }, index=pd.Index(prices.columns, name="symbol"))
+    return metrics
+
+
+def panel_correlations(prices: pd.DataFrame, benchmark: str) -> pd.Series:
+    """Korrelation der Tagesrenditen jeder Spalte mit der Spalte benchmark (paarweise Daten)."""
+    if benchmark not in prices.columns:
+        return pd.Series(np.nan, index=prices.columns)
+    rets = panel_returns(prices)
+    return rets.corrwith(rets[benchmark])
+
+
 def calc_return(series, days):
     if len(series) < days:
         return None
@@ -174,32 +273,60 @@ def safe_rename(series_or_df, name):
         return series_or_df[col].rename(name)
     return None
 
-def get_bitcoin_metrics():
-    series = fetch_price_history("BTC-USD")
-    if series is None:
+# Benchmarks für Korrelationsspalten: Spaltenname -> Symbol
+ASSET_BENCHMARKS = {"correlation_spy": "SPY", "correlation_gold": "GLD"}
+
+
+def _benchmark_map(benchmarks) -> dict:
+    if not benchmarks:
+        return {}
+    if isinstance(benchmarks, dict):
+        return {col: sym.strip().upper() for col, sym in benchmarks.items()}
+    return {f"correlation_{b.strip().lower()}": b.strip().upper() for b in benchmarks}
+
+
+def get_asset_metrics_many(symbols, benchmarks=None, prices: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """
+    Kennzahlen für viele Symbole auf einmal.
+
+    Alle Assets und Benchmarks werden mit einem Download in ein Panel geladen
+    (oder aus `prices` genommen) und gemeinsam ausgewertet.
+
+    benchmarks: dict Spaltenname -> Symbol (z.B. ASSET_BENCHMARKS) oder Liste
+                von Symbolen (Spalten correlation_<symbol>).
+
+    Returns
+    -------
+    DataFrame, eine Zeile je Symbol mit Daten (Reihenfolge wie übergeben):
+        symbol, performance_1y, performance_3y, volatility_90d, sharpe,
+        max_drawdown, trend_sma_ratio [, Korrelationsspalten]
+    """
+    symbols = list(dict.fromkeys(s.strip().upper() for s in symbols if s and s.strip()))
+    bench = _benchmark_map(benchmarks)
+
+    if prices is None:
+        prices = fetch_price_panel(symbols + [b for b in bench.values() if b not in symbols])
+
+    present = [s for s in symbols if s in prices.columns]
+    if not present:
+        return pd.DataFrame(columns=["symbol"])
+
+    metrics = panel_asset_metrics(prices[present])
+    for col, b in bench.items():
+        metrics[col] = panel_correlations(prices, b).reindex(present)
+    return metrics.reset_index()
+
+
+def _metrics_dict(df: pd.DataFrame, symbol: str) -> Optional[dict]:
+    """Erste Zeile als dict (NaN -> None), wie die bisherigen Einzel-Kennzahlen."""
+    if df.empty:
         return None
-    return {
-        "symbol": "BTC-USD",
-        "performance_1y": calc_return(series, 252),
-        "performance_3y": calc_return(series, 252 * 3),
-        "volatility_90d": calc_volatility(series, 90),
-        "sharpe": calc_sharpe(series),
-        "max_drawdown": calc_drawdown(series),
-        "trend_sma_ratio": calc_sma_ratio(series, 50, 200),
-        "correlation_spy": calc_correlation(series, "SPY"),
-        "correlation_gold": calc_correlation(series, "GLD"),
-    }
+    row = {k: (None if pd.isna(v) else float(v)) for k, v in df.iloc[0].items() if k != "symbol"}
+    return {"symbol": symbol, **row}
+
+
+def get_bitcoin_metrics():
+    return _metrics_dict(get_asset_metrics_many(["BTC-USD"], benchmarks=ASSET_BENCHMARKS), "BTC-USD")
 
 def get_asset_metrics(symbol):
-    series = fetch_price_history(symbol)
-    if series is None:
-        return None
-    return {
-        "symbol": symbol,
-        "performance_1y": calc_return(series, 252),
-        "performance_3y": calc_return(series, 252 * 3),
-        "volatility_90d": calc_volatility(series, 90),
-        "sharpe": calc_sharpe(series),
-        "max_drawdown": calc_drawdown(series),
-        "trend_sma_ratio": calc_sma_ratio(series, 50, 200),
-    }
\ No newline at end of file
+    return _metrics_dict(get_asset_metrics_many([symbol]), symbol)
@@ -0,0 +1,217 @@
+# risk_dashboard/core/dca_analysis.py
+"""
+Sparplan-Analyse (DCA) für alle Startmonate und Haltedauern auf einmal.
+
+Statt run_backtest(monthly_dca=...) einmal pro Startdatum aufzurufen, werden
+die Ergebnisse über Kumulativsummen gewonnen: Ein Sparplan mit Betrag a und
+Gewichten w kauft im Monat m je Asset a * w_j / P_j(m) Anteile. Mit
+K_j(m) = Σ_{i<=m} 1 / P_j(i) ist der Wert eines Plans mit Start s im Monat e
+
+    V(s, e) = a * Σ_j w_j * P_j(e) * (K_j(e) - K_j(s - 1))
+
+– für alle (s, e) eine Differenz kumulierter Summen. Daraus folgen
+Endwert, Vielfaches des eingezahlten Kapitals, IRR (monatlich,
+vektorisierte Bisektion, annualisiert) und der schlechteste Drawdown des
+Depotwerts (Monatsraster) für jede Kombination aus Start und Haltedauer.
+
+Kauftag ist der erste Handelstag jedes Monats.
+"""
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_HORIZONS = (12, 36, 60, 120, 180, 240)
+IRR_ITERATIONS = 80
+
+
+# ---------------------------------------------------------
+# Monatsraster
+# ---------------------------------------------------------
+
+def purchase_prices(prices, start=None, end=None) -> pd.DataFrame:
+    """
+    Kurse am ersten Handelstag jedes Monats (Lücken vorgetragen), ab dem
+    ersten Monat, in dem alle Assets einen Kurs haben.
+    """
+    if isinstance(prices, pd.Series):
+        prices = prices.to_frame(name=prices.name if prices.name is not None else "asset")
+    prices = prices.sort_index().ffill()
+    if start is not None:
+        prices = prices[prices.index >= pd.to_datetime(start)]
+    if end is not None:
+        prices = prices[prices.index <= pd.to_datetime(end)]
+    monthly = prices.groupby(prices.index.to_period("M")).head(1)
+    monthly = monthly[monthly.notna().all(axis=1) & (monthly > 0).all(axis=1)]
+    return monthly
+
+
+def _weights(columns, weights: Optional[Dict[str, float]]) -> np.ndarray:
+    if weights is None:
+        w = np.ones(len(columns))
+    else:
+        w = np.array([float(weights.get(c, 0.0)) for c in columns])
+        if w.sum() == 0:
+            w = np.ones(len(columns))
+    return w / w.sum()
+
+
+# ---------------------------------------------------------
+# Kern
+# ---------------------------------------------------------
+
+def dca_value_matrix(monthly: pd.DataFrame, weights: Optional[Dict[str, float]] = None,
+                     amount: float = 100.0) -> np.ndarray:
+    """
+    V (M x M): Depotwert im Monat e (Spalte) eines Plans mit Start s (Zeile),
+    direkt nach dem Kauf in e; NaN für e < s.
+    """
+    P = monthly.to_numpy(dtype=float)                       # M x J
+    w = _weights(monthly.columns, weights)
+    K = np.vstack([np.zeros((1, P.shape[1])), np.cumsum(1.0 / P, axis=0)])   # K[m] = Σ_{i<m}
+
+    # V[s, e] = a * Σ_j w_j P_j(e) (K_j(e+1) - K_j(s))
+    #         = a * (Σ_j w_j P_j(e) K_j(e+1)  -  Σ_j w_j P_j(e) K_j(s))
+    wP = P * w                                               # M x J
+    own = np.einsum("ej,ej->e", wP, K[1:])                   # Σ_j w_j P_j(e) K_j(e+1)
+    cross = K[:-1] @ wP.T                                    # [s, e] = Σ_j K_j(s) w_j P_j(e)
+    V = amount * (own[None, :] - cross)
+    M = len(P)
+    V[np.tril_indices(M, k=-1)] = np.nan
+    return V
+
+
+def _annuity_factor(r: np.ndarray, n: np.ndarray) -> np.ndarray:
+    """Σ_{k=0}^{n-1} (1 + r)^k, stabil für r -> 0."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        f = np.expm1(n * np.log1p(r)) / r
+    return np.where(np.abs(r) < 1e-12, n, f)
+
+
+def dca_irr(multiple: np.ndarray, months: np.ndarray) -> np.ndarray:
+    """
+    Annualisierter IRR je Zelle: löst Σ_{k<n} (1 + r)^k = Vielfaches * n
+    per Bisektion (monoton in r) für alle Zellen gleichzeitig.
+    """
+    target = multiple * months
+    lo = np.full(target.shape, -0.99)
+    hi = np.full(target.shape, 1.0)
+    for _ in range(IRR_ITERATIONS):
+        mid = 0.5 * (lo + hi)
+        above = _annuity_factor(mid, months) > target
+        hi = np.where(above, mid, hi)
+        lo = np.where(above, lo, mid)
+    r = 0.5 * (lo + hi)
+    valid = np.isfinite(target) & (months > 1)
+    return np.where(valid, (1 + r) ** 12 - 1, np.nan)
+
+
+def dca_grid(prices, amount: float = 100.0, weights: Optional[Dict[str, float]] = None,
+             horizons: Optional[Iterable[int]] = None, start=None, end=None) -> Dict[str, pd.DataFrame]:
+    """
+    Ergebnisse eines monatlichen Sparplans für jeden Startmonat und jede
+    Haltedauer (Anzahl Raten) in einem Durchlauf.
+
+    Returns
+    -------
+    dict Kennzahl -> DataFrame (Index = Startmonat, Spalten = Haltedauer in Monaten)
+        final_value, invested, multiple, irr (p.a.), max_drawdown
+    sowie "to_date": DataFrame je Startmonat für Pläne bis zum letzten Monat.
+    """
+    monthly = purchase_prices(prices, start=start, end=end)
+    M = len(monthly)
+    horizons = np.array(sorted(set(int(h) for h in (horizons or DEFAULT_HORIZONS) if h >= 1)), dtype=int)
+    starts = monthly.index.to_period("M")
+    if M == 0 or len(horizons) == 0:
+        empty = pd.DataFrame(index=starts, columns=horizons, dtype=float)
+        return {key: empty.copy() for key in ("final_value", "invested", "multiple", "irr", "max_drawdown", "to_date")}
+
+    V = dca_value_matrix(monthly, weights, amount)
+
+    # Drawdown des Depotwerts ab Start: laufendes Hoch je Zeile, schlechtester Wert bis e
+    V0 = np.nan_to_num(V, nan=0.0)
+    peak = np.maximum.accumulate(V0, axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        dd = np.where(peak > 0, V0 / peak - 1.0, 0.0)
+    worst = np.minimum.accumulate(dd, axis=1)
+
+    s_idx = np.arange(M)[:, None]
+    e_idx = s_idx + horizons[None, :] - 1
+    inside = e_idx < M
+    e_safe = np.minimum(e_idx, M - 1)
+
+    n = np.broadcast_to(horizons[None, :].astype(float), e_idx.shape)
+    final = np.where(inside, V[s_idx, e_safe], np.nan)
+    invested = np.where(inside, amount * n, np.nan)
+    multiple = final / invested
+    irr = dca_irr(multiple, n)
+    max_dd = np.where(inside, worst[s_idx, e_safe], np.nan)
+
+    def frame(values):
+        return pd.DataFrame(values, index=starts, columns=pd.Index(horizons, name="months"))
+
+    # Pläne bis zum letzten Monat (Haltedauer je Start verschieden)
+    months_to_date = (M - np.arange(M)).astype(float)
+    final_to_date = V[:, -1]
+    multiple_to_date = final_to_date / (amount * months_to_date)
+    to_date = pd.DataFrame({
+        "months": months_to_date.astype(int),
+        "invested": amount * months_to_date,
+        "final_value": final_to_date,
+        "multiple": multiple_to_date,
+        "irr": dca_irr(multiple_to_date, months_to_date),
+        "max_drawdown": worst[:, -1],
+    }, index=starts)
+
+    return {
+        "final_value": frame(final),
+        "invested": frame(invested),
+        "multiple": frame(multiple),
+        "irr": frame(irr),
+        "max_drawdown": frame(max_dd),
+        "to_date": to_date,
+    }
+
+
+def dca_distribution(grid: Dict[str, pd.DataFrame], metric: str = "irr",
+                     quantiles=(0.05, 0.25, 0.5, 0.75, 0.95)) -> pd.DataFrame:
+    """Verteilung einer Kennzahl über alle Startmonate je Haltedauer (Quantile, Min/Max, Anteil > 0)."""
+    data = grid[metric]
+    out = data.quantile(list(quantiles)).T
+    out.columns = [f"p{int(q * 100)}" for q in quantiles]
+    out.insert(0, "min", data.min())
+    out["max"] = data.max()
+    out["n_starts"] = data.notna().sum()
+    if metric == "irr":
+        out["share_positive"] = (data > 0).sum() / out["n_starts"].replace(0, np.nan)
+    return out
+
+
+# ---------------------------------------------------------
+# Plots
+# ---------------------------------------------------------
+
+def plot_dca_heatmap(grid: Dict[str, pd.DataFrame], metric: str = "irr", title: Optional[str] = None):
+    """Heatmap Startmonat x Haltedauer (plotly)."""
+    import plotly.express as px
+
+    data = grid[metric].T
+    data.columns = data.columns.astype(str)
+    fmt = ".2f" if metric in ("multiple",) else (".0f" if metric in ("final_value", "invested") else ".1%")
+    return px.imshow(
+        data,
+        aspect="auto",
+        color_continuous_scale="RdYlGn",
+        labels={"x": "Startmonat", "y": "Haltedauer (Monate)", "color": metric},
+        title=title or f"Sparplan: {metric} je Startmonat und Haltedauer",
+        text_auto=False if data.size > 400 else fmt,
+    )
+
+
+def plot_dca_distribution(grid: Dict[str, pd.DataFrame], metric: str = "irr", title: Optional[str] = None):
+    """Box-Plot der Kennzahl über alle Startmonate je Haltedauer (plotly)."""
+    import plotly.express as px
+
+    long = grid[metric].reset_index(drop=True).melt(var_name="Haltedauer (Monate)", value_name=metric).dropna()
+    return px.box(long, x="Haltedauer (Monate)", y=metric,
+                  title=title or f"Sparplan: Verteilung {metric} über alle Startmonate")
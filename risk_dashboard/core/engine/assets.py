@@ -6,6 +6,7 @@ from datetime import datetime, timedelta
 import logging
 
 from risk_dashboard.data_utils import fetch_prices_from_yf, flatten_yf_dataframe
+from risk_dashboard.core.ki_panel import panel_engine_ki_scores
 
 logger = logging.getLogger(__name__)
 
@@ -56,63 +57,17 @@ def fetch_prices(ticker: str, days: int = 365) -> Optional[pd.DataFrame]:
 # KI-Score aus Kursdaten
 # -------------------------------------------------------------------
 def compute_ki_score_from_prices(prices: pd.DataFrame | None) -> float | None:
+    """Einspaltiger Aufruf von ki_panel.panel_engine_ki_scores (Momentum, Vol, Drawdown, Sharpe)."""
     if prices is None or len(prices) < 60:
         return None
 
     # Close-Preis bestimmen
     close = prices["Adj Close"] if "Adj Close" in prices.columns else prices["Close"]
+    if isinstance(close, pd.DataFrame):
+        close = close.iloc[:, 0]
 
-    # Renditen
-    returns = close.pct_change().dropna()
-    if len(returns) == 0:
-        return None
-
-    # 1) Momentum (6 Monate)
-    try:
-        mom_raw = (close.iloc[-1] / close.iloc[max(0, len(close) - 126)]) - 1
-        momentum = float(mom_raw.item() if hasattr(mom_raw, "item") else mom_raw)
-    except Exception:
-        momentum = None
-
-    # 2) Volatilität (immer Float!)
-    vol = returns.std()
-    if hasattr(vol, "mean"):
-        vol = float(vol.mean())
-
-    vol_score = 1 / (1 + vol) if vol is not None else None
-
-    # 3) Max Drawdown
-    roll_max = close.cummax()
-    dd_raw = (close / roll_max - 1).min()
-    drawdown = float(dd_raw.item() if hasattr(dd_raw, "item") else dd_raw)
-    dd_score = 1 + drawdown
-
-    # 4) Sharpe-Proxy
-    mean_raw = returns.mean()
-    mean_ret = float(mean_raw.item() if hasattr(mean_raw, "item") else mean_raw)
-    sharpe = mean_ret / vol if (vol is not None and vol > 0) else 0
-
-    # Normierung
-    def norm(x: Any, a: float, b: float) -> Optional[float]:
-        try:
-            x = float(x)
-        except Exception:
-            return None
-        x = max(min(x, b), a)
-        return (x - a) / (b - a)
-
-    m_score = norm(momentum, -0.5, 0.5)
-    s_score = norm(sharpe, -1, 1)
-
-    # Gesamt-Score
-    ki = (
-        0.4 * (m_score or 0)
-        + 0.2 * (vol_score or 0)
-        + 0.2 * (dd_score or 0)
-        + 0.2 * (s_score or 0)
-    )
-
-    return round(ki * 100, 2)
+    ki = panel_engine_ki_scores(close, min_points=2).iloc[0]
+    return None if pd.isna(ki) else float(ki)
 
 
 # -------------------------------------------------------------------
@@ -0,0 +1,287 @@
+# risk_dashboard/core/etf_similarity.py
+"""
+Ähnlichkeitsindex für ETFs ("ähnliche ETFs finden") über Renditeprofile.
+
+Jeder ETF wird durch seine Tagesrenditen im Fenster der letzten `window`
+Handelstage beschrieben. Die Renditen werden je Spalte zentriert und auf
+Länge 1 normiert; das Skalarprodukt zweier Zeilen der normierten Matrix ist
+dann ihre Korrelation. Eine Top-k-Abfrage ist damit ein einziges
+Matrix-Vektor-Produkt, Korrelationsdistanz = 1 - Korrelation.
+
+Optional wird die Matrix per PCA (SVD) auf n_components Faktoren verdichtet.
+
+Fehlende Renditen zählen nach dem Zentrieren als 0 (Korrelation über das
+gemeinsame Fenster, ohne paarweises Ausblenden). Neue Kurse werden
+inkrementell eingearbeitet: nur die neuen Renditen werden berechnet, die
+Fenstersummen um neue Zeilen ergänzt und um herausfallende bereinigt.
+"""
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from risk_dashboard.core.store_io import data_version, load_store, save_store
+
+SIMILARITY_STORE_DIR = Path("cache") / "similarity"
+
+DEFAULT_WINDOW = 756        # ca. 3 Jahre Handelstage
+MIN_COVERAGE = 0.5          # Mindestanteil gültiger Renditen im Fenster
+
+# name -> index
+_MEMORY: dict = {}
+
+
+# ---------------------------------------------------------
+# Index
+# ---------------------------------------------------------
+
+def _returns_from(prices: pd.DataFrame, last_prices: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Renditen je Zeile gegenüber dem letzten bekannten Kurs (Lücken werden
+    übersprungen), NaN wo kein Kurs vorliegt. last_prices = letzter Kurs vor
+    der ersten Zeile (für inkrementelle Updates).
+    """
+    X = prices.to_numpy(dtype=float)
+    if last_prices is None:
+        last_prices = np.full(X.shape[1], np.nan)
+    filled = pd.DataFrame(np.vstack([last_prices, X])).ffill().to_numpy()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        R = X / filled[:-1] - 1
+    return np.where(np.isfinite(R), R, np.nan)
+
+
+def _normalize(index: dict) -> dict:
+    """Normierte Matrix (N x T bzw. N x k) aus Fensterrenditen und -summen."""
+    R = index["returns"]                            # T x N
+    n, s1, s2 = index["count"], index["sum"], index["sumsq"]
+    valid = np.isfinite(R)
+    T = R.shape[0]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = s1 / n
+        norm = np.sqrt(np.clip(s2 - n * mean * mean, 0.0, None))
+    usable = (n >= max(2, MIN_COVERAGE * T)) & (norm > 0)
+
+    U = np.where(valid, R - mean, 0.0).T            # N x T
+    U = np.where(usable[:, None], U / np.where(norm > 0, norm, 1.0)[:, None], 0.0)
+
+    k = index.get("n_components")
+    if k and usable.any():
+        # Zeilen von U in der Basis der ersten k rechten Singulärvektoren
+        _, _, Vt = np.linalg.svd(U[usable], full_matrices=False)
+        basis = Vt[:int(k)]
+        Z = U @ basis.T
+        lengths = np.linalg.norm(Z, axis=1)
+        U = np.where(lengths[:, None] > 0, Z / np.where(lengths > 0, lengths, 1.0)[:, None], 0.0)
+        index["basis"] = basis
+    else:
+        index["basis"] = None
+
+    index["mean"] = mean
+    index["norm"] = norm
+    index["usable"] = usable
+    index["matrix"] = U
+    return index
+
+
+def build_similarity_index(prices: pd.DataFrame, window: int = DEFAULT_WINDOW,
+                           n_components: Optional[int] = None) -> dict:
+    """
+    Baut den Index aus einem Kurs-Panel (Datum x Ticker).
+
+    Returns
+    -------
+    dict
+        tickers, dates (Fenster), returns (T x N), count/sum/sumsq je Ticker,
+        matrix (normiert), usable (genug Daten), last_prices, n_rows, data_version
+    """
+    prices = prices.sort_index()
+    R = _returns_from(prices)[1:]
+    dates = prices.index[1:]
+    R, dates = R[-window:], dates[-window:]
+    valid = np.isfinite(R)
+    R0 = np.where(valid, R, 0.0)
+
+    index = {
+        "tickers": [str(c) for c in prices.columns],
+        "window": int(window),
+        "n_components": int(n_components) if n_components else None,
+        "dates": dates,
+        "returns": R,
+        "count": valid.sum(axis=0).astype(float),
+        "sum": R0.sum(axis=0),
+        "sumsq": np.einsum("tn,tn->n", R0, R0),
+        "last_prices": prices.ffill().iloc[-1].to_numpy(dtype=float) if len(prices) else np.array([]),
+        "n_rows": int(len(prices)),
+        "data_version": data_version(prices),
+    }
+    return _normalize(index)
+
+
+def update_similarity_index(index: dict, new_prices: pd.DataFrame, full_prices: Optional[pd.DataFrame] = None) -> dict:
+    """
+    Arbeitet neue Kurszeilen ein: Renditen nur für die neuen Tage, Fenstersummen
+    um neue Zeilen ergänzt und um herausfallende Zeilen bereinigt.
+    """
+    new_prices = new_prices.sort_index()
+    new_prices = new_prices.set_axis([str(c) for c in new_prices.columns], axis=1)[index["tickers"]]
+    if new_prices.empty:
+        return index
+
+    R_new = _returns_from(new_prices, index["last_prices"])
+    R = np.vstack([index["returns"], R_new])
+    dates = index["dates"].append(new_prices.index)
+    drop = max(len(R) - index["window"], 0)
+
+    def sums(block):
+        valid = np.isfinite(block)
+        B = np.where(valid, block, 0.0)
+        return valid.sum(axis=0), B.sum(axis=0), np.einsum("tn,tn->n", B, B)
+
+    add_n, add_s1, add_s2 = sums(R_new)
+    rem_n, rem_s1, rem_s2 = sums(R[:drop])
+
+    index = dict(index)
+    index.update({
+        "returns": R[drop:],
+        "dates": dates[drop:],
+        "count": index["count"] + add_n - rem_n,
+        "sum": index["sum"] + add_s1 - rem_s1,
+        "sumsq": index["sumsq"] + add_s2 - rem_s2,
+        "last_prices": pd.DataFrame(np.vstack([index["last_prices"], new_prices.to_numpy(dtype=float)]))
+                         .ffill().iloc[-1].to_numpy(),
+        "n_rows": index["n_rows"] + len(new_prices),
+    })
+    if full_prices is not None:
+        index["data_version"] = data_version(full_prices)
+    return _normalize(index)
+
+
+# ---------------------------------------------------------
+# Abfragen
+# ---------------------------------------------------------
+
+def _top_k(index: dict, q: np.ndarray, k: int, exclude: Optional[int] = None) -> pd.DataFrame:
+    corr = index["matrix"] @ q
+    candidates = index["usable"].copy()
+    if exclude is not None:
+        candidates[exclude] = False
+    pos = np.flatnonzero(candidates)
+    k = min(k, len(pos))
+    if k <= 0:
+        return pd.DataFrame(columns=["ticker", "correlation", "distance"])
+    top = pos[np.argpartition(-corr[pos], k - 1)[:k]]
+    top = top[np.argsort(-corr[top], kind="stable")]
+    return pd.DataFrame({
+        "ticker": [index["tickers"][i] for i in top],
+        "correlation": corr[top],
+        "distance": 1.0 - corr[top],
+    })
+
+
+def similar_etfs(index: dict, ticker: str, k: int = 10) -> pd.DataFrame:
+    """Die k ähnlichsten ETFs zu einem Ticker des Index (nach Korrelationsdistanz)."""
+    tickers = index["tickers"]
+    if ticker not in tickers:
+        raise KeyError(f"Ticker {ticker} ist nicht im Ähnlichkeitsindex.")
+    i = tickers.index(ticker)
+    if not index["usable"][i]:
+        return pd.DataFrame(columns=["ticker", "correlation", "distance"])
+    return _top_k(index, index["matrix"][i], k, exclude=i)
+
+
+def similar_to_returns(index: dict, returns: pd.Series, k: int = 10) -> pd.DataFrame:
+    """Die k ähnlichsten ETFs zu einer externen Renditereihe (z.B. eigenes Depot)."""
+    r = returns.reindex(index["dates"]).to_numpy(dtype=float)
+    valid = np.isfinite(r)
+    if valid.sum() < 2:
+        return pd.DataFrame(columns=["ticker", "correlation", "distance"])
+    q = np.where(valid, r - r[valid].mean(), 0.0)
+    if index["basis"] is not None:
+        q = index["basis"] @ q
+    norm = np.linalg.norm(q)
+    if norm == 0:
+        return pd.DataFrame(columns=["ticker", "correlation", "distance"])
+    return _top_k(index, q / norm, k)
+
+
+# ---------------------------------------------------------
+# Persistenz & inkrementelles Fortschreiben
+# ---------------------------------------------------------
+
+def _paths(name: str, store_dir=None):
+    store_dir = Path(store_dir) if store_dir is not None else SIMILARITY_STORE_DIR
+    return store_dir / f"{name}.parquet", store_dir / f"{name}.json"
+
+
+def save_similarity_index(index: dict, name: str, store_dir=None) -> None:
+    parquet_path, meta_path = _paths(name, store_dir)
+    meta = {
+        "tickers": index["tickers"],
+        "window": index["window"],
+        "n_components": index["n_components"],
+        "count": index["count"].tolist(),
+        "sum": index["sum"].tolist(),
+        "sumsq": index["sumsq"].tolist(),
+        "last_prices": [None if np.isnan(x) else float(x) for x in index["last_prices"]],
+        "n_rows": index["n_rows"],
+        "data_version": index["data_version"],
+    }
+    returns = pd.DataFrame(index["returns"], index=index["dates"], columns=index["tickers"])
+    save_store({parquet_path: returns}, meta_path, meta)
+
+
+def load_similarity_index(name: str, store_dir=None) -> Optional[dict]:
+    parquet_path, meta_path = _paths(name, store_dir)
+    stored = load_store([parquet_path], meta_path)
+    if stored is None:
+        return None
+    (returns,), index = stored
+    for key in ("count", "sum", "sumsq", "last_prices"):
+        index[key] = np.asarray(index[key], dtype=float)
+    index["returns"] = returns.to_numpy(dtype=float)
+    index["dates"] = returns.index
+    return _normalize(index)
+
+
+def get_similarity_index(prices: pd.DataFrame, name: str = "etf", window: int = DEFAULT_WINDOW,
+                         n_components: Optional[int] = None, store_dir=None) -> dict:
+    """
+    Ähnlichkeitsindex für die aktuelle Datenversion.
+    - gleiche Version im Speicher/auf Platte -> direkt verwenden
+    - Panel = bisherige Kurse + neue Tage -> inkrementelles Update
+    - sonst -> Neuaufbau
+    """
+    prices = prices.sort_index()
+    version = data_version(prices)
+    cols = [str(c) for c in prices.columns]
+
+    index = _MEMORY.get(name)
+    if index is None:
+        index = load_similarity_index(name, store_dir)
+
+    usable = (
+        index is not None
+        and index["tickers"] == cols
+        and index["window"] == int(window)
+        and index["n_components"] == (int(n_components) if n_components else None)
+    )
+    if usable and index["data_version"] == version:
+        _MEMORY[name] = index
+        return index
+
+    n_old = int(index["n_rows"]) if usable else 0
+    if usable and len(prices) > n_old and data_version(prices.iloc[:n_old]) == index["data_version"]:
+        index = update_similarity_index(index, prices.iloc[n_old:], full_prices=prices)
+    else:
+        index = build_similarity_index(prices, window=window, n_components=n_components)
+
+    _MEMORY[name] = index
+    save_similarity_index(index, name, store_dir)
+    return index
+
+
+def clear_similarity_cache():
+    """Vergisst die Ähnlichkeitsindizes im Speicher; der nächste Abruf lädt sie aus cache/similarity."""
+    _MEMORY.clear()
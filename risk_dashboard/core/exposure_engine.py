@@ -0,0 +1,204 @@
+# risk_dashboard/core/exposure_engine.py
+"""
+Look-Through-Exposure für ETF-Portfolios über dünnbesetzte Matrizen.
+
+Aus den Holdings aller ETFs entsteht einmal eine dünnbesetzte Matrix
+H (ETFs x Wertpapiere) sowie kategoriale Zuordnungsmatrizen
+S (Wertpapiere x Länder) und C (Länder x Regionen). Die Exposure eines
+Portfolios (oder vieler Portfolios als Zeilen einer Gewichtsmatrix P) ist
+dann ein Matrixprodukt:
+
+    Wertpapiere = P @ H,   Länder = P @ (H @ S),   Regionen = P @ (H @ S @ C)
+
+H @ S und H @ S @ C werden beim Aufbau vorberechnet.
+
+Länder kommen aus einer Länderspalte der Holdings (iShares: "Location"),
+sonst aus dem statischen Mapping in ticker_country_map (ohne Netzabfrage);
+Regionen aus country_to_region.
+"""
+import logging
+from typing import Callable, Dict, Optional, Union
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from risk_dashboard.core.data.country_to_region import country_to_region
+from risk_dashboard.core.holdings_overlap import normalize_holdings
+
+logger = logging.getLogger(__name__)
+
+UNKNOWN = "Unbekannt"
+
+COUNTRY_COLUMNS = ("location", "standort", "country", "land")
+
+# Schreibweisen aus Holdings-Dateien (iShares: englisch) -> Namen wie in ticker_country_map
+COUNTRY_ALIASES = {
+    "united states": "USA", "us": "USA", "germany": "Deutschland", "france": "Frankreich",
+    "united kingdom": "UK", "great britain": "UK", "switzerland": "Schweiz", "canada": "Kanada",
+    "netherlands": "Niederlande", "spain": "Spanien", "italy": "Italien", "sweden": "Schweden",
+}
+
+
+# ---------------------------------------------------------
+# Zuordnungen
+# ---------------------------------------------------------
+
+def static_country(ticker: str) -> str:
+    """Land laut statischem Mapping (ticker_country_map), ohne yfinance-Abfrage."""
+    try:
+        from risk_dashboard.core.data.ticker_country_map import TICKER_COUNTRY, ETF_REGIONS
+    except Exception:
+        return UNKNOWN
+    return TICKER_COUNTRY.get(ticker) or ETF_REGIONS.get(ticker) or UNKNOWN
+
+
+def region_of(country: str) -> str:
+    """Region laut country_to_region (Groß-/Kleinschreibung egal)."""
+    return country_to_region.get(str(country).strip().lower(), UNKNOWN)
+
+
+def _drop_unresolvable_aliases() -> None:
+    """Aliase ohne Region würden Holdings nach "Unbekannt" verschieben: warnen und entfernen."""
+    for raw, alias in list(COUNTRY_ALIASES.items()):
+        if region_of(alias) == UNKNOWN:
+            logger.warning("COUNTRY_ALIASES: %r -> %r hat keine Region in country_to_region, Alias entfernt", raw, alias)
+            del COUNTRY_ALIASES[raw]
+
+
+_drop_unresolvable_aliases()
+
+
+def _alias(country: str) -> str:
+    """Einheitlicher Ländername; Rohwert, falls der Alias keine Region hat."""
+    alias = COUNTRY_ALIASES.get(country.lower(), country)
+    return alias if region_of(alias) != UNKNOWN else country
+
+
+def _holdings_countries(df: pd.DataFrame) -> Dict[str, str]:
+    """Länderspalte der Holdings (falls vorhanden) -> {Ticker: Land}."""
+    if not isinstance(df, pd.DataFrame):
+        return {}
+    cols = {str(c).strip().lower(): c for c in df.columns}
+    col = next((cols[c] for c in COUNTRY_COLUMNS if c in cols), None)
+    tick = cols.get("ticker") or cols.get("symbol")
+    if col is None or tick is None:
+        return {}
+    pairs = df[[tick, col]].dropna()
+    names = pairs[col].astype(str).str.strip()
+    names = names.map(_alias)
+    return dict(zip(pairs[tick].astype(str).str.strip().str.upper(), names))
+
+
+def _one_hot(labels, categories) -> sparse.csr_matrix:
+    pos = {c: i for i, c in enumerate(categories)}
+    rows = np.arange(len(labels))
+    cols = np.array([pos[label] for label in labels], dtype=int)
+    return sparse.csr_matrix((np.ones(len(labels)), (rows, cols)), shape=(len(labels), len(categories)))
+
+
+# ---------------------------------------------------------
+# Modell
+# ---------------------------------------------------------
+
+def build_exposure_model(holdings: Dict[str, Union[pd.DataFrame, pd.Series]],
+                         country_lookup: Optional[Callable[[str], str]] = None,
+                         normalize: bool = True) -> dict:
+    """
+    Baut H, S, C für einen Satz von ETF-Holdings.
+
+    holdings : {ETF: DataFrame (ticker, weight_in_etf[, location]) oder Series Ticker -> Gewicht}
+    country_lookup : Ticker -> Land für Wertpapiere ohne Länderangabe (Standard: static_country)
+    normalize : Gewichte je ETF auf Summe 1 skalieren (sonst Rohgewichte wie geliefert)
+    """
+    country_lookup = country_lookup or static_country
+
+    etfs, weights, countries = [], [], {}
+    for etf, h in holdings.items():
+        if isinstance(h, pd.Series):
+            w = h[h > 0]
+            if normalize and w.sum() > 0:
+                w = w / w.sum()
+        else:
+            if h is None or h.empty:
+                continue
+            try:
+                w = normalize_holdings(h, normalize=normalize)
+            except ValueError:
+                continue
+            for ticker, country in _holdings_countries(h).items():
+                countries.setdefault(ticker, country)
+        etfs.append(etf)
+        weights.append(w)
+
+    stacked = pd.concat(weights) if weights else pd.Series(dtype=float)
+    securities = sorted(set(stacked.index))
+    rows = np.repeat(np.arange(len(weights)), [len(w) for w in weights])
+    cols = pd.Index(securities).get_indexer(stacked.index)
+    vals = stacked.to_numpy(dtype=float)
+    H = sparse.csr_matrix((vals, (rows, cols)), shape=(len(etfs), len(securities)))
+
+    sec_country = [countries.get(s) or country_lookup(s) or UNKNOWN for s in securities]
+    country_list = sorted(set(sec_country))
+    region_list = sorted({region_of(c) for c in country_list})
+    S = _one_hot(sec_country, country_list)
+    C = _one_hot([region_of(c) for c in country_list], region_list)
+
+    HS = (H @ S).tocsr()
+    return {
+        "etfs": etfs,
+        "securities": securities,
+        "countries": country_list,
+        "regions": region_list,
+        "security_country": pd.Series(sec_country, index=securities, name="country"),
+        "H": H,
+        "S": S,
+        "C": C,
+        "HS": HS,
+        "HSC": (HS @ C).tocsr(),
+    }
+
+
+def _portfolio_matrix(model: dict, portfolios) -> tuple:
+    """
+    dict/Series (ein Portfolio) oder DataFrame (Portfolios x ETFs) -> (P sparse, Zeilenlabels,
+    nicht auflösbar, einzeln?). Nicht auflösbar: Series (ein Portfolio) bzw.
+    DataFrame Portfolios x ETFs ohne Holdings im Modell.
+    """
+    single = not isinstance(portfolios, pd.DataFrame)
+    frame = pd.DataFrame([pd.Series(portfolios, dtype=float)]) if single else portfolios.astype(float)
+    frame = frame.fillna(0.0)
+
+    unknown = [c for c in frame.columns if c not in model["etfs"]]
+    P = frame.reindex(columns=model["etfs"], fill_value=0.0).to_numpy()
+    unresolved = frame[unknown]
+    if single:
+        unresolved = unresolved.iloc[0] if unknown else pd.Series(dtype=float)
+    return sparse.csr_matrix(P), frame.index, unresolved, single
+
+
+def look_through(model: dict, portfolios, levels=("security", "country", "region")) -> dict:
+    """
+    Exposure eines Portfolios ({ETF: Gewicht oder Marktwert}) bzw. vieler
+    Portfolios (DataFrame Portfolios x ETFs) auf Wertpapier-, Länder- und Regionsebene.
+
+    Returns
+    -------
+    dict Ebene -> Series (ein Portfolio) bzw. DataFrame (Portfolios x Kategorie),
+    plus "unresolved": Gewichte von Positionen ohne Holdings im Modell
+    (Series bzw. DataFrame Portfolios x ETFs).
+    """
+    P, labels, unresolved, single = _portfolio_matrix(model, portfolios)
+    mats = {
+        "security": (model["H"], model["securities"]),
+        "country": (model["HS"], model["countries"]),
+        "region": (model["HSC"], model["regions"]),
+    }
+    out = {}
+    for level in levels:
+        M, columns = mats[level]
+        X = (P @ M).toarray()
+        frame = pd.DataFrame(X, index=labels, columns=columns)
+        out[level] = frame.iloc[0].sort_values(ascending=False) if single else frame
+    out["unresolved"] = unresolved
+    return out
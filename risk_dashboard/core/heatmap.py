@@ -3,7 +3,12 @@
 from __future__ import annotations
 from typing import Dict, List
 
-from risk_dashboard.core.risk_model import compute_risk_scores
+from risk_dashboard.core.risk_model import risk_scores_table
+
+HEATMAP_DIMS = [
+    "macro", "geo", "governance", "handel", "supply_chain", "financial",
+    "tech", "energie", "currency", "political_security", "total",
+]
 
 
 # ---------------------------------------------------------
@@ -15,26 +20,12 @@ def risk_heatmap(presets: Dict[str, dict]) -> List[List]:
     Gibt eine Heatmap-Tabelle zurück:
     Land | macro | geo | governance | handel | supply_chain | financial | tech | energie | currency | political_security | total
     """
-    rows = []
+    table = risk_scores_table(presets)[HEATMAP_DIMS]
 
-    for land, params in presets.items():
-        scores = compute_risk_scores(params)
-        rows.append([
-            land,
-            round(scores["macro"], 3),
-            round(scores["geo"], 3),
-            round(scores["governance"], 3),
-            round(scores["handel"], 3),
-            round(scores["supply_chain"], 3),
-            round(scores["financial"], 3),
-            round(scores["tech"], 3),
-            round(scores["energie"], 3),
-            round(scores["currency"], 3),
-            round(scores["political_security"], 3),
-            round(scores["total"], 3)
-        ])
-
-    return rows
+    return [
+        [land] + [round(float(v), 3) for v in values]
+        for land, values in zip(table.index, table.to_numpy())
+    ]
 
 
 # ---------------------------------------------------------
@@ -46,9 +37,10 @@ def political_heatmap(presets: Dict[str, dict]) -> List[List]:
     Land | political_security | Ampel
     """
     rows = []
+    table = risk_scores_table(presets)
 
-    for land, params in presets.items():
-        ps = compute_risk_scores(params)["political_security"]
+    for land, ps in table["political_security"].items():
+        ps = float(ps)
 
         if ps > 0.75:
             color = "ðŸ”´"
@@ -71,9 +63,10 @@ def autonomy_heatmap(presets: Dict[str, dict]) -> List[List]:
     Land | strategische_autonomie | Ampel
     """
     rows = []
+    table = risk_scores_table(presets)
 
-    for land, params in presets.items():
-        sa = compute_risk_scores(params)["strategische_autonomie"]
+    for land, sa in table["strategische_autonomie"].items():
+        sa = float(sa)
 
         if sa > 0.75:
             color = "ðŸŸ¢"
@@ -96,11 +89,12 @@ def combined_political_autonomy_heatmap(presets: Dict[str, dict]) -> List[List]:
     Land | political_security | strategische_autonomie | Interpretation
     """
     rows = []
+    table = risk_scores_table(presets)
 
-    for land, params in presets.items():
-        scores = compute_risk_scores(params)
-        ps = scores["political_security"]
-        sa = scores["strategische_autonomie"]
+    for land, ps, sa in zip(table.index,
+                            table["political_security"].to_numpy(),
+                            table["strategische_autonomie"].to_numpy()):
+        ps, sa = float(ps), float(sa)
 
         if ps > 0.75 and sa < 0.50:
             interp = "⚠️ Hohe Abhängigkeit, geringe Autonomie"
@@ -2,6 +2,7 @@
 from pathlib import Path
 import json
 import logging
+import numpy as np
 import requests
 import pandas as pd
 from typing import Optional
@@ -121,6 +122,23 @@ def read_table(path: Path) -> pd.DataFrame:
         logger.exception("read_table: all attempts failed for %s: %s", path, e)
         raise
 
+# Platzhalter, wenn keine echten Holdings vorliegen (wird auch als CSV abgelegt)
+DEMO_HOLDINGS = [
+    {"ticker": "AAPL", "weight_in_etf": 0.30},
+    {"ticker": "MSFT", "weight_in_etf": 0.30},
+    {"ticker": "NVDA", "weight_in_etf": 0.20},
+    {"ticker": "AMZN", "weight_in_etf": 0.20},
+]
+
+
+def is_demo_holdings(weights: pd.Series) -> bool:
+    """True, wenn Holdings (Ticker -> Gewicht, Summe 1) genau dem Demo-Platzhalter entsprechen."""
+    demo = pd.Series({h["ticker"]: h["weight_in_etf"] for h in DEMO_HOLDINGS})
+    if set(weights.index) != set(demo.index):
+        return False
+    return bool(np.allclose(weights.reindex(demo.index).to_numpy(dtype=float), demo.to_numpy() / demo.sum()))
+
+
 def load_holdings_with_fallback(etf: str, category: str, isin: Optional[str], df_key: str, holdings_dir: Path) -> pd.DataFrame:
     etf = (etf or "").strip()
     holdings_dir = Path(holdings_dir)
@@ -198,12 +216,7 @@ def load_holdings_with_fallback(etf: str, category: str, isin: Optional[str], df
             continue
 
     logger.info("Keine Holdings gefunden für %s — Demo verwenden", etf)
-    demo = pd.DataFrame([
-        {"ticker": "AAPL", "weight_in_etf": 0.30},
-        {"ticker": "MSFT", "weight_in_etf": 0.30},
-        {"ticker": "NVDA", "weight_in_etf": 0.20},
-        {"ticker": "AMZN", "weight_in_etf": 0.20},
-    ])
+    demo = pd.DataFrame(DEMO_HOLDINGS)
     try:
         demo.to_csv(holdings_dir / f"{etf}.csv", index=False)
     except Exception:
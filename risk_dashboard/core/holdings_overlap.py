@@ -0,0 +1,337 @@
+# risk_dashboard/core/holdings_overlap.py
+"""
+Überschneidungs-Index für ETF-Holdings.
+
+Für jede gecachte Holdings-Datei (data/holdings/, iShares-CSVs) werden zwei
+Sketches der Länge num_perm abgelegt:
+
+- MinHash-Signatur der Ticker-Menge   -> Schätzer für die Jaccard-Ähnlichkeit
+- Consistent Weighted Sampling (ICWS) -> Schätzer für die gewichtete
+  Jaccard-Ähnlichkeit Σmin(w_a, w_b) / Σmax(w_a, w_b)
+
+Vom Fallback abgelegte Demo-Holdings (DEMO_HOLDINGS) werden nicht indiziert.
+
+Bei auf 1 normierten Gewichten ist die gewichtete Überschneidung
+Σmin = 2 J_w / (1 + J_w). Paar- und Top-k-Abfragen vergleichen nur die
+Signaturen (Mikrosekunden); die exakte Überschneidung wird nur für Paare
+berechnet, deren Schätzung über der Schwelle liegt.
+
+Hash-Funktionen sind deterministisch (blake2b + splitmix64), Signaturen
+bleiben also über Prozesse und Neustarts vergleichbar. Nur geänderte
+Dateien (mtime/Größe) werden neu gesketcht.
+"""
+import hashlib
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from risk_dashboard.core.holdings import is_demo_holdings, read_table
+from risk_dashboard.core.store_io import load_store, save_store
+
+HOLDINGS_DIR = Path(__file__).resolve().parents[1] / "data" / "holdings"
+OVERLAP_STORE_DIR = Path("cache") / "overlap"
+
+NUM_PERM = 128
+HOLDINGS_SUFFIXES = (".csv", ".xlsx", ".xls", ".ods")
+
+# (holdings_dir, num_perm) -> index
+_MEMORY: dict = {}
+
+
+# ---------------------------------------------------------
+# Holdings einlesen
+# ---------------------------------------------------------
+
+def normalize_holdings(df: pd.DataFrame, normalize: bool = True) -> pd.Series:
+    """
+    Holdings-Tabelle -> Series Ticker -> Gewicht (mit normalize=True auf Summe 1).
+    Akzeptiert ticker/symbol sowie weight_in_etf/weight/"weight (%)" (iShares)
+    und Prozentangaben wie "30%".
+    """
+    df = df.copy()
+    df.columns = [str(c).strip().lower() for c in df.columns]
+    if "ticker" not in df.columns and "symbol" in df.columns:
+        df = df.rename(columns={"symbol": "ticker"})
+
+    if "weight_in_etf" in df.columns:
+        weight = df["weight_in_etf"]
+        scale = 1.0
+    elif "weight" in df.columns:
+        weight = df["weight"]
+        scale = 1.0
+    elif "weight (%)" in df.columns:
+        weight = df["weight (%)"]
+        scale = 0.01
+    else:
+        raise ValueError(f"Holdings ohne Gewichtsspalte: {list(df.columns)}")
+    if "ticker" not in df.columns:
+        raise ValueError(f"Holdings ohne Ticker-Spalte: {list(df.columns)}")
+
+    raw = weight.astype(str).str.strip().str.replace(",", ".")
+    pct = raw.str.endswith("%")
+    weight = pd.to_numeric(raw.str.rstrip("%"), errors="coerce") * np.where(pct, 0.01, 1.0) * scale
+    tickers = df["ticker"].astype(str).str.strip().str.upper()
+    out = pd.Series(weight.to_numpy(), index=tickers.to_numpy())
+    out = out[(out > 0) & ~out.index.isin(["", "-", "NAN", "NONE"])]
+    out = out.groupby(level=0).sum()
+    total = out.sum()
+    return out / total if normalize and total > 0 else out
+
+
+def load_holdings_file(path: Path) -> pd.Series:
+    return normalize_holdings(read_table(Path(path)))
+
+
+# ---------------------------------------------------------
+# Sketches
+# ---------------------------------------------------------
+
+def _token_hashes(tickers) -> np.ndarray:
+    """Stabile 32-Bit-Hashes der Ticker (unabhängig von PYTHONHASHSEED)."""
+    return np.array(
+        [int.from_bytes(hashlib.blake2b(str(t).encode("utf-8"), digest_size=4).digest(), "little")
+         for t in tickers],
+        dtype=np.uint64,
+    )
+
+
+def _splitmix64(x: np.ndarray) -> np.ndarray:
+    """Vektorisierter splitmix64-Mixer (uint64, Überlauf gewollt)."""
+    with np.errstate(over="ignore"):
+        x = x + np.uint64(0x9E3779B97F4A7C15)
+        x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return x ^ (x >> np.uint64(31))
+
+
+def _uniform(tokens: np.ndarray, num_perm: int, stream: int) -> np.ndarray:
+    """Deterministische U(0,1)-Zahlen je (Permutation, Token): num_perm x n."""
+    perm = np.arange(num_perm, dtype=np.uint64)[:, None]
+    seed = _splitmix64(perm * np.uint64(8) + np.uint64(stream))
+    with np.errstate(over="ignore"):
+        bits = _splitmix64(seed ^ (tokens[None, :] * np.uint64(0x9E3779B97F4A7C15)))
+    return ((bits >> np.uint64(11)).astype(float) + 0.5) / float(1 << 53)
+
+
+def minhash_signature(tickers, num_perm: int = NUM_PERM) -> np.ndarray:
+    """MinHash der Ticker-Menge: je Permutation das Minimum eines gemischten 64-Bit-Hashs."""
+    tokens = _token_hashes(tickers)
+    if len(tokens) == 0:
+        return np.full(num_perm, np.iinfo(np.uint64).max, dtype=np.uint64)
+    seed = _splitmix64(np.arange(num_perm, dtype=np.uint64)[:, None] * np.uint64(8) + np.uint64(7))
+    with np.errstate(over="ignore"):
+        return _splitmix64(seed ^ (tokens[None, :] * np.uint64(0x9E3779B97F4A7C15))).min(axis=1)
+
+
+def weighted_signature(weights: pd.Series, num_perm: int = NUM_PERM) -> np.ndarray:
+    """
+    ICWS-Sketch (Ioffe 2010): je Permutation das Paar (Token, t_k) mit
+    minimalem a; P(Gleichheit) = gewichtete Jaccard-Ähnlichkeit.
+    """
+    weights = weights[weights > 0]
+    if weights.empty:
+        return np.full(num_perm, np.iinfo(np.uint64).max, dtype=np.uint64)
+    tokens = _token_hashes(weights.index)
+    w = weights.to_numpy(dtype=float)[None, :]
+
+    r = -np.log(_uniform(tokens, num_perm, 0) * _uniform(tokens, num_perm, 1))     # Gamma(2, 1)
+    c = -np.log(_uniform(tokens, num_perm, 2) * _uniform(tokens, num_perm, 3))     # Gamma(2, 1)
+    beta = _uniform(tokens, num_perm, 4)                                             # U(0, 1)
+    t = np.floor(np.log(w) / r + beta)
+    y = np.exp(r * (t - beta))
+    a = c / (y * np.exp(r))
+
+    k = a.argmin(axis=1)
+    rows = np.arange(num_perm)
+    token = tokens[k]
+    t_k = t[rows, k].astype(np.int64).astype(np.uint64)
+    with np.errstate(over="ignore"):
+        return _splitmix64(token ^ (t_k * np.uint64(0x100000001B3)))
+
+
+# ---------------------------------------------------------
+# Index
+# ---------------------------------------------------------
+
+def _fingerprint(path: Path) -> List[int]:
+    stat = path.stat()
+    return [int(stat.st_mtime_ns), int(stat.st_size)]
+
+
+def _holdings_files(holdings_dir: Path) -> Dict[str, Path]:
+    """Eine Datei je ETF (Dateiname ohne Endung); CSV hat Vorrang (normalisierter Cache)."""
+    files: Dict[str, Path] = {}
+    for path in sorted(Path(holdings_dir).glob("*")):
+        if path.suffix.lower() not in HOLDINGS_SUFFIXES:
+            continue
+        name = path.stem
+        if name not in files or path.suffix.lower() == ".csv":
+            files[name] = path
+    return files
+
+
+def _paths(store_dir=None):
+    store_dir = Path(store_dir) if store_dir is not None else OVERLAP_STORE_DIR
+    return store_dir / "signatures.parquet", store_dir / "holdings.parquet", store_dir / "meta.json"
+
+
+def _save(index: dict, store_dir=None) -> None:
+    sig_path, hold_path, meta_path = _paths(store_dir)
+    k = index["num_perm"]
+    sig = pd.DataFrame(
+        np.hstack([index["minhash"], index["weighted"]]).view(np.int64)
+        if len(index["names"]) else np.empty((0, 2 * k), dtype=np.int64),
+        index=index["names"],
+        columns=[f"mh_{i}" for i in range(k)] + [f"ws_{i}" for i in range(k)],
+    )
+    holdings = pd.DataFrame(
+        [(name, t, w) for name in index["names"] for t, w in index["holdings"][name].items()],
+        columns=["etf", "ticker", "weight"],
+    )
+    meta = {"num_perm": k, "holdings_dir": index["holdings_dir"], "fingerprints": index["fingerprints"]}
+    save_store({sig_path: sig, hold_path: holdings}, meta_path, meta)
+
+
+def _load(holdings_dir: str, num_perm: int, store_dir=None) -> Optional[dict]:
+    sig_path, hold_path, meta_path = _paths(store_dir)
+    stored = load_store([sig_path, hold_path], meta_path)
+    if stored is None:
+        return None
+    (sig, holdings), meta = stored
+    if meta.get("num_perm") != num_perm or meta.get("holdings_dir") != holdings_dir:
+        return None
+    values = np.ascontiguousarray(sig.to_numpy(dtype=np.int64)).view(np.uint64)
+    return {
+        "names": list(sig.index),
+        "num_perm": num_perm,
+        "holdings_dir": holdings_dir,
+        "minhash": values[:, :num_perm],
+        "weighted": values[:, num_perm:],
+        "holdings": {name: g.set_index("ticker")["weight"] for name, g in holdings.groupby("etf", sort=False)},
+        "fingerprints": meta["fingerprints"],
+    }
+
+
+def get_overlap_index(holdings_dir=None, num_perm: int = NUM_PERM, store_dir=None) -> dict:
+    """
+    Überschneidungs-Index für alle Holdings-Dateien im Verzeichnis.
+    Nur neue oder geänderte Dateien werden gelesen und gesketcht.
+    """
+    holdings_dir = str(Path(holdings_dir or HOLDINGS_DIR).resolve())
+    key = (holdings_dir, int(num_perm))
+    old = _MEMORY.get(key) or _load(holdings_dir, num_perm, store_dir)
+    old_pos = {name: i for i, name in enumerate(old["names"])} if old else {}
+
+    names, minhash, weighted, holdings, fingerprints = [], [], [], {}, {}
+    changed = old is None
+    for name, path in _holdings_files(Path(holdings_dir)).items():
+        fp = _fingerprint(path)
+        if name in old_pos and old["fingerprints"].get(name) == fp:
+            i = old_pos[name]
+            mh, ws, h = old["minhash"][i], old["weighted"][i], old["holdings"].get(name, pd.Series(dtype=float))
+        else:
+            try:
+                h = load_holdings_file(path)
+            except Exception:
+                continue
+            mh, ws = minhash_signature(h.index, num_perm), weighted_signature(h, num_perm)
+            changed = True
+        if is_demo_holdings(h):
+            # Demo-Platzhalter aus load_holdings_with_fallback sind keine echten Holdings
+            continue
+        names.append(name)
+        minhash.append(mh)
+        weighted.append(ws)
+        holdings[name] = h
+        fingerprints[name] = fp
+    changed = changed or set(names) != set(old_pos)
+
+    shape = (len(names), num_perm)
+    index = {
+        "names": names,
+        "num_perm": int(num_perm),
+        "holdings_dir": holdings_dir,
+        "minhash": np.vstack(minhash) if names else np.empty(shape, dtype=np.uint64),
+        "weighted": np.vstack(weighted) if names else np.empty(shape, dtype=np.uint64),
+        "holdings": holdings,
+        "fingerprints": fingerprints,
+    }
+    _MEMORY[key] = index
+    if changed:
+        _save(index, store_dir)
+    return index
+
+
+# ---------------------------------------------------------
+# Abfragen
+# ---------------------------------------------------------
+
+def _overlap_from_jaccard(j):
+    """Gewichtete Überschneidung Σmin bei Gewichtssumme 1 aus J_w = Σmin / Σmax."""
+    return 2 * j / (1 + j)
+
+
+def exact_weighted_overlap(a: pd.Series, b: pd.Series) -> float:
+    """Σ min(w_a, w_b) über gemeinsame Ticker."""
+    common = a.index.intersection(b.index)
+    return float(np.minimum(a[common].to_numpy(), b[common].to_numpy()).sum())
+
+
+def estimate_overlap(index: dict, a: str, b: str) -> dict:
+    """Geschätzte Jaccard-, gewichtete Jaccard- und gewichtete Überschneidung zweier ETFs."""
+    i, j = index["names"].index(a), index["names"].index(b)
+    jac = np.count_nonzero(index["minhash"][i] == index["minhash"][j]) / index["num_perm"]
+    wjac = np.count_nonzero(index["weighted"][i] == index["weighted"][j]) / index["num_perm"]
+    return {"jaccard": jac, "weighted_jaccard": wjac, "weighted_overlap": _overlap_from_jaccard(wjac)}
+
+
+def top_overlaps(index: dict, name: str, k: int = 5) -> pd.DataFrame:
+    """Die k ETFs mit der größten geschätzten gewichteten Überschneidung zu name."""
+    i = index["names"].index(name)
+    wjac = (index["weighted"] == index["weighted"][i]).mean(axis=1)
+    jac = (index["minhash"] == index["minhash"][i]).mean(axis=1)
+    wjac[i] = -1.0
+    k = min(k, len(wjac) - 1)
+    if k <= 0:
+        return pd.DataFrame(columns=["etf", "jaccard", "weighted_jaccard", "weighted_overlap"])
+    top = np.argpartition(-wjac, k - 1)[:k]
+    top = top[np.argsort(-wjac[top], kind="stable")]
+    return pd.DataFrame({
+        "etf": [index["names"][t] for t in top],
+        "jaccard": jac[top],
+        "weighted_jaccard": wjac[top],
+        "weighted_overlap": _overlap_from_jaccard(wjac[top]),
+    })
+
+
+def overlap_pairs(index: dict, names: Optional[List[str]] = None, threshold: float = 0.2,
+                  margin: float = 0.05) -> pd.DataFrame:
+    """
+    Alle Paare (aus names bzw. dem ganzen Index), deren geschätzte gewichtete
+    Überschneidung über threshold - margin liegt; nur für diese wird die exakte
+    Überschneidung berechnet. Spalte flagged = exakte Überschneidung >= threshold.
+    """
+    pos = [index["names"].index(n) for n in (names or index["names"]) if n in index["names"]]
+    columns = ["etf_a", "etf_b", "weighted_overlap_est", "weighted_overlap", "flagged"]
+    if len(pos) < 2:
+        return pd.DataFrame(columns=columns)
+
+    W = index["weighted"][pos]
+    wjac = (W[:, None, :] == W[None, :, :]).mean(axis=2)
+    est = _overlap_from_jaccard(wjac)
+    ii, jj = np.triu_indices(len(pos), k=1)
+    hit = est[ii, jj] >= threshold - margin
+
+    rows = []
+    for i, j in zip(ii[hit], jj[hit]):
+        a, b = index["names"][pos[i]], index["names"][pos[j]]
+        exact = exact_weighted_overlap(index["holdings"][a], index["holdings"][b])
+        rows.append((a, b, float(est[i, j]), exact, exact >= threshold))
+    return pd.DataFrame(rows, columns=columns).sort_values("weighted_overlap", ascending=False)
+
+
+def clear_overlap_cache():
+    """Vergisst die Signaturen im Speicher; der nächste Abruf liest cache/overlap und prüft die Dateien erneut."""
+    _MEMORY.clear()
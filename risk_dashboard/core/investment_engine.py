@@ -20,6 +20,7 @@ from risk_dashboard.core.market_engine import download_etf_history, build_market
 from risk_dashboard.core.risk_engine import compute_risk_score_v2, detect_risk_regimes, build_scenario_series
 from risk_dashboard.core.macro_loader import load_and_validate_macro_data
 from risk_dashboard.core.utils import get_latest_before, ensure_date_column
+from risk_dashboard.core.metrics import performance_kernel
 from risk_dashboard.core.asset_packages import (
     map_regime_to_key,
     select_equity_package
@@ -231,7 +232,7 @@ def get_latest_regime(scenario_regimes=None):
     if scenario_regimes is not None and not scenario_regimes.empty:
         regimes = scenario_regimes.copy()
     else:
-        regimes = detect_risk_regimes().copy()
+        regimes = detect_risk_regimes()
 
     regimes = regimes.dropna(subset=["regime"])
     return regimes.iloc[-1]["regime"]
@@ -574,9 +575,9 @@ def backtest_regime_hrp(low, medium, high, period="10y", scenario_df=None, scena
         return pd.DataFrame(), {}, missing
 
     if scenario_regimes is None or scenario_regimes.empty:
-        scenario_regimes = detect_risk_regimes().copy()
+        scenario_regimes = detect_risk_regimes(start=rets.index.min() - pd.offsets.QuarterEnd(1), end=rets.index.max())
 
-    scenario_regimes["date"] = pd.to_datetime(scenario_regimes["date"])
+    scenario_regimes = ensure_date_column(scenario_regimes)
     regimes = scenario_regimes.set_index("date").resample("ME").last()
 
     common_index = rets.index.intersection(regimes.index)
@@ -633,17 +634,9 @@ def sharpe_per_regime(equity_df, risk_free_rate=0.0):
     df["ret"] = df["equity"].pct_change()
     df = df.dropna()
 
-    stats = []
-    for reg, grp in df.groupby("regime"):
-        mean_ret = grp["ret"].mean()
-        vol = grp["ret"].std()
-        periods_per_year = 12
-        ann_ret = (1 + mean_ret) ** periods_per_year - 1
-        ann_vol = vol * np.sqrt(periods_per_year)
-        sharpe = (ann_ret - risk_free_rate) / ann_vol if ann_vol > 0 else np.nan
-        stats.append((reg, sharpe))
-
-    return pd.DataFrame(stats, columns=["regime", "sharpe"]).set_index("regime")
+    m = performance_kernel(df["ret"], kind="returns", periods_per_year=12, rf=risk_free_rate,
+                           groups=df["regime"], sharpe_basis="compound")
+    return m["sharpe"].droplevel("column").rename_axis("regime").to_frame()
 
 
 def backtest_regime_risk_parity(low, medium, high, period="10y", scenario_df=None, scenario_regimes=None):
@@ -655,7 +648,7 @@ def backtest_regime_risk_parity(low, medium, high, period="10y", scenario_df=Non
         return pd.DataFrame(), rp_struct, missing
 
     if scenario_regimes is None or scenario_regimes.empty:
-        scenario_regimes = detect_risk_regimes().copy()
+        scenario_regimes = detect_risk_regimes(start=rets.index.min() - pd.offsets.QuarterEnd(1), end=rets.index.max())
 
     scenario_regimes = ensure_date_column(scenario_regimes)
     #scenario_regimes["date"] = pd.to_datetime(scenario_regimes["date"])
@@ -713,7 +706,7 @@ def backtest_regime_strategy(scenario_regimes=None):
     if scenario_regimes is not None and not scenario_regimes.empty:
         regimes = scenario_regimes.copy()
     else:
-        regimes = detect_risk_regimes().copy()
+        regimes = detect_risk_regimes()
 
     regimes = ensure_date_column(regimes)
     regimes["date"] = pd.to_datetime(regimes["date"])
@@ -755,7 +748,7 @@ def backtest_etf_regime_portfolio(ticker_map, period="max", scenario_df=None, sc
     if scenario_regimes is not None and not scenario_regimes.empty:
         regimes = scenario_regimes.copy()
     else:
-        regimes = detect_risk_regimes().copy()
+        regimes = detect_risk_regimes()
 
     # Defensive: sicherstellen, dass 'date' vorhanden ist und gültig
     regimes = ensure_date_column(regimes)
@@ -858,24 +851,15 @@ def performance_stats(equity_df, risk_free_rate=0.0):
     df["ret"] = df["equity"].pct_change()
     df = df.dropna()
 
-    mean_ret = df["ret"].mean()
-    vol = df["ret"].std()
-    periods_per_year = 12  # Monatsdaten
-
-    ann_ret = (1 + mean_ret) ** periods_per_year - 1
-    ann_vol = vol * np.sqrt(periods_per_year)
-    sharpe = (ann_ret - risk_free_rate) / ann_vol if ann_vol > 0 else np.nan
-
-    # Max Drawdown
-    cum_max = df["equity"].cummax()
-    drawdown = df["equity"] / cum_max - 1
-    max_dd = drawdown.min()
+    # Monatsdaten
+    m = performance_kernel(df["ret"], kind="returns", periods_per_year=12, rf=risk_free_rate,
+                           sharpe_basis="compound").iloc[0]
 
     return {
-        "annual_return": ann_ret,
-        "annual_volatility": ann_vol,
-        "sharpe_ratio": sharpe,
-        "max_drawdown": max_dd
+        "annual_return": m["ann_return"],
+        "annual_volatility": m["vol"],
+        "sharpe_ratio": m["sharpe"],
+        "max_drawdown": m["max_drawdown"]
     }
 
 
@@ -895,7 +879,7 @@ def regime_transition_matrix(period="max"):
     """
 
     # 1. Regime-Historie laden
-    regimes = detect_risk_regimes().copy()
+    regimes = detect_risk_regimes()
     regimes = ensure_date_column(regimes)
     regimes["date"] = pd.to_datetime(regimes["date"])
     regimes = regimes.set_index("date").resample("ME").last()
@@ -0,0 +1,236 @@
+# risk_dashboard/core/ki_panel.py
+"""
+Querschnitts-KI-Score über ein ganzes Preis-Panel (T x N).
+
+Alle Faktoren (Momentum, Volatilität, Sharpe, Max Drawdown, Trend-R²)
+werden für alle N Spalten in wenigen vektorisierten Durchläufen berechnet.
+Jede Spalte wird vorher auf ihre eigene Historie reduziert (dropna) und
+rechtsbündig ausgerichtet – das Ergebnis entspricht damit spaltenweise
+compute_ki_score(series.dropna()). Der Trend-R² kommt in geschlossener
+Form (Korrelation² mit der Zeitachse) statt über np.polyfit.
+"""
+import warnings
+
+import numpy as np
+import pandas as pd
+
+# Normierungsbereiche wie in ki_score.compute_ki_score
+FACTOR_RANGES = {
+    "momentum": (-0.2, 0.3),
+    "volatility": (0.005, 0.05),
+    "sharpe": (-1.0, 2.0),
+    "drawdown": (0.0, 0.5),
+    "trend_stability": (0.0, 1.0),
+}
+
+FACTOR_WEIGHTS = {
+    "momentum": 25,
+    "volatility": 20,       # als (1 - vol_norm)
+    "drawdown": 20,         # als (1 - dd_norm)
+    "sharpe": 20,
+    "trend_stability": 15,
+}
+
+MIN_POINTS = 120
+
+
+# ---------------------------------------------------------
+# Hilfsfunktionen
+# ---------------------------------------------------------
+
+def _as_panel(prices) -> pd.DataFrame:
+    if isinstance(prices, pd.Series):
+        return prices.to_frame(name=prices.name if prices.name is not None else 0)
+    return prices
+
+
+def right_align(prices) -> tuple:
+    """
+    Schiebt die gültigen Werte jeder Spalte ans Ende (NaN-Padding oben).
+
+    Returns
+    -------
+    (A, n)
+        A : ndarray (T' x N), T' = längste Historie
+        n : ndarray (N,) Anzahl gültiger Punkte je Spalte
+    """
+    X = _as_panel(prices).to_numpy(dtype=float)
+    valid = np.isfinite(X)
+    n = valid.sum(axis=0)
+    T = int(n.max()) if n.size else 0
+    A = np.full((T, X.shape[1]), np.nan)
+    for j in np.flatnonzero(n):
+        A[T - n[j]:, j] = X[valid[:, j], j]
+    return A, n
+
+
+def _row(A: np.ndarray, n: np.ndarray, k: int) -> np.ndarray:
+    """Wert k Positionen vor dem Ende (k=1 -> letzter Wert), NaN wenn zu kurz."""
+    if A.shape[0] < k:
+        return np.full(A.shape[1], np.nan)
+    out = A[-k].copy()
+    out[n < k] = np.nan
+    return out
+
+
+def _normalize(values: np.ndarray, lo: float, hi: float) -> np.ndarray:
+    """Wie ki_score.normalize: NaN -> 0, auf [0, 1] geclippt."""
+    if hi - lo == 0:
+        return np.where(np.isnan(values), 0.0, 0.5)
+    return np.nan_to_num(np.clip((values - lo) / (hi - lo), 0.0, 1.0), nan=0.0)
+
+
+def _returns(A: np.ndarray) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return A[1:] / A[:-1] - 1
+
+
+def _return_moments(R: np.ndarray) -> tuple:
+    """Standardabweichung (ddof=1) und Mittelwert der Renditen je Spalte, NaN-bewusst."""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        return np.nanstd(R, axis=0, ddof=1), np.nanmean(R, axis=0)
+
+
+def max_drawdown(A: np.ndarray) -> np.ndarray:
+    """Minimum von (P - laufendes Maximum) / laufendes Maximum je Spalte (<= 0)."""
+    peak = np.fmax.accumulate(A, axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        dd = (A - peak) / peak
+    with np.errstate(all="ignore"):
+        return np.nanmin(np.where(np.isnan(dd), np.inf, dd), axis=0, initial=np.inf)
+
+
+def trend_r2(A: np.ndarray, n: np.ndarray) -> np.ndarray:
+    """R² der linearen Regression Preis ~ Zeit je Spalte, geschlossen: corr(t, P)²."""
+    T = A.shape[0]
+    mask = ~np.isnan(A)
+    t = np.arange(T, dtype=float)[:, None]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        t_mean = (t * mask).sum(axis=0) / n
+        y_mean = np.nansum(A, axis=0) / n
+        dx = np.where(mask, t - t_mean, 0.0)
+        dy = np.where(mask, A - y_mean, 0.0)
+        sxy = (dx * dy).sum(axis=0)
+        sxx = (dx * dx).sum(axis=0)
+        syy = (dy * dy).sum(axis=0)
+        return sxy * sxy / (sxx * syy)
+
+
+# ---------------------------------------------------------
+# KI-Score (Variante core/backend/ki_score)
+# ---------------------------------------------------------
+
+def normalize_factors(raw) -> dict:
+    """Normiert Rohfaktoren (Mapping Name -> Array/Series) auf [0, 1] laut FACTOR_RANGES."""
+    return {
+        key: _normalize(np.asarray(raw[key], dtype=float), lo, hi)
+        for key, (lo, hi) in FACTOR_RANGES.items()
+    }
+
+
+def combine_factors(norm) -> np.ndarray:
+    """Gewichtete Summe der normierten Faktoren, auf 0-100 geclippt."""
+    score = (
+        np.asarray(norm["momentum"]) * FACTOR_WEIGHTS["momentum"]
+        + (1 - np.asarray(norm["volatility"])) * FACTOR_WEIGHTS["volatility"]
+        + (1 - np.asarray(norm["drawdown"])) * FACTOR_WEIGHTS["drawdown"]
+        + np.asarray(norm["sharpe"]) * FACTOR_WEIGHTS["sharpe"]
+        + np.asarray(norm["trend_stability"]) * FACTOR_WEIGHTS["trend_stability"]
+    )
+    return np.clip(score, 0, 100)
+
+
+def panel_raw_factors(prices) -> pd.DataFrame:
+    """Rohfaktoren (nicht normiert) für alle Spalten des Panels."""
+    panel = _as_panel(prices)
+    A, n = right_align(panel)
+    R = _returns(A)
+
+    vol, mean = _return_moments(R)
+
+    return pd.DataFrame({
+        "momentum": _row(A, n, 1) / _row(A, n, 90) - 1,
+        "volatility": vol,
+        "sharpe": mean / (vol + 1e-9),
+        "drawdown": np.abs(max_drawdown(A)),
+        "trend_stability": trend_r2(A, n),
+        "n_points": n,
+    }, index=panel.columns)
+
+
+def panel_ki_scores(prices, return_factors: bool = False) -> pd.DataFrame:
+    """
+    KI-Score (0-100) für jede Spalte eines Preis-Panels (Index = Datum).
+
+    Returns
+    -------
+    DataFrame (Index = Spalten des Panels)
+        ki_score und – bei return_factors=True – die normierten Faktoren
+        momentum, volatility, drawdown, sharpe, trend_stability.
+        Spalten mit weniger als 120 Punkten erhalten 0 (wie compute_ki_score).
+    """
+    raw = panel_raw_factors(prices)
+    norm = pd.DataFrame(normalize_factors(raw), index=raw.index)
+    score = pd.Series(combine_factors(norm), index=raw.index)
+
+    short = raw["n_points"] < MIN_POINTS
+    score[short] = 0.0
+    norm.loc[short] = 0.0
+
+    out = pd.DataFrame({"ki_score": score})
+    if return_factors:
+        out = out.join(norm[["momentum", "volatility", "drawdown", "sharpe", "trend_stability"]])
+    return out
+
+
+# ---------------------------------------------------------
+# KI-Score (Variante core/engine/assets)
+# ---------------------------------------------------------
+
+def panel_engine_ki_scores(prices, min_points: int = 60) -> pd.Series:
+    """
+    Vektorisierte Variante von engine.assets.compute_ki_score_from_prices:
+    0.4 Momentum (126 Tage) + 0.2 / (1 + Vol) + 0.2 (1 + MaxDD) + 0.2 Sharpe-Proxy.
+    Spalten mit weniger als min_points Punkten -> NaN.
+    """
+    panel = _as_panel(prices)
+    A, n = right_align(panel)
+    R = _returns(A)
+
+    vol, mean = _return_moments(R)
+
+    T = A.shape[0]
+    start_idx = np.minimum(np.maximum(T - 126, T - n), T - 1)
+    start = A[start_idx, np.arange(A.shape[1])] if A.size else np.full(A.shape[1], np.nan)
+    momentum = _row(A, n, 1) / start - 1
+    sharpe = np.where(vol > 0, mean / np.where(vol > 0, vol, 1.0), 0.0)
+
+    ki = (
+        0.4 * np.nan_to_num(np.clip(momentum, -0.5, 0.5) + 0.5)
+        + 0.2 * np.nan_to_num(1 / (1 + vol))
+        + 0.2 * np.nan_to_num(1 + max_drawdown(A), posinf=0.0)
+        + 0.2 * (np.clip(sharpe, -1, 1) + 1) / 2
+    )
+    ki = np.round(ki * 100, 2)
+    ki[n < max(min_points, 2)] = np.nan
+    return pd.Series(ki, index=panel.columns, name="ki_score")
+
+
+# ---------------------------------------------------------
+# Profile (ki_scanner.PROFILES)
+# ---------------------------------------------------------
+
+def panel_profile_scores(prices, profile: str = "ki", metrics: pd.DataFrame = None) -> pd.DataFrame:
+    """
+    Profil-Score laut ki_scanner.PROFILES für alle Spalten des Panels.
+    metrics: bereits berechnete Kennzahlen (sonst assets.panel_asset_metrics).
+    """
+    from core.backend.ki_scanner import PROFILES, compute_ki_score as profile_score
+
+    if metrics is None:
+        from core.data.assets import panel_asset_metrics
+        metrics = panel_asset_metrics(prices)
+    if profile not in PROFILES:
+        profile = "ki"
+    return profile_score(metrics, profile).sort_values("ki_score", ascending=False)
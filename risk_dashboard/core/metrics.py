@@ -1,9 +1,189 @@
+import numpy as np
 import pandas as pd
 
+# ---------------------------------------------------------
+# Performance-Kernel
+# ---------------------------------------------------------
+#
+# Ein Kernel für alle Performance-Kennzahlen (analysis, backtest,
+# investment_engine, portfolio_engine, pages/etf_finder): arbeitet auf einer
+# (T x K)-Matrix von Renditen oder Werten, optional mit Gruppenlabels
+# (z.B. Regime), und berechnet alle Kennzahlen für alle Spalten gleichzeitig.
+#
+# Konventionen (wie an den bisherigen Stellen):
+# - Renditen aus Werten: V[t] / V[t-1] - 1, fehlende Werte werden übersprungen
+# - Volatilität: Standardabweichung (ddof=1) * sqrt(periods_per_year)
+# - Drawdown auf dem Pfad (1 + r).cumprod() ab der ersten Rendite
+# - Drawdown-Dauer: längste Strecke unter dem letzten Hoch (in Perioden)
+
+PERFORMANCE_COLUMNS = [
+    "n_obs", "total_return", "cagr", "ann_return", "vol", "sharpe",
+    "sortino", "max_drawdown", "max_dd_duration", "calmar",
+]
+
+
+def _as_matrix(data):
+    """(Matrix T x K, Index, Spaltenlabels) aus DataFrame / Series / Array."""
+    if isinstance(data, pd.Series):
+        return data.to_numpy(dtype=float)[:, None], data.index, [data.name]
+    if isinstance(data, pd.DataFrame):
+        return data.to_numpy(dtype=float), data.index, list(data.columns)
+    X = np.asarray(data, dtype=float)
+    if X.ndim == 1:
+        X = X[:, None]
+    return X, None, list(range(X.shape[1]))
+
+
+def _kernel_block(R: np.ndarray, periods_per_year: float, rf: float,
+                  years, sharpe_basis: str) -> dict:
+    """
+    Alle Kennzahlen für einen Block von Renditen (NaN = keine Beobachtung).
+    R liegt transponiert vor (K x T, zeilenweise zusammenhängend): Akkumulationen
+    entlang der letzten Achse sind in NumPy deutlich schneller als entlang Achse 0.
+    """
+    valid = ~np.isnan(R)
+    complete = bool(valid.all())            # Normalfall Backtest: keine Lücken -> keine Masken
+    R0 = R if complete else np.where(valid, R, 0.0)
+    n = np.full(len(R), float(R.shape[1])) if complete else valid.sum(axis=1).astype(float)
+    empty = n == 0
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = R0.sum(axis=1) / n
+        sq = np.einsum("ij,ij->i", R0, R0)
+        vol = np.sqrt(np.clip(sq - n * mean * mean, 0.0, None) / (n - 1)) * np.sqrt(periods_per_year)
+        neg = np.minimum(R0, 0.0)
+        downside = np.sqrt(np.einsum("ij,ij->i", neg, neg) / n) * np.sqrt(periods_per_year)
+
+        # Wachstumspfad ab der ersten Rendite (Lücken = kein Wachstum);
+        # vor der ersten Rendite bleibt der Pfad bei 0, zählt also nie als Hoch
+        k = np.arange(1, R.shape[1] + 1)[None, :] if complete else np.cumsum(valid, axis=1)
+        growth = np.cumprod(R0 + 1.0, axis=1)
+        if not complete:
+            growth[k == 0] = 0.0
+        total = np.where(empty, np.nan, growth[:, -1] - 1.0) if R.shape[1] else np.full(len(R), np.nan)
+
+        peak = np.maximum.accumulate(growth, axis=1)
+        dd = growth / peak
+        dd -= 1.0
+        if not complete:
+            dd[~valid] = 0.0
+        max_dd = np.where(empty, np.nan, dd.min(axis=1, initial=0.0))
+
+        # Drawdown-Dauer in Beobachtungen seit dem letzten Hoch
+        at_peak = dd >= 0
+        if not complete:
+            at_peak &= valid
+        last_peak = np.maximum.accumulate(np.where(at_peak, k, 0), axis=1)
+        duration = (k - last_peak).max(axis=1, initial=0).astype(float)
+        duration[empty] = np.nan
+
+        yrs = n / periods_per_year if years is None else years
+        cagr = np.where(yrs > 0, (1.0 + total) ** (1.0 / yrs) - 1.0, np.nan)
+        ann_return = (1.0 + mean) ** periods_per_year - 1.0
+
+        basis = {
+            "arithmetic": mean * periods_per_year,
+            "compound": ann_return,
+            "cagr": cagr,
+        }[sharpe_basis]
+        sharpe = np.where(vol > 0, (basis - rf) / vol, np.nan)
+        sortino = np.where(downside > 0, (basis - rf) / downside, np.nan)
+        calmar = np.where(max_dd < 0, cagr / np.abs(max_dd), np.nan)
+
+    return {
+        "n_obs": n,
+        "total_return": total,
+        "cagr": cagr,
+        "ann_return": ann_return,
+        "vol": vol,
+        "sharpe": sharpe,
+        "sortino": sortino,
+        "max_drawdown": max_dd,
+        "max_dd_duration": duration,
+        "calmar": calmar,
+    }
+
+
+def _block_returns(Xt: np.ndarray, kind: str) -> np.ndarray:
+    """Renditen (K x T') aus einem transponierten Block; Werte-Lücken werden übersprungen."""
+    if kind == "returns":
+        return Xt
+    valid = ~np.isnan(Xt)
+    # Index des letzten gültigen Werts je Position (Forward-Fill ohne pandas)
+    last = np.maximum.accumulate(np.where(valid, np.arange(Xt.shape[1]), 0), axis=1)
+    prev = np.take_along_axis(Xt, last, axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(valid[:, 1:], Xt[:, 1:] / prev[:, :-1] - 1.0, np.nan)
+
+
+def performance_kernel(data, kind: str = "returns", periods_per_year: float = 252,
+                       rf: float = 0.0, groups=None, years=None,
+                       sharpe_basis: str = "arithmetic", chunk_size: int = 512) -> pd.DataFrame:
+    """
+    Performance-Kennzahlen für alle K Spalten (und alle Gruppen) auf einmal.
+
+    Parameters
+    ----------
+    data : DataFrame / Series / ndarray (T x K)
+    kind : "returns" oder "values" (Kurse / Equity-Kurven)
+    periods_per_year : 252 (Tage), 52, 12 (Monate), ...
+    rf : risikoloser Zins p.a. (wird vom Sharpe-/Sortino-Zähler abgezogen)
+    groups : optionale Labels je Zeile (z.B. Regime); NaN-Labels werden ignoriert
+    years : Laufzeit für die CAGR (Skalar oder je Spalte), Standard n / periods_per_year
+    sharpe_basis : Rendite im Sharpe-Zähler – "arithmetic" (mean * p),
+                   "compound" ((1 + mean)^p - 1) oder "cagr"
+
+    Returns
+    -------
+    DataFrame mit PERFORMANCE_COLUMNS, Index = Spalten
+    (mit groups: MultiIndex (group, column)).
+    """
+    if kind not in ("returns", "values"):
+        raise ValueError(f"Unbekannter Datentyp: {kind}")
+
+    X, _, labels = _as_matrix(data)
+    K = X.shape[1]
+    yrs = None if years is None else np.broadcast_to(np.asarray(years, dtype=float), (K,))
+
+    masks = {None: None}
+    if groups is not None:
+        g = np.asarray(groups, dtype=object).reshape(-1)
+        if kind == "values":
+            g = g[1:]                       # Label der Rendite V[t-1] -> V[t] ist das Label in t
+        keys = pd.Series(g).dropna().unique()
+        try:
+            keys = sorted(keys)
+        except TypeError:
+            pass
+        masks = {key: (g == key)[None, :] for key in keys}
+
+    results = {key: [] for key in masks}
+    for i in range(0, max(K, 1), chunk_size):
+        Rt = _block_returns(np.ascontiguousarray(X[:, i:i + chunk_size].T), kind)
+        y = None if yrs is None else yrs[i:i + chunk_size]
+        for key, mask in masks.items():
+            block = Rt if mask is None else np.where(mask, Rt, np.nan)
+            results[key].append(_kernel_block(block, periods_per_year, rf, y, sharpe_basis))
+
+    frames = {
+        key: pd.DataFrame(
+            {c: np.concatenate([b[c] for b in blocks]) for c in PERFORMANCE_COLUMNS},
+            index=pd.Index(labels, name="column")
+        )
+        for key, blocks in results.items()
+    }
+    if groups is None:
+        return frames[None]
+    if not frames:
+        index = pd.MultiIndex.from_arrays([[], []], names=["group", "column"])
+        return pd.DataFrame(columns=PERFORMANCE_COLUMNS, index=index, dtype=float)
+    return pd.concat(list(frames.values()), keys=list(frames.keys()), names=["group", "column"])
+
+
 def compute_metrics(series: pd.Series) -> dict:
     """
     Einfache Kennzahlen für analyze_ticker.
-    Du kannst das später erweitern.
+    Beschreibende Statistik der Werte plus Performance-Kennzahlen (performance_kernel).
     """
     series = pd.to_numeric(series, errors="coerce").dropna()
 
@@ -16,10 +196,19 @@ def compute_metrics(series: pd.Series) -> dict:
             "max": None,
         }
 
+    perf = performance_kernel(series, kind="values").iloc[0]
+
+    def num(x):
+        return None if pd.isna(x) else float(x)
+
     return {
         "count": int(series.count()),
         "mean": float(series.mean()),
         "std": float(series.std()),
         "min": float(series.min()),
         "max": float(series.max()),
-    }
\ No newline at end of file
+        "cagr": num(perf["cagr"]),
+        "vol": num(perf["vol"]),
+        "sharpe": num(perf["sharpe"]),
+        "max_drawdown": num(perf["max_drawdown"]),
+    }
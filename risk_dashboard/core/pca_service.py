@@ -0,0 +1,182 @@
+# risk_dashboard/core/pca_service.py
+"""
+PCA-Risiko-Score als Service.
+
+Statt bei jedem Aufruf zu z-scoren und eine neue PCA zu fitten, werden
+Mittelwert, Streumatrix und Ladungen einmal pro Datenversion berechnet und
+abgelegt. Neue Beobachtungen werden per Rang-1-Update (Welford/Chan) der
+Streumatrix eingearbeitet; da die PCA z-standardisierter Daten nur von der
+Korrelationsmatrix abhängt, ist das Ergebnis identisch zu einem Neufit.
+Scoring neuer Zeilen ist ein einziges Matrixprodukt.
+"""
+import json
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from risk_dashboard.core.store_io import data_version, save_store
+
+PCA_STORE_DIR = Path("cache") / "pca"
+
+# name -> model
+_MEMORY: dict = {}
+
+
+# ---------------------------------------------------------
+# Modell
+# ---------------------------------------------------------
+
+def _eigen(model: dict) -> dict:
+    """Ladungen aus der Korrelationsmatrix (Vorzeichen wie sklearn: größte |Ladung| positiv)."""
+    n = model["n_obs"]
+    scatter = np.asarray(model["scatter"], dtype=float)
+
+    std = np.sqrt(np.clip(np.diag(scatter) / n, 0.0, None))
+    scale = np.where(std > 0, std, 1.0)
+    corr = scatter / n / np.outer(scale, scale)
+
+    eigval, eigvec = np.linalg.eigh(corr)
+    order = np.argsort(eigval)[::-1]
+    eigval = np.clip(eigval[order], 0.0, None)
+    comps = eigvec[:, order].T
+
+    k = min(int(model["n_components"]), comps.shape[0])
+    comps = comps[:k]
+    signs = np.sign(comps[np.arange(k), np.abs(comps).argmax(axis=1)])
+    comps = comps * np.where(signs == 0, 1.0, signs)[:, None]
+
+    total = eigval.sum()
+    model.update({
+        "scale": scale,
+        "components": comps,
+        "explained_variance": eigval[:k] * n / max(n - 1, 1),
+        "explained_variance_ratio": eigval[:k] / total if total > 0 else np.zeros(k),
+    })
+    return model
+
+
+def fit_pca_model(factors: pd.DataFrame, n_components: int = 5) -> dict:
+    """Fittet das PCA-Modell (z-Score mit ddof=0, wie scipy.zscore / StandardScaler)."""
+    X = factors.to_numpy(dtype=float)
+    n = X.shape[0]
+    if n < 2:
+        raise ValueError("Zu wenige Beobachtungen für PCA.")
+    mean = X.mean(axis=0)
+    Xc = X - mean
+    model = {
+        "columns": [str(c) for c in factors.columns],
+        "n_components": int(n_components),
+        "n_obs": n,
+        "mean": mean,
+        "scatter": Xc.T @ Xc,
+        "data_version": data_version(factors),
+    }
+    return _eigen(model)
+
+
+def update_pca_model(model: dict, new_rows: pd.DataFrame, full_data: Optional[pd.DataFrame] = None) -> dict:
+    """
+    Arbeitet neue Beobachtungen ein (Chan-Merge von Mittelwert und Streumatrix)
+    und aktualisiert die Ladungen. Kein Neufit auf der Historie.
+    """
+    X = new_rows[model["columns"]].to_numpy(dtype=float)
+    if len(X) == 0:
+        return model
+
+    n_a, n_b = model["n_obs"], X.shape[0]
+    mean_b = X.mean(axis=0)
+    Xc = X - mean_b
+    delta = mean_b - model["mean"]
+    n = n_a + n_b
+
+    model = dict(model)
+    model["mean"] = model["mean"] + delta * (n_b / n)
+    model["scatter"] = model["scatter"] + Xc.T @ Xc + np.outer(delta, delta) * (n_a * n_b / n)
+    model["n_obs"] = n
+    if full_data is not None:
+        model["data_version"] = data_version(full_data)
+    return _eigen(model)
+
+
+def transform_pca(model: dict, X) -> np.ndarray:
+    """Scores für neue Zeilen: (X - mean) / std @ components.T."""
+    if isinstance(X, pd.DataFrame):
+        X = X[model["columns"]].to_numpy(dtype=float)
+    X = np.atleast_2d(np.asarray(X, dtype=float))
+    return ((X - model["mean"]) / model["scale"]) @ model["components"].T
+
+
+def loadings_frame(model: dict) -> pd.DataFrame:
+    k = model["components"].shape[0]
+    return pd.DataFrame(
+        model["components"].T,
+        columns=[f"PC{i+1}" for i in range(k)],
+        index=model["columns"]
+    )
+
+
+# ---------------------------------------------------------
+# Persistenz
+# ---------------------------------------------------------
+
+def _model_path(name: str, store_dir=None) -> Path:
+    store_dir = Path(store_dir) if store_dir is not None else PCA_STORE_DIR
+    return store_dir / f"{name}.json"
+
+
+def save_pca_model(model: dict, name: str, store_dir=None) -> None:
+    path = _model_path(name, store_dir)
+    payload = {k: (v.tolist() if isinstance(v, np.ndarray) else v) for k, v in model.items()}
+    save_store({}, path, payload)
+
+
+def load_pca_model(name: str, store_dir=None) -> Optional[dict]:
+    path = _model_path(name, store_dir)
+    if not path.exists():
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        payload = json.load(f)
+    for k in ("mean", "scatter", "scale", "components", "explained_variance", "explained_variance_ratio"):
+        payload[k] = np.asarray(payload[k], dtype=float)
+    return payload
+
+
+def get_pca_model(factors: pd.DataFrame, name: str, n_components: int = 5, store_dir=None) -> dict:
+    """
+    PCA-Modell für die aktuelle Datenversion.
+    - gleiche Version im Speicher/auf Platte -> direkt verwenden
+    - Daten = gespeicherte Historie + neue Zeilen -> inkrementelles Update
+    - sonst -> Neufit
+    """
+    version = data_version(factors)
+    cols = [str(c) for c in factors.columns]
+
+    model = _MEMORY.get(name)
+    if model is None:
+        model = load_pca_model(name, store_dir)
+
+    usable = (
+        model is not None
+        and model["columns"] == cols
+        and int(model["n_components"]) == int(n_components)
+    )
+
+    if usable and model["data_version"] == version:
+        _MEMORY[name] = model
+        return model
+
+    n_old = int(model["n_obs"]) if usable else 0
+    if usable and len(factors) > n_old and data_version(factors.iloc[:n_old]) == model["data_version"]:
+        model = update_pca_model(model, factors.iloc[n_old:], full_data=factors)
+    else:
+        model = fit_pca_model(factors, n_components=n_components)
+
+    _MEMORY[name] = model
+    save_pca_model(model, name, store_dir)
+    return model
+
+
+def clear_pca_cache():
+    _MEMORY.clear()
@@ -4,6 +4,8 @@
 import numpy as np
 import pandas as pd
 
+from risk_dashboard.core.metrics import performance_kernel
+
 
 def simulate_portfolio(asset_data: dict, weights: dict):
     dfs = []
@@ -39,10 +41,11 @@ def max_drawdown(series):
 
 
 def portfolio_stats(series):
+    m = performance_kernel(series, kind="returns", periods_per_year=252).iloc[0]
     return {
-        "Volatilität": portfolio_volatility(series),
-        "Max Drawdown": max_drawdown(series),
-        "Gesamtrendite": series.add(1).prod() - 1,
+        "Volatilität": m["vol"],
+        "Max Drawdown": m["max_drawdown"],
+        "Gesamtrendite": m["total_return"],
     }
 
 def simulate_portfolio_with_rebalancing(asset_data: dict, weights: dict, freq="ME"):
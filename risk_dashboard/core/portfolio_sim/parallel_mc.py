@@ -0,0 +1,173 @@
+# risk_dashboard/core/portfolio_sim/parallel_mc.py
+"""
+Deterministischer Multi-Prozess-Runner für Monte-Carlo-Simulationen.
+
+Das Pfadbudget wird in Blöcke fester Größe zerlegt; jeder Block erhält einen
+eigenen Zufallsstrom aus np.random.SeedSequence(seed).spawn(n_blocks).
+Die Blockeinteilung hängt nur von n_paths und block_size ab, nie von der
+Anzahl Worker. Teilergebnisse werden in Blockreihenfolge zusammengeführt –
+das Ergebnis ist für einen Seed bitidentisch, egal ob mit 1 oder 16 Prozessen.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+DEFAULT_BLOCK_SIZE = 10_000
+
+
+# ---------------------------------------------------------
+# Teilstatistiken
+# ---------------------------------------------------------
+
+def _partial_stats(samples: np.ndarray) -> dict:
+    x = np.asarray(samples, dtype=float)
+    if x.ndim == 1:
+        x = x[:, None]
+    n = x.shape[0]
+    mean = x.mean(axis=0) if n else np.full(x.shape[1], np.nan)
+    m2 = ((x - mean) ** 2).sum(axis=0) if n else np.zeros(x.shape[1])
+    return {
+        "n": n,
+        "mean": mean,
+        "m2": m2,
+        "min": x.min(axis=0) if n else np.full(x.shape[1], np.inf),
+        "max": x.max(axis=0) if n else np.full(x.shape[1], -np.inf),
+    }
+
+
+def merge_partial_stats(a: dict, b: dict) -> dict:
+    """Kombiniert zwei Teilstatistiken (paralleler Welford/Chan-Algorithmus)."""
+    if a["n"] == 0:
+        return dict(b)
+    if b["n"] == 0:
+        return dict(a)
+    n = a["n"] + b["n"]
+    delta = b["mean"] - a["mean"]
+    mean = a["mean"] + delta * (b["n"] / n)
+    m2 = a["m2"] + b["m2"] + delta ** 2 * (a["n"] * b["n"] / n)
+    return {
+        "n": n,
+        "mean": mean,
+        "m2": m2,
+        "min": np.minimum(a["min"], b["min"]),
+        "max": np.maximum(a["max"], b["max"]),
+    }
+
+
+# ---------------------------------------------------------
+# Runner
+# ---------------------------------------------------------
+
+def _run_block(task):
+    block_fn, n, seed_seq, kwargs, keep_samples = task
+    samples = np.asarray(block_fn(n, seed_seq, **kwargs))
+    return _partial_stats(samples), (samples if keep_samples else None)
+
+
+def plan_blocks(n_paths: int, block_size: int = DEFAULT_BLOCK_SIZE) -> list:
+    """Blockgrößen für ein Pfadbudget (unabhängig von der Worker-Anzahl)."""
+    n_paths = int(max(0, n_paths))
+    block_size = int(max(1, block_size))
+    full, rest = divmod(n_paths, block_size)
+    return [block_size] * full + ([rest] if rest else [])
+
+
+def run_parallel_mc(
+    block_fn,
+    n_paths: int,
+    seed=None,
+    n_workers=None,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    keep_samples: bool = True,
+    **kwargs,
+) -> dict:
+    """
+    Verteilt eine Monte-Carlo-Simulation auf einen Prozess-Pool.
+
+    Parameters
+    ----------
+    block_fn : callable
+        Top-Level-Funktion block_fn(n, seed_seq, **kwargs) -> ndarray mit n
+        Stichproben (Form (n,) oder (n, m)). Muss picklebar sein.
+    n_paths : int
+        Gesamtzahl der Pfade.
+    seed : int, optional
+        Seed für np.random.SeedSequence. None = zufällige Entropie
+        (wird im Ergebnis unter "entropy" zurückgegeben).
+    n_workers : int, optional
+        Anzahl Prozesse (Default: os.cpu_count()); 1 = ohne Pool.
+        Beeinflusst nur die Laufzeit, nie die Ergebnisse.
+    block_size : int
+        Pfade pro Block. Bestimmt (zusammen mit seed) die Zufallsströme.
+    keep_samples : bool
+        Stichproben in Blockreihenfolge zusammenfügen und zurückgeben.
+
+    Returns
+    -------
+    dict
+        n, mean, std, min, max (+ samples, p05, median, p95 bei keep_samples), entropy
+    """
+    sizes = plan_blocks(n_paths, block_size)
+    root = np.random.SeedSequence(seed)
+    children = root.spawn(len(sizes))
+    tasks = [(block_fn, n, ss, kwargs, keep_samples) for n, ss in zip(sizes, children)]
+
+    if n_workers is None:
+        n_workers = os.cpu_count() or 1
+    n_workers = max(1, min(int(n_workers), len(tasks) or 1))
+
+    if n_workers == 1:
+        parts = [_run_block(t) for t in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers) as ex:
+            # map() liefert in Eingabereihenfolge -> deterministisches Merging
+            parts = list(ex.map(_run_block, tasks))
+
+    stats = {"n": 0, "mean": 0.0, "m2": 0.0, "min": np.inf, "max": -np.inf}
+    for part, _ in parts:
+        stats = merge_partial_stats(stats, part)
+
+    def _squeeze(v):
+        v = np.asarray(v, dtype=float)
+        return float(v.reshape(-1)[0]) if v.size == 1 else v
+
+    n = stats["n"]
+    result = {
+        "n": n,
+        "mean": _squeeze(stats["mean"]) if n else float("nan"),
+        "std": _squeeze(np.sqrt(stats["m2"] / n)) if n else float("nan"),
+        "min": _squeeze(stats["min"]) if n else float("nan"),
+        "max": _squeeze(stats["max"]) if n else float("nan"),
+        "entropy": root.entropy,
+        "n_blocks": len(sizes),
+    }
+
+    if keep_samples:
+        samples = np.concatenate([s for _, s in parts]) if parts else np.array([])
+        result["samples"] = samples
+        if samples.size:
+            q = np.percentile(samples, [5, 50, 95], axis=0)
+            result["p05"], result["median"], result["p95"] = (_squeeze(v) for v in q)
+
+    return result
+
+
+# ---------------------------------------------------------
+# Block-Funktionen für die vorhandenen Simulationen
+# ---------------------------------------------------------
+
+def portfolio_return_block(n, seed_seq, weights, mu, cov):
+    """Block für country_assets.monte_carlo_portfolio: Portfolio-Renditen."""
+    rng = np.random.default_rng(seed_seq)
+    sims = rng.multivariate_normal(np.asarray(mu, dtype=float), np.asarray(cov, dtype=float), size=n)
+    return sims.dot(np.asarray(weights, dtype=float))
+
+
+def regime_terminal_block(n, seed_seq, **sim_kwargs):
+    """Block für regime_mc.simulate_regime_switching: Endvermögen je Pfad."""
+    from risk_dashboard.core.portfolio_sim.regime_mc import simulate_regime_switching
+
+    sim_kwargs = {k: v for k, v in sim_kwargs.items() if k not in ("n_paths", "seed", "keep_paths")}
+    res = simulate_regime_switching(n_paths=n, seed=seed_seq, keep_paths=False, **sim_kwargs)
+    return res["terminal_distribution"]
@@ -0,0 +1,332 @@
+# risk_dashboard/core/portfolio_sim/regime_mc.py
+"""
+Regime-Switching Monte Carlo.
+
+Regime-Pfade werden aus einer geschätzten Transitionsmatrix gezogen
+(z.B. regime_model.compute_regime_transition_matrix oder
+investment_engine.regime_transition_matrix), Renditen aus regime-
+bedingten Mittelwerten/Kovarianzen.
+"""
+import numpy as np
+import pandas as pd
+
+from risk_dashboard.core.transition_matrix import align_transition_matrix, stationary_distribution
+
+# Cholesky-Faktoren pro Kovarianzmatrix (Key: Form + Bytes der Matrix)
+_CHOL_CACHE = {}
+_CHOL_CACHE_MAX = 64
+
+
+# ---------------------------------------------------------
+# Transitionsmatrix & Regime-Momente
+# ---------------------------------------------------------
+
+def estimate_regime_moments(returns: pd.DataFrame, regimes: pd.Series, min_obs=None):
+    """
+    Schätzt Mittelwert und Kovarianz der Renditen pro Regime.
+
+    returns: DataFrame (Index = Datum, Spalten = Assets), z.B. Monatsrenditen
+    regimes: Series mit Regime-Label je Datum
+    min_obs: Mindestanzahl Beobachtungen je Regime; darunter werden die
+             unbedingten Momente verwendet (Default: Anzahl Assets + 2)
+
+    Returns
+    -------
+    (mu_df, cov_by_regime)
+        mu_df: DataFrame (Regime x Assets)
+        cov_by_regime: dict Regime -> DataFrame (Assets x Assets)
+    """
+    rets = returns.select_dtypes(include="number").dropna(how="any")
+    reg = regimes.reindex(rets.index)
+    mask = reg.notna()
+    rets, reg = rets[mask], reg[mask]
+
+    if rets.empty:
+        raise ValueError("Keine gemeinsamen Daten von Renditen und Regimen.")
+
+    n_assets = rets.shape[1]
+    min_obs = n_assets + 2 if min_obs is None else int(min_obs)
+
+    mu_all = rets.mean()
+    cov_all = rets.cov()
+
+    mu_rows = {}
+    covs = {}
+    for label, grp in rets.groupby(reg):
+        if len(grp) >= min_obs:
+            mu_rows[label] = grp.mean()
+            covs[label] = grp.cov()
+        else:
+            mu_rows[label] = mu_all
+            covs[label] = cov_all
+
+    mu_df = pd.DataFrame(mu_rows).T[rets.columns]
+    return mu_df, covs
+
+
+def _safe_cholesky(cov: np.ndarray) -> np.ndarray:
+    """Cholesky-Faktor; bei nicht positiv-definiter Matrix Eigenwert-Clipping."""
+    cov = np.asarray(cov, dtype=float)
+    key = (cov.shape, cov.tobytes())
+    L = _CHOL_CACHE.get(key)
+    if L is not None:
+        return L
+
+    try:
+        L = np.linalg.cholesky(cov)
+    except np.linalg.LinAlgError:
+        sym = 0.5 * (cov + cov.T)
+        vals, vecs = np.linalg.eigh(sym)
+        vals = np.clip(vals, 1e-12, None)
+        L = np.linalg.cholesky((vecs * vals) @ vecs.T)
+
+    if len(_CHOL_CACHE) >= _CHOL_CACHE_MAX:
+        _CHOL_CACHE.pop(next(iter(_CHOL_CACHE)))
+    _CHOL_CACHE[key] = L
+    return L
+
+
+# ---------------------------------------------------------
+# Regime-Pfade
+# ---------------------------------------------------------
+
+def sample_regime_paths(P: np.ndarray, n_paths: int, n_steps: int, start, rng) -> np.ndarray:
+    """
+    Zieht Regime-Pfade (n_paths x n_steps, Regime-Indizes) für alle Pfade
+    gleichzeitig per Inverse-CDF auf den kumulierten Zeilen von P.
+
+    start: int (Startregime-Index) oder Wahrscheinlichkeitsvektor für t=0
+    """
+    P = np.asarray(P, dtype=float)
+    k = P.shape[0]
+
+    cum = np.cumsum(P, axis=1)
+    cum[:, -1] = 1.0
+    # Zeile i wird um i verschoben -> ein einziges searchsorted für alle Pfade
+    offset = np.arange(k)[:, None]
+    flat = (cum + offset).ravel()
+
+    states = np.empty((n_paths, n_steps), dtype=np.int8 if k < 128 else np.int32)
+
+    if np.ndim(start) == 0:
+        prev = np.full(n_paths, int(start), dtype=np.int64)
+    else:
+        p0 = np.asarray(start, dtype=float)
+        c0 = np.cumsum(p0 / p0.sum())
+        c0[-1] = 1.0
+        prev = np.searchsorted(c0, rng.random(n_paths), side="right")
+
+    for t in range(n_steps):
+        u = rng.random(n_paths)
+        nxt = np.searchsorted(flat, u + prev, side="right") - prev * k
+        prev = np.minimum(nxt, k - 1)
+        states[:, t] = prev
+
+    return states
+
+
+# ---------------------------------------------------------
+# Simulation
+# ---------------------------------------------------------
+
+def simulate_regime_switching(
+    weights,
+    trans: pd.DataFrame,
+    mu_by_regime: pd.DataFrame,
+    cov_by_regime: dict,
+    n_paths: int = 10000,
+    n_steps: int = 120,
+    start_regime=None,
+    rebalancing: bool = True,
+    initial_value: float = 1.0,
+    keep_paths: bool = False,
+    seed=None,
+) -> dict:
+    """
+    Regime-Switching Monte Carlo eines Portfolios.
+
+    Parameters
+    ----------
+    weights : array-like oder dict
+        Portfolio-Gewichte (dict Asset -> Gewicht oder in Spaltenreihenfolge von mu_by_regime).
+    trans : DataFrame
+        Transitionsmatrix (From x To).
+    mu_by_regime : DataFrame
+        Erwartete Periodenrenditen (Regime x Assets).
+    cov_by_regime : dict
+        Regime -> Kovarianzmatrix (Assets x Assets).
+    n_paths, n_steps : int
+        Anzahl Pfade und Perioden (z.B. Monate).
+    start_regime : str, optional
+        Startregime; None = Start aus der stationären Verteilung.
+    rebalancing : bool
+        True: Gewichte werden jede Periode zurückgesetzt, sonst Buy-and-Hold.
+    keep_paths : bool
+        Vermögenspfade (n_paths x n_steps+1) zurückgeben (speicherintensiv).
+    seed : int
+        Zufallsseed.
+
+    Returns
+    -------
+    dict
+        terminal_distribution, max_drawdowns, quantiles, occupancy,
+        occupancy_by_step, summary, paths (optional), regimes
+    """
+    rng = np.random.default_rng(seed)
+
+    assets = list(mu_by_regime.columns)
+    P_df = align_transition_matrix(trans, regimes=list(
+        dict.fromkeys(list(trans.index) + list(trans.columns) + list(mu_by_regime.index))
+    ))
+    regimes = list(P_df.index)
+    P = P_df.to_numpy()
+    k = len(regimes)
+    n_assets = len(assets)
+
+    if isinstance(weights, dict):
+        w = np.array([float(weights.get(a, 0.0)) for a in assets])
+    else:
+        w = np.asarray(weights, dtype=float)
+    if w.shape[0] != n_assets:
+        raise ValueError("Anzahl Gewichte passt nicht zur Anzahl Assets.")
+    w = w / w.sum() if w.sum() != 0 else w
+
+    # Momente in Regime-Reihenfolge; Regime ohne Schätzung -> Durchschnitt
+    mu_fallback = mu_by_regime.mean().to_numpy()
+    cov_fallback = np.mean([np.asarray(c, dtype=float) for c in cov_by_regime.values()], axis=0)
+    mu = np.empty((k, n_assets))
+    chol = np.empty((k, n_assets, n_assets))
+    for i, reg in enumerate(regimes):
+        if reg in mu_by_regime.index:
+            mu[i] = mu_by_regime.loc[reg, assets].to_numpy(dtype=float)
+        else:
+            mu[i] = mu_fallback
+        cov = cov_by_regime.get(reg)
+        if cov is None:
+            cov = cov_fallback
+        elif isinstance(cov, pd.DataFrame):
+            cov = cov.loc[assets, assets].to_numpy(dtype=float)
+        chol[i] = _safe_cholesky(cov)
+
+    if start_regime is None:
+        start = stationary_distribution(P)
+    else:
+        if start_regime not in regimes:
+            raise ValueError(f"Unbekanntes Regime: {start_regime}")
+        start = regimes.index(start_regime)
+
+    states = sample_regime_paths(P, n_paths, n_steps, start, rng)
+
+    wealth = np.full(n_paths, float(initial_value))
+    peak = wealth.copy()
+    max_dd = np.zeros(n_paths)
+    holdings = None if rebalancing else np.outer(wealth, w)
+    paths = np.empty((n_paths, n_steps + 1), dtype=np.float32) if keep_paths else None
+    if keep_paths:
+        paths[:, 0] = wealth
+
+    # Bei Rebalancing ist w' L z ~ N(0, |L' w|^2): eine Normalziehung pro Pfad
+    # und Periode reicht, statt n_assets Ziehungen plus Matrixprodukt.
+    mu_p = mu @ w
+    sigma_p = np.linalg.norm(np.einsum("kij,i->kj", chol, w), axis=1)
+
+    q_levels = [0.05, 0.25, 0.5, 0.75, 0.95]
+    quantiles = np.empty((n_steps, len(q_levels)))
+    occupancy_by_step = np.empty((n_steps, k))
+    r_assets = None if rebalancing else np.empty((n_paths, n_assets))
+
+    for t in range(n_steps):
+        s_t = states[:, t]
+
+        if rebalancing:
+            r_p = mu_p[s_t] + sigma_p[s_t] * rng.standard_normal(n_paths)
+            wealth = wealth * (1.0 + np.clip(r_p, -1.0, None))
+        else:
+            z = rng.standard_normal((n_paths, n_assets))
+            for i in range(k):
+                idx = s_t == i
+                if idx.any():
+                    r_assets[idx] = mu[i] + z[idx] @ chol[i].T
+            np.clip(r_assets, -1.0, None, out=r_assets)
+            holdings *= 1.0 + r_assets
+            wealth = holdings.sum(axis=1)
+
+        np.maximum(peak, wealth, out=peak)
+        np.maximum(max_dd, 1.0 - wealth / peak, out=max_dd)
+
+        if keep_paths:
+            paths[:, t + 1] = wealth
+        quantiles[t] = np.quantile(wealth, q_levels)
+        occupancy_by_step[t] = np.bincount(s_t, minlength=k) / n_paths
+
+    terminal = wealth
+    var95 = float(np.percentile(terminal, 5))
+    tail = terminal[terminal <= var95]
+
+    visited = np.zeros((n_paths, k), dtype=bool)
+    for i in range(k):
+        visited[:, i] = (states == i).any(axis=1)
+
+    switches = (states[:, 1:] != states[:, :-1]).sum(axis=1) if n_steps > 1 else np.zeros(n_paths)
+    occupancy = pd.DataFrame({
+        "mean_share": occupancy_by_step.mean(axis=0),
+        "p_visited": visited.mean(axis=0),
+        "share_at_end": occupancy_by_step[-1],
+    }, index=regimes)
+    occupancy.index.name = "regime"
+
+    summary = {
+        "mean": float(terminal.mean()),
+        "median": float(np.median(terminal)),
+        "std": float(terminal.std()),
+        "p05": var95,
+        "p95": float(np.percentile(terminal, 95)),
+        "var95": var95,
+        "cvar95": float(tail.mean()) if tail.size else var95,
+        "prob_loss": float((terminal < initial_value).mean()),
+        "max_drawdown": float(max_dd.mean()),
+        "mean_regime_switches": float(switches.mean()),
+    }
+
+    return {
+        "terminal_distribution": terminal,
+        "max_drawdowns": max_dd,
+        "quantiles": pd.DataFrame(quantiles, index=np.arange(1, n_steps + 1),
+                                  columns=[f"p{int(q * 100):02d}" for q in q_levels]),
+        "occupancy": occupancy,
+        "occupancy_by_step": pd.DataFrame(occupancy_by_step, index=np.arange(1, n_steps + 1),
+                                          columns=regimes),
+        "summary": summary,
+        "paths": paths,
+        "regimes": regimes,
+        "regime_paths": states,
+    }
+
+
+def simulate_from_regime_history(
+    returns: pd.DataFrame,
+    regime_series: pd.Series,
+    weights,
+    n_paths: int = 10000,
+    n_steps: int = 120,
+    start_regime="last",
+    **kwargs,
+) -> dict:
+    """
+    Komfortfunktion: schätzt Transitionsmatrix und regime-bedingte Momente
+    aus einer historischen Regime-Serie und simuliert.
+    start_regime="last" startet im zuletzt beobachteten Regime.
+    """
+    from risk_dashboard.core.regime_model import compute_regime_transition_matrix
+
+    reg = regime_series.dropna()
+    trans = compute_regime_transition_matrix(reg.to_frame(name="regime"))
+    mu_df, covs = estimate_regime_moments(returns, reg)
+
+    if start_regime == "last":
+        start_regime = reg.iloc[-1]
+
+    return simulate_regime_switching(
+        weights, trans, mu_df, covs,
+        n_paths=n_paths, n_steps=n_steps, start_regime=start_regime, **kwargs
+    )
@@ -1,9 +1,8 @@
 # core/portfolio_sim/scenario_compare.py
 
-from core.scenario_engine import apply_risk_scenario, RISK_SCENARIOS
+from risk_dashboard.core.scenario_engine import apply_risk_scenarios, RISK_SCENARIOS
 
-def run_scenario_comparison(country, base_scores, weights, years):
-    results = {}
-    for scen_name in RISK_SCENARIOS.keys():
-        results[scen_name] = apply_risk_scenario(base_scores, scen_name)
-    return results
\ No newline at end of file
+def run_scenario_comparison(country, base_scores, weights, years, scenarios=None):
+    # alle Szenarien in einem Schritt (Szenarien x Dimensionen)
+    table = apply_risk_scenarios(base_scores, scenarios if scenarios is not None else RISK_SCENARIOS)
+    return {name: row.to_dict() for name, row in table.iterrows()}
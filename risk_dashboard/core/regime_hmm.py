@@ -1,19 +1,12 @@
 import numpy as np
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from hmmlearn.hmm import GaussianHMM
 import yfinance as yf
 import streamlit as st
 
 
-
-
-def fit_hmm_regimes(
-    feature_df: pd.DataFrame,
-    n_states: int = 3,
-    covariance_type: str = "full",
-    n_iter: int = 200,
-    random_state: int = 42
-):
+def _prepare_features(feature_df: pd.DataFrame) -> pd.DataFrame:
     # Nur numerische Features
     df_num = feature_df.select_dtypes(include=["float", "int"]).copy()
 
@@ -22,7 +15,17 @@ def fit_hmm_regimes(
 
     if len(df_num) < 10:
         raise ValueError("Zu wenige Daten für HMM nach Entfernen von NaNs.")
+    return df_num
+
 
+def fit_hmm_regimes(
+    feature_df: pd.DataFrame,
+    n_states: int = 3,
+    covariance_type: str = "full",
+    n_iter: int = 200,
+    random_state: int = 42
+):
+    df_num = _prepare_features(feature_df)
     X = df_num.values
 
     model = GaussianHMM(
@@ -41,6 +44,142 @@ def fit_hmm_regimes(
     return model, regime_df
 
 
+# ---------------------------------------------------------
+# Warm-Start-Refit
+# ---------------------------------------------------------
+
+def refit_hmm_warm(
+    model: GaussianHMM,
+    feature_df: pd.DataFrame,
+    n_iter: int = 50,
+    tol: float = 1e-3
+):
+    """
+    Refit ab den Parametern eines bestehenden Modells (kein Zufalls-Init).
+    Zustandsnummern bleiben dadurch in der Regel stabil.
+    Liefert (model, regime_df) wie fit_hmm_regimes.
+    """
+    df_num = _prepare_features(feature_df)
+    X = df_num.values
+
+    new_model = GaussianHMM(
+        n_components=model.n_components,
+        covariance_type=model.covariance_type,
+        n_iter=n_iter,
+        tol=tol,
+        random_state=model.random_state,
+        init_params=""
+    )
+    new_model.startprob_ = model.startprob_.copy()
+    new_model.transmat_ = model.transmat_.copy()
+    new_model.means_ = model.means_.copy()
+    new_model._covars_ = np.array(model._covars_, copy=True)
+    new_model.n_features = model.n_features
+
+    new_model.fit(X)
+    hidden_states = new_model.predict(X)
+
+    regime_df = df_num.copy()
+    regime_df["hmm_state"] = hidden_states
+
+    return new_model, regime_df
+
+
+_REFIT_EXECUTOR = None
+
+
+def refit_hmm_background(model: GaussianHMM, feature_df: pd.DataFrame, **kwargs):
+    """Startet refit_hmm_warm im Hintergrund; liefert ein Future mit (model, regime_df)."""
+    global _REFIT_EXECUTOR
+    if _REFIT_EXECUTOR is None:
+        _REFIT_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="hmm-refit")
+    return _REFIT_EXECUTOR.submit(refit_hmm_warm, model, feature_df.copy(), **kwargs)
+
+
+# ---------------------------------------------------------
+# Online-Filter (ein Forward-Schritt pro neuer Beobachtung)
+# ---------------------------------------------------------
+
+def _full_covars(model: GaussianHMM) -> np.ndarray:
+    n, d = model.n_components, model.n_features
+    c = np.asarray(model._covars_, dtype=float)
+    if model.covariance_type == "full":
+        return c
+    if model.covariance_type == "diag":
+        return c[:, :, None] * np.eye(d)[None, :, :]
+    if model.covariance_type == "spherical":
+        return c.reshape(n, -1)[:, 0][:, None, None] * np.eye(d)[None, :, :]
+    # tied
+    return np.repeat(c[None, :, :], n, axis=0)
+
+
+def init_hmm_filter(model: GaussianHMM, feature_df: pd.DataFrame = None) -> dict:
+    """
+    Bereitet den Online-Filter vor (Cholesky der Kovarianzen einmalig).
+    Mit feature_df wird die Historie einmal vorwärts gefiltert, sodass
+    'probs' die Regime-Wahrscheinlichkeiten der letzten Beobachtung enthält.
+    """
+    covs = _full_covars(model)
+    chol = np.linalg.cholesky(covs)
+    chol_inv = np.linalg.inv(chol)
+    logdet = 2.0 * np.log(np.diagonal(chol, axis1=1, axis2=2)).sum(axis=1)
+
+    state = {
+        "model": model,
+        "columns": None,
+        "means": np.asarray(model.means_, dtype=float),
+        "chol_inv": chol_inv,
+        "log_norm": -0.5 * (model.n_features * np.log(2 * np.pi) + logdet),
+        "transmat": np.asarray(model.transmat_, dtype=float),
+        "probs": None,
+        "n_obs": 0,
+    }
+
+    if feature_df is not None:
+        df_num = feature_df.select_dtypes(include=["float", "int"]).dropna()
+        state["columns"] = list(df_num.columns)
+        for x in df_num.values:
+            hmm_filter_step(state, x)
+    return state
+
+
+def _emission_loglik(state: dict, x: np.ndarray) -> np.ndarray:
+    z = np.einsum("kij,kj->ki", state["chol_inv"], x[None, :] - state["means"])
+    return state["log_norm"] - 0.5 * (z * z).sum(axis=1)
+
+
+def hmm_filter_step(state: dict, x) -> np.ndarray:
+    """
+    Ein Forward-Filter-Schritt: P(Regime_t | x_1..x_t) aus P(Regime_t-1 | ...).
+    x: Array, Series oder dict (Spaltennamen wie beim Fit).
+    """
+    if isinstance(x, dict):
+        x = pd.Series(x)
+    if isinstance(x, pd.Series):
+        x = x[state["columns"]].values if state["columns"] is not None else x.values
+    x = np.asarray(x, dtype=float).reshape(-1)
+
+    if state["probs"] is None:
+        prior = np.asarray(state["model"].startprob_, dtype=float)
+    else:
+        prior = state["probs"] @ state["transmat"]
+
+    ll = _emission_loglik(state, x)
+    w = prior * np.exp(ll - ll.max())
+    total = w.sum()
+    state["probs"] = w / total if total > 0 else prior
+    state["n_obs"] += 1
+    return state["probs"]
+
+
+def current_regime(state: dict, label_map: dict = None):
+    """Wahrscheinlichster Zustand (bzw. Label) und dessen Wahrscheinlichkeit."""
+    if state["probs"] is None:
+        return None, float("nan")
+    k = int(np.argmax(state["probs"]))
+    label = label_map.get(k, k) if label_map else k
+    return label, float(state["probs"][k])
+
 
 def map_hmm_states_to_labels(regime_df: pd.DataFrame):
     grouped = regime_df.groupby("hmm_state").mean(numeric_only=True)
@@ -0,0 +1,192 @@
+# risk_dashboard/core/regime_hmm_selection.py
+"""
+Modellauswahl für das Regime-HMM.
+
+Ein Gitter aus (n_states, covariance_type, seed) wird parallel in einem
+Prozess-Pool gefittet und per BIC/AIC sowie Out-of-Sample-Log-Likelihood
+(chronologischer Holdout am Ende der Historie) bewertet. Jedes gefittete
+Modell wird auf der Platte abgelegt, Schlüssel ist der Hash der Featuredaten.
+"""
+import hashlib
+import logging
+import os
+import pickle
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from hmmlearn.hmm import GaussianHMM
+
+from risk_dashboard.core.regime_hmm import _prepare_features, refit_hmm_warm
+
+HMM_CACHE_DIR = Path("cache") / "hmm_models"
+
+logger = logging.getLogger(__name__)
+
+
+# ---------------------------------------------------------
+# Hilfsfunktionen
+# ---------------------------------------------------------
+
+def feature_data_hash(X: np.ndarray) -> str:
+    X = np.ascontiguousarray(X, dtype=float)
+    h = hashlib.blake2b(digest_size=12)
+    h.update(str(X.shape).encode("utf-8"))
+    h.update(X.tobytes())
+    return h.hexdigest()
+
+
+def hmm_param_count(n_states: int, n_features: int, covariance_type: str) -> int:
+    """Anzahl freier Parameter (Start, Transitionen, Mittelwerte, Kovarianzen)."""
+    n, d = n_states, n_features
+    cov = {
+        "full": n * d * (d + 1) // 2,
+        "diag": n * d,
+        "spherical": n,
+        "tied": d * (d + 1) // 2,
+    }[covariance_type]
+    return (n - 1) + n * (n - 1) + n * d + cov
+
+
+def _cache_path(cache_dir, data_hash, n_states, covariance_type, seed, n_iter) -> Path:
+    return Path(cache_dir) / f"{data_hash}_{n_states}_{covariance_type}_{seed}_{n_iter}.pkl"
+
+
+def _fit_candidate(task) -> dict:
+    X_train, X_test, n_states, covariance_type, seed, n_iter, cache_path = task
+    row = {"n_states": n_states, "covariance_type": covariance_type, "seed": seed}
+
+    try:
+        model = None
+        cached = False
+        if cache_path is not None and cache_path.exists():
+            with open(cache_path, "rb") as f:
+                model = pickle.load(f)
+            cached = True
+
+        if model is None:
+            model = GaussianHMM(
+                n_components=n_states,
+                covariance_type=covariance_type,
+                n_iter=n_iter,
+                random_state=seed
+            )
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                model.fit(X_train)
+            if cache_path is not None:
+                try:
+                    cache_path.parent.mkdir(parents=True, exist_ok=True)
+                    with open(cache_path, "wb") as f:
+                        pickle.dump(model, f)
+                except Exception as e:
+                    logger.warning("HMM-Kandidat konnte nicht gecacht werden (%s): %s", cache_path, e)
+
+        ll = float(model.score(X_train))
+        k = hmm_param_count(n_states, X_train.shape[1], covariance_type)
+        n = X_train.shape[0]
+        row.update({
+            "loglik": ll,
+            "bic": -2.0 * ll + k * np.log(n),
+            "aic": -2.0 * ll + 2.0 * k,
+            # bedingte LL des Holdouts gegeben die Historie: LL(train+test) - LL(train)
+            "oos_loglik_per_obs": (
+                (float(model.score(np.vstack([X_train, X_test]))) - ll) / len(X_test)
+                if len(X_test) else np.nan
+            ),
+            "n_params": k,
+            "converged": bool(model.monitor_.converged),
+            "cached": cached,
+            "error": None,
+        })
+        return {"row": row, "model": model}
+
+    except Exception as e:
+        row.update({"loglik": np.nan, "bic": np.nan, "aic": np.nan, "oos_loglik_per_obs": np.nan,
+                    "n_params": np.nan, "converged": False, "cached": False, "error": str(e)})
+        return {"row": row, "model": None}
+
+
+# ---------------------------------------------------------
+# Modellauswahl
+# ---------------------------------------------------------
+
+def select_hmm_model(
+    feature_df: pd.DataFrame,
+    n_states_grid=(2, 3, 4, 5, 6),
+    covariance_types=("full", "diag"),
+    seeds=(0, 1, 2),
+    test_frac: float = 0.2,
+    n_iter: int = 200,
+    criterion: str = "bic",
+    n_workers: int = None,
+    cache_dir=None,
+    refit_full: bool = True
+):
+    """
+    Fittet alle Kandidaten parallel und wählt das beste Modell.
+
+    criterion: "bic", "aic" (minimal) oder "oos" (maximale Out-of-Sample-LL pro Beobachtung).
+    refit_full: bestes Modell per Warm-Start auf der gesamten Historie nachfitten.
+
+    Returns
+    -------
+    (best_model, regime_df, table)
+        table: ein Eintrag pro Kandidat, sortiert nach dem Kriterium.
+    """
+    df_num = _prepare_features(feature_df)
+    X = df_num.values.astype(float)
+
+    n_test = int(len(X) * test_frac)
+    X_train, X_test = (X[:-n_test], X[-n_test:]) if n_test > 0 else (X, X[:0])
+
+    cache_dir = HMM_CACHE_DIR if cache_dir is None else cache_dir
+    data_hash = feature_data_hash(X_train)
+
+    tasks = [
+        (X_train, X_test, int(n), cov, int(seed), n_iter,
+         _cache_path(cache_dir, data_hash, n, cov, seed, n_iter) if cache_dir else None)
+        for n, cov, seed in product(n_states_grid, covariance_types, seeds)
+    ]
+
+    if n_workers is None:
+        n_workers = os.cpu_count() or 1
+    n_workers = max(1, min(int(n_workers), len(tasks) or 1))
+
+    if n_workers == 1:
+        results = [_fit_candidate(t) for t in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers) as ex:
+            results = list(ex.map(_fit_candidate, tasks))
+
+    table = pd.DataFrame([r["row"] for r in results])
+    table["data_hash"] = data_hash
+
+    if criterion == "oos":
+        sort_col, ascending = "oos_loglik_per_obs", False
+    elif criterion in ("bic", "aic"):
+        sort_col, ascending = criterion, True
+    else:
+        raise ValueError(f"Unbekanntes Kriterium: {criterion}")
+
+    valid = table["error"].isna() & table[sort_col].notna()
+    if not valid.any():
+        raise ValueError("Kein HMM-Kandidat konnte gefittet werden.")
+
+    best_idx = table.loc[valid, sort_col].idxmax() if not ascending else table.loc[valid, sort_col].idxmin()
+    best_model = results[best_idx]["model"]
+
+    table = table.sort_values(sort_col, ascending=ascending, na_position="last")
+    table["best"] = table.index == best_idx
+    table = table.reset_index(drop=True)
+
+    if refit_full:
+        best_model, regime_df = refit_hmm_warm(best_model, df_num)
+    else:
+        regime_df = df_num.copy()
+        regime_df["hmm_state"] = best_model.predict(X)
+
+    return best_model, regime_df, table
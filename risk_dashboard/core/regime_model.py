@@ -1,8 +1,14 @@
 # core/regime_model.py
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
 import pandas as pd
 from typing import Union
 import yfinance as yf
 import streamlit as st
+from risk_dashboard.core.rule_engine import classify_regime_scores
+from risk_dashboard.core.transition_matrix import align_transition_matrix, stationary_distribution
 
 
 REGIMES = [
@@ -17,17 +23,9 @@ def classify_regime_from_score(score: float) -> str:
     """
     Mappt einen kontinuierlichen Risiko-/Makro-Score auf ein diskretes Regime.
     Score kann z.B. aus deinem Makro-Risiko-Modell kommen.
+    Schwellen: rule_engine.REGIME_SCORE_RULES.
     """
-    if score <= -1.5:
-        return "Krise"
-    elif score <= -0.5:
-        return "Rezession"
-    elif score <= 0.5:
-        return "Stagnation"
-    elif score <= 1.5:
-        return "Expansion"
-    else:
-        return "Boom"
+    return classify_regime_scores(score)[0]
 
 
 
@@ -47,7 +45,7 @@ def build_regime_timeline(score_series: Union[pd.Series, pd.DataFrame]) -> pd.Da
     s = s.dropna()
     df = s.to_frame(name="risk_score").reset_index().rename(columns={"index": "date"})
 
-    df["regime"] = df["risk_score"].apply(classify_regime_from_score)
+    df["regime"] = list(classify_regime_scores(df["risk_score"]))
     return df
 
 def compute_regime_transition_matrix(regime_df: pd.DataFrame) -> pd.DataFrame:
@@ -76,4 +74,130 @@ def next_regime_distribution(current_regime: str, trans_matrix: pd.DataFrame) ->
     if current_regime not in trans_matrix.index:
         raise ValueError(f"Unbekanntes Regime: {current_regime}")
 
-    return trans_matrix.loc[current_regime]
\ No newline at end of file
+    return trans_matrix.loc[current_regime]
+
+
+# ---------------------------------------------------------
+# Regime-Prognose über Matrixpotenzen
+# ---------------------------------------------------------
+
+_FORECAST_CACHE: "OrderedDict[tuple, dict]" = OrderedDict()
+_FORECAST_CACHE_MAX = 32
+
+
+def transition_matrix_version(trans_matrix: pd.DataFrame) -> str:
+    """Inhalts-Hash einer Transitionsmatrix (Regime-Namen + Werte)."""
+    h = hashlib.blake2b(digest_size=12)
+    h.update(repr(list(trans_matrix.index)).encode("utf-8"))
+    h.update(repr(list(trans_matrix.columns)).encode("utf-8"))
+    h.update(np.ascontiguousarray(trans_matrix.to_numpy(dtype=float)).tobytes())
+    return h.hexdigest()
+
+
+def _matrix_powers(P: np.ndarray, horizon: int) -> np.ndarray:
+    """
+    P^h für h = 0..horizon als Array (H+1, K, K).
+    Über die Eigenzerlegung in einem Schritt; bei schlecht konditionierter
+    (nicht diagonalisierbarer) Matrix per fortgesetzter Multiplikation.
+    """
+    k = P.shape[0]
+    h = np.arange(horizon + 1)
+
+    eigval, V = np.linalg.eig(P)
+    if np.linalg.cond(V) < 1e8:
+        V_inv = np.linalg.inv(V)
+        powers = np.einsum("ik,hk,kj->hij", V, eigval[None, :] ** h[:, None], V_inv).real
+    else:
+        powers = np.empty((horizon + 1, k, k))
+        powers[0] = np.eye(k)
+        for step in range(1, horizon + 1):
+            powers[step] = powers[step - 1] @ P
+
+    powers = np.clip(powers, 0.0, None)
+    return powers / powers.sum(axis=2, keepdims=True)
+
+
+def mean_first_passage_times(P: np.ndarray) -> np.ndarray:
+    """
+    Erwartete Anzahl Schritte von Regime i bis zum ersten Eintritt in Regime j
+    (Diagonale: erwartete Rückkehrzeit). Nicht erreichbar -> inf.
+    """
+    k = P.shape[0]
+    M = np.full((k, k), np.inf)
+    for j in range(k):
+        others = [i for i in range(k) if i != j]
+        if others:
+            Q = P[np.ix_(others, others)]
+            try:
+                m = np.linalg.solve(np.eye(len(others)) - Q, np.ones(len(others)))
+                M[others, j] = np.where(m >= 0, m, np.inf)
+            except np.linalg.LinAlgError:
+                pass
+            # Rückkehrzeit: ein Schritt + erwartete Zeit ab dem Folgeregime
+            reach = P[j, others] > 0
+            to_j = M[others, j]
+            M[j, j] = 1.0 + P[j, others][reach] @ to_j[reach] if np.all(np.isfinite(to_j[reach])) else np.inf
+        else:
+            M[j, j] = 1.0
+    return M
+
+
+def regime_forecast(trans_matrix: pd.DataFrame, horizon: int = 36) -> dict:
+    """
+    h-Schritt-Regimewahrscheinlichkeiten für alle Horizonte bis horizon und
+    alle Start-Regime auf einmal (gecacht pro Matrix-Version).
+
+    Returns
+    -------
+    dict
+        regimes     : Liste der Regime
+        probs       : Array (horizon+1, K, K), probs[h, i, j] = P(Regime_h = j | Regime_0 = i)
+        stationary  : pd.Series (stationäre Verteilung)
+        expected_duration : pd.Series, erwartete Verweildauer 1 / (1 - p_ii)
+        first_passage     : pd.DataFrame, erwartete Schritte von i bis zum ersten Erreichen von j
+        version     : Hash der Matrix
+    """
+    trans = align_transition_matrix(trans_matrix)
+    horizon = max(1, int(horizon))
+    key = (transition_matrix_version(trans), horizon)
+
+    hit = _FORECAST_CACHE.get(key)
+    if hit is not None:
+        _FORECAST_CACHE.move_to_end(key)
+        return hit
+
+    regimes = list(trans.index)
+    P = trans.to_numpy(dtype=float)
+    stay = np.diag(P)
+
+    with np.errstate(divide="ignore"):
+        duration = np.where(stay < 1.0, 1.0 / (1.0 - stay), np.inf)
+
+    result = {
+        "regimes": regimes,
+        "probs": _matrix_powers(P, horizon),
+        "stationary": pd.Series(stationary_distribution(P), index=regimes, name="stationaer"),
+        "expected_duration": pd.Series(duration, index=regimes, name="erwartete_dauer"),
+        "first_passage": pd.DataFrame(mean_first_passage_times(P), index=regimes, columns=regimes),
+        "version": key[0],
+    }
+
+    _FORECAST_CACHE[key] = result
+    while len(_FORECAST_CACHE) > _FORECAST_CACHE_MAX:
+        _FORECAST_CACHE.popitem(last=False)
+    return result
+
+
+def regime_outlook(trans_matrix: pd.DataFrame, current_regime: str, horizon: int = 36) -> pd.DataFrame:
+    """
+    Regime-Ausblick ab current_regime: DataFrame (Index = Horizont 1..horizon, Spalten = Regime).
+    """
+    fc = regime_forecast(trans_matrix, horizon)
+    if current_regime not in fc["regimes"]:
+        raise ValueError(f"Unbekanntes Regime: {current_regime}")
+
+    i = fc["regimes"].index(current_regime)
+    out = pd.DataFrame(fc["probs"][1:horizon + 1, i, :], columns=fc["regimes"],
+                       index=pd.RangeIndex(1, horizon + 1, name="Horizont"))
+    return out
+
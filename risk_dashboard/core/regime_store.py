@@ -0,0 +1,111 @@
+# risk_dashboard/core/regime_store.py
+"""
+Materialisierte, versionierte Regime-Zeitachse.
+
+Die Regime werden einmal pro Datenversion (Hash des Risiko-Scores + Modell-
+parameter) berechnet und mit ihren Modellparametern als Parquet + JSON
+abgelegt. Backtests lesen nur noch per Datumsbereich aus dem Store.
+"""
+import hashlib
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+
+from risk_dashboard.core.store_io import data_version, load_store, save_store
+
+REGIME_STORE_DIR = Path("cache") / "regimes"
+
+DEFAULT_REGIME_MODEL = {"method": "kmeans", "random_state": 0, "normalize": "minmax"}
+
+# version -> (DataFrame, meta)
+_MEMORY: dict = {}
+
+
+# ---------------------------------------------------------
+# Versionierung
+# ---------------------------------------------------------
+
+def regime_version(score_df: pd.DataFrame, model: Optional[dict] = None) -> str:
+    model = {**DEFAULT_REGIME_MODEL, **(model or {})}
+    raw = data_version(score_df) + json.dumps(model, sort_keys=True)
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=12).hexdigest()
+
+
+def _paths(version: str, store_dir: Optional[Path] = None):
+    store_dir = Path(store_dir) if store_dir is not None else REGIME_STORE_DIR
+    return store_dir / f"regimes_{version}.parquet", store_dir / f"regimes_{version}.json"
+
+
+# ---------------------------------------------------------
+# Materialisierung
+# ---------------------------------------------------------
+
+def materialize_regime_timeline(score_df: Optional[pd.DataFrame] = None, model: Optional[dict] = None,
+                                store_dir: Optional[Path] = None, force: bool = False):
+    """
+    Berechnet die Regime-Zeitachse für eine Datenversion (falls noch nicht vorhanden)
+    und legt sie ab. Liefert (DataFrame, meta).
+    """
+    from risk_dashboard.core.risk_engine import compute_risk_score_v2, fit_risk_regimes
+
+    model = {**DEFAULT_REGIME_MODEL, **(model or {})}
+    if score_df is None:
+        score_df = compute_risk_score_v2(normalize=True, method=model["normalize"])
+
+    version = regime_version(score_df, model)
+    if not force and version in _MEMORY:
+        return _MEMORY[version]
+
+    parquet_path, meta_path = _paths(version, store_dir)
+
+    stored = None if force else load_store([parquet_path], meta_path)
+    if stored is not None:
+        (df,), meta = stored
+    else:
+        df, params = fit_risk_regimes(score_df, random_state=model["random_state"])
+        meta = {
+            "version": version,
+            "data_version": data_version(score_df),
+            "model": model,
+            "params": params,
+            "n_rows": int(len(df)),
+            "start": str(df.index.min()) if len(df) else None,
+            "end": str(df.index.max()) if len(df) else None,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+        }
+        save_store({parquet_path: df}, meta_path, meta)
+
+    _MEMORY[version] = (df, meta)
+    return df, meta
+
+
+# ---------------------------------------------------------
+# Lesen
+# ---------------------------------------------------------
+
+def get_regime_timeline(start=None, end=None, score_df: Optional[pd.DataFrame] = None,
+                        model: Optional[dict] = None, store_dir: Optional[Path] = None) -> pd.DataFrame:
+    """
+    Regime-Zeitachse (DatetimeIndex, Spalten inkl. 'regime' und 'regime_label')
+    für den Datumsbereich [start, end]. Gibt immer eine Kopie zurück.
+    """
+    df, _ = materialize_regime_timeline(score_df, model=model, store_dir=store_dir)
+    if start is not None or end is not None:
+        df = df.loc[pd.Timestamp(start) if start is not None else None:
+                    pd.Timestamp(end) if end is not None else None]
+    return df.copy()
+
+
+def get_regime_meta(score_df: Optional[pd.DataFrame] = None, model: Optional[dict] = None,
+                    store_dir: Optional[Path] = None) -> dict:
+    """Metadaten (Version, Modellparameter, Clusterzentren) der aktuellen Regime-Zeitachse."""
+    _, meta = materialize_regime_timeline(score_df, model=model, store_dir=store_dir)
+    return dict(meta)
+
+
+def clear_regime_cache():
+    """Leert den In-Memory-Cache (abgelegte Dateien bleiben erhalten)."""
+    _MEMORY.clear()
@@ -2,10 +2,8 @@
 import pandas as pd
 import numpy as np
 from risk_dashboard.core.macro_loader import load_macro_series
-from scipy.stats import zscore
-from sklearn.decomposition import PCA
 from sklearn.cluster import KMeans
-from sklearn.preprocessing import StandardScaler
+from risk_dashboard.core.rule_engine import classify_scenario_scores
 
 # ---------------------------------------------------------
 # 1) Normalisierung
@@ -28,16 +26,8 @@ def _normalize_series(s: pd.Series) -> pd.Series:
 # ---------------------------------------------------------
 
 def classify_scenario_from_score(score):
-    if score < 0.25:
-        return "Rezession"
-    elif score < 0.45:
-        return "Stagflation"
-    elif score < 0.60:
-        return "Soft Landing"
-    elif score < 0.80:
-        return "Reflation"
-    else:
-        return "Boom"
+    # Schwellen: rule_engine.SCENARIO_SCORE_RULES
+    return classify_scenario_scores(score)[0]
 
 def build_scenario_series(risk_score_df):
     df = risk_score_df.copy()
@@ -45,7 +35,7 @@ def build_scenario_series(risk_score_df):
     # Unterstützt beide Versionen
     score_col = "risk_score_pca" if "risk_score_pca" in df.columns else "risk_score"
 
-    df["scenario"] = df[score_col].apply(classify_scenario_from_score)
+    df["scenario"] = list(classify_scenario_scores(df[score_col]))
     return df
 
 
@@ -127,14 +117,16 @@ def load_risk_factors():
 
 
 
-def compute_raw_risk_score():
+def compute_raw_risk_score(seed: int = 0):
     """
     Beispiel‑Skeleton: berechnet einen rohen Risiko‑Score und gibt ein DataFrame zurück.
     Ersetze die Dummy‑Logik durch deine echte Feature‑Extraktion / PCA / Modell.
+    Fester Seed: gleiche Eingabe -> gleicher Score -> gleiche Regime.
     """
     # Beispiel: Erzeuge Dummy‑Zeitreihe (ersetzen durch echte Daten)
     dates = pd.date_range("2020-01-01", periods=24, freq="QE")
-    raw_scores = np.random.normal(loc=0.0, scale=1.0, size=len(dates))
+    rng = np.random.default_rng(seed)
+    raw_scores = rng.normal(loc=0.0, scale=1.0, size=len(dates))
 
     df = pd.DataFrame({"risk_score_pca": raw_scores}, index=dates)
     return df
@@ -182,32 +174,30 @@ def compute_risk_score_v2(normalize=True, method="minmax"):
 
 
 def compute_pca_details():
+    from risk_dashboard.core.pca_service import get_pca_model, loadings_frame
+
     df = load_risk_factors()
     df = df.ffill().bfill()
 
     factors = df[["gdp", "cpi", "unrate", "fedfunds", "indpro"]]
-    factors_z = factors.apply(zscore)
 
-    pca = PCA(n_components=5)
-    pca.fit(factors_z)
+    # Fit einmal pro Datenversion, neue Beobachtungen inkrementell
+    model = get_pca_model(factors, name="macro_factors", n_components=5)
 
-    explained = pca.explained_variance_ratio_
-    loadings = pd.DataFrame(
-        pca.components_.T,
-        columns=[f"PC{i+1}" for i in range(5)],
-        index=factors.columns
-    )
+    explained = model["explained_variance_ratio"]
+    loadings = loadings_frame(model)
 
     return explained, loadings
 
 
-def detect_risk_regimes():
+REGIME_LABELS = ["Low Risk", "Medium Risk", "High Risk"]
+
+
+def fit_risk_regimes(df: pd.DataFrame, random_state: int = 0):
     """
-    Ermittelt Regime via KMeans auf der vorhandenen Risiko-Score-Spalte.
-    Liefert das DataFrame mit zusätzlichen Spalten 'regime' (int) und 'regime_label' (str).
+    KMeans (3 Cluster) auf der Risiko-Score-Spalte.
+    Liefert (DataFrame mit 'regime' und 'regime_label', Modellparameter als dict).
     """
-    df = compute_risk_score_v2(normalize=True, method="minmax")
-
     # Defensive Prüfung
     if df is None or df.empty:
         raise ValueError("Keine Risiko-Daten vorhanden in detect_risk_regimes().")
@@ -226,19 +216,14 @@ def detect_risk_regimes():
         raise ValueError("Nach Konvertierung/DropNa ist kein Score mehr vorhanden.")
 
     # KMeans clustering
-    kmeans = KMeans(n_clusters=3, n_init="auto", random_state=0)
+    kmeans = KMeans(n_clusters=len(REGIME_LABELS), n_init="auto", random_state=random_state)
     df["regime"] = kmeans.fit_predict(df[[score_col]])
 
     # Clusterzentren sortieren und in Low/Medium/High umbenennen
     centers = kmeans.cluster_centers_.flatten()
-    order = np.argsort(centers)  # index der Zentren von klein nach groÃŸ
-
-    label_map = {
-        order[0]: "Low Risk",
-        order[1]: "Medium Risk",
-        order[2]: "High Risk"
-    }
+    order = np.argsort(centers)  # index der Zentren von klein nach groß
 
+    label_map = {int(order[i]): REGIME_LABELS[i] for i in range(len(REGIME_LABELS))}
     df["regime_label"] = df["regime"].map(label_map)
 
     # Optional: Index/Datum sicherstellen (falls downstream benötigt)
@@ -246,7 +231,25 @@ def detect_risk_regimes():
         df["date"] = pd.to_datetime(df["date"], errors="coerce")
         df = df.set_index("date")
 
-    return df
+    params = {
+        "method": "kmeans",
+        "n_clusters": len(REGIME_LABELS),
+        "random_state": random_state,
+        "score_col": score_col,
+        "centers": centers.tolist(),
+        "label_map": {str(k): v for k, v in label_map.items()},
+    }
+    return df, params
+
+
+def detect_risk_regimes(start=None, end=None):
+    """
+    Ermittelt Regime via KMeans auf der vorhandenen Risiko-Score-Spalte.
+    Liefert das DataFrame mit zusätzlichen Spalten 'regime' (int) und 'regime_label' (str).
+    Liest aus dem Regime-Store (einmal pro Datenversion berechnet).
+    """
+    from risk_dashboard.core.regime_store import get_regime_timeline
+    return get_regime_timeline(start=start, end=end)
 
 
 def compute_pca_score(df):
@@ -266,13 +269,10 @@ def compute_pca_score(df):
     # Daten extrahieren
     X = df[macro_vars].copy()
 
-    # Skalieren
-    scaler = StandardScaler()
-    X_scaled = scaler.fit_transform(X)
-
-    # PCA
-    pca = PCA(n_components=1)
-    score = pca.fit_transform(X_scaled).flatten()
+    # Skalierung + PCA (gecacht pro Datenversion), Scoring per Matrixprodukt
+    from risk_dashboard.core.pca_service import get_pca_model, transform_pca
+    model = get_pca_model(X, name="pca_score", n_components=1)
+    score = transform_pca(model, X)[:, 0]
 
     return pd.Series(score, index=df.index, name="risk_score_pca")
 
@@ -1,9 +1,15 @@
 # core/risk_model.py
 
 from __future__ import annotations
-from typing import Dict, Tuple
+from collections import OrderedDict
+from typing import Dict, List, Tuple
+import hashlib
+import json
 import math
 
+import numpy as np
+import pandas as pd
+
 
 # -------------------------
 # Basisfunktionen
@@ -47,195 +53,276 @@ def normalize_value(x):
 # -------------------------
 
 def compute_tech_dependency(p: dict) -> float:
-    chips = p.get("halbleiter_abhaengigkeit", 0.5)
-    software = p.get("software_cloud_abhaengigkeit", 0.5)
-    ip = p.get("ip_lizenzen_abhaengigkeit", 0.5)
-    keytech = p.get("schluesseltechnologie_importe", 0.5)
-
-    risk = (
-        0.35 * clamp01(chips) +
-        0.30 * clamp01(software) +
-        0.20 * clamp01(ip) +
-        0.15 * clamp01(keytech)
-    )
-    return clamp01(risk)
+    return compute_risk_scores(p)["tech"]
 
 
 def compute_supply_chain_risk(p: dict) -> float:
-    chokepoint = p.get("chokepoint_abhaengigkeit", 0.5)
-    jit = p.get("just_in_time_anteil", 0.5)
-    konz = p.get("produktions_konzentration", 0.5)
-    puffer = p.get("lager_puffer", 0.5)
-
-    risk = (
-        0.35 * clamp01(chokepoint) +
-        0.30 * clamp01(jit) +
-        0.25 * clamp01(konz) +
-        0.10 * (1 - clamp01(puffer))
-    )
-    return clamp01(risk)
+    return compute_risk_scores(p)["supply_chain"]
 
 
 def compute_financial_dependency(p: dict) -> float:
-    ausland = p.get("auslandsverschuldung", 0.5)
-    kapital = p.get("kapitalmarkt_abhaengigkeit", 0.5)
-    invest = p.get("investoren_anteil", 0.5)
-    fx_refi = p.get("fremdwaehrungs_refinanzierung", 0.5)
-
-    risk = (
-        0.35 * clamp01(ausland) +
-        0.25 * clamp01(kapital) +
-        0.20 * clamp01(invest) +
-        0.20 * clamp01(fx_refi)
-    )
-    return clamp01(risk)
+    return compute_risk_scores(p)["financial"]
 
 
 # -------------------------
 # Risiko-Berechnung
 # -------------------------
 
-def compute_risk_scores(p: dict) -> Dict[str, float]:
-    # 1) MAKRO-RISIKO
-    versch = p.get("verschuldung", 0.8)
-    fx = p.get("FX_Schockempfindlichkeit", 0.8)
-    res = p.get("Reserven_Monate", 6)
-
-    versch_norm = normalize_exp(versch, scale=1.0)
-    fx_norm = clamp01(fx / 2.0)
-    res_norm = normalize_log(res, max_val=20.0)
-
-    macro = (
-        0.5 * versch_norm +
-        0.3 * fx_norm +
-        0.2 * res_norm
-    )
+# Gewichte der Dimensionen im Gesamtrisiko (strategische_autonomie ist positive KPI, nicht enthalten)
+TOTAL_WEIGHTS = {
+    "macro": 0.22,
+    "geo": 0.18,
+    "governance": 0.15,
+    "handel": 0.10,
+    "supply_chain": 0.06,
+    "financial": 0.06,
+    "tech": 0.05,
+    "energie": 0.05,
+    "currency": 0.07,
+    "political_security": 0.06,
+}
+
+
+def total_from_dimensions(scores: dict) -> float:
+    total = 0.0
+    for dim, w in TOTAL_WEIGHTS.items():
+        total += w * scores.get(dim, 0.0)
+    return total
+
+
+# Parameter, die der Score-Kernel liest (Spaltenreihenfolge der Parametermatrix)
+RISK_PARAM_KEYS: List[str] = [
+    "verschuldung", "FX_Schockempfindlichkeit", "Reserven_Monate",
+    "USD_Dominanz", "Sanktions_Exposure", "Alternativnetz_Abdeckung",
+    "demokratie", "innovation", "fachkraefte", "korruption",
+    "export_konzentration", "import_kritische_gueter", "partner_konzentration",
+    "chokepoint_abhaengigkeit", "just_in_time_anteil", "produktions_konzentration", "lager_puffer",
+    "auslandsverschuldung", "kapitalmarkt_abhaengigkeit", "investoren_anteil", "fremdwaehrungs_refinanzierung",
+    "halbleiter_abhaengigkeit", "software_cloud_abhaengigkeit", "ip_lizenzen_abhaengigkeit",
+    "schluesseltechnologie_importe",
+    "energie",
+    "sicherheitsgarantien", "aussenpolitische_abhaengigkeit", "externer_einfluss",
+    "sanktionsverwundbarkeit", "diplomatische_resilienz",
+]
+
+SCORE_KEYS: List[str] = [
+    "macro", "geo", "governance", "handel", "supply_chain", "financial", "tech",
+    "energie", "currency", "political_security", "strategische_autonomie", "total",
+]
+
+_PARAM_INDEX = {k: i for i, k in enumerate(RISK_PARAM_KEYS)}
+
+
+def params_to_matrix(param_dicts) -> np.ndarray:
+    """
+    Baut die Parametermatrix (Länder x RISK_PARAM_KEYS).
+    Fehlende oder nicht numerische Werte werden NaN und im Kernel durch die
+    jeweiligen Defaults ersetzt.
+    """
+    param_dicts = list(param_dicts)
+    X = np.full((len(param_dicts), len(RISK_PARAM_KEYS)), np.nan)
+    for i, p in enumerate(param_dicts):
+        for k, j in _PARAM_INDEX.items():
+            v = p.get(k)
+            if v is None:
+                continue
+            try:
+                X[i, j] = float(v)
+            except (TypeError, ValueError):
+                pass
+    return X
+
+
+def compute_risk_scores_matrix(X: np.ndarray) -> np.ndarray:
+    """
+    Vektorisierter Score-Kernel: (Länder x RISK_PARAM_KEYS) -> (Länder x SCORE_KEYS).
+    Gleiche Formeln und Defaults wie compute_risk_scores, in einem NumPy-Durchlauf.
+    """
+    X = np.atleast_2d(np.asarray(X, dtype=float))
 
-    # 2) GEO-RISIKO
-    usd = p.get("USD_Dominanz", 0.7)
-    sank = p.get("Sanktions_Exposure", 0.05)
-    alt = p.get("Alternativnetz_Abdeckung", 0.5)
+    def col(key, default):
+        x = X[:, _PARAM_INDEX[key]]
+        return np.where(np.isnan(x), default, x)
+
+    def c01(x):
+        return np.clip(x, 0.0, 1.0)
 
-    usd_norm = clamp01(usd)
-    sank_norm = clamp01(sank * 2.0)
-    alt_norm = clamp01(alt)
+    # 1) MAKRO-RISIKO
+    versch_norm = c01(1 - np.exp(-col("verschuldung", 0.8) / 1.0))
+    fx_norm = c01(col("FX_Schockempfindlichkeit", 0.8) / 2.0)
+    res_norm = c01(1 - (np.log1p(col("Reserven_Monate", 6)) / math.log1p(20.0)))
+    macro = 0.5 * versch_norm + 0.3 * fx_norm + 0.2 * res_norm
 
+    # 2) GEO-RISIKO
     geo = (
-        0.4 * usd_norm +
-        0.4 * sank_norm +
-        0.2 * ((1 - alt_norm) ** 1.5)
+        0.4 * c01(col("USD_Dominanz", 0.7)) +
+        0.4 * c01(col("Sanktions_Exposure", 0.05) * 2.0) +
+        0.2 * ((1 - c01(col("Alternativnetz_Abdeckung", 0.5))) ** 1.5)
     )
 
     # 3) GOVERNANCE-RISIKO
-    demo = p.get("demokratie", 0.8)
-    innov = p.get("innovation", 0.6)
-    fach = p.get("fachkraefte", 0.7)
-    korr = p.get("korruption", 0.3)
-
     governance = (
-        0.45 * (1 - clamp01(demo)) +
-        0.30 * clamp01(korr) +
-        0.15 * (1 - clamp01(innov)) +
-        0.10 * (1 - clamp01(fach))
+        0.45 * (1 - c01(col("demokratie", 0.8))) +
+        0.30 * c01(col("korruption", 0.3)) +
+        0.15 * (1 - c01(col("innovation", 0.6))) +
+        0.10 * (1 - c01(col("fachkraefte", 0.7)))
     )
 
     # 4) HANDELS-RISIKO
-    export_konz = p.get("export_konzentration", 0.5)
-    import_krit = p.get("import_kritische_gueter", 0.5)
-    partner_konz = p.get("partner_konzentration", 0.5)
-
     handel = (
-        0.4 * clamp01(export_konz) +
-        0.3 * clamp01(import_krit) +
-        0.3 * clamp01(partner_konz)
+        0.4 * c01(col("export_konzentration", 0.5)) +
+        0.3 * c01(col("import_kritische_gueter", 0.5)) +
+        0.3 * c01(col("partner_konzentration", 0.5))
     )
 
-    # 5) Lieferketten-Risiko
-    supply_chain = compute_supply_chain_risk(p)
-
-    # 6) Finanzielle Abhängigkeit
-    financial = compute_financial_dependency(p)
-
-    # 7) Tech-Abhängigkeit
-    tech = compute_tech_dependency(p)
-
-    # 8) Energieabhängigkeit (NEU)
-    energie = p.get("energie", 0.5)
-    energie = clamp01(energie)
-
-    # 9) Währungs- & Zahlungsabhängigkeit (NEU)
-    usd_dom = p.get("USD_Dominanz", 0.7)
-    sank_exp = p.get("Sanktions_Exposure", 0.1)
-    fx_sens = p.get("FX_Schockempfindlichkeit", 0.5)
-    refi = p.get("fremdwaehrungs_refinanzierung", 0.5)
-    kap_abh = p.get("kapitalmarkt_abhaengigkeit", 0.5)
-    alt_net = p.get("Alternativnetz_Abdeckung", 0.5)
-
-    currency = (
-        0.30 * clamp01(usd_dom) +
-        0.25 * clamp01(sank_exp * 2.0) +
-        0.20 * clamp01(fx_sens / 2.0) +
-        0.15 * clamp01(refi) +
-        0.10 * clamp01(kap_abh) -
-        0.10 * clamp01(alt_net)   # Alternativnetz reduziert Risiko
+    # 5) - 7) Lieferketten, Finanzen, Tech
+    supply_chain = c01(
+        0.35 * c01(col("chokepoint_abhaengigkeit", 0.5)) +
+        0.30 * c01(col("just_in_time_anteil", 0.5)) +
+        0.25 * c01(col("produktions_konzentration", 0.5)) +
+        0.10 * (1 - c01(col("lager_puffer", 0.5)))
     )
-    currency = clamp01(currency)
-
-    # 10) Politische & sicherheitspolitische Abhängigkeit (NEU)
-    sicherheit = p.get("sicherheitsgarantien", 0.5)
-    aussen = p.get("aussenpolitische_abhaengigkeit", 0.5)
-    einfluss = p.get("externer_einfluss", 0.5)
-    sanktion = p.get("sanktionsverwundbarkeit", 0.5)
-    diplo = p.get("diplomatische_resilienz", 0.5)
-
-    political_security = (
-        0.25 * (1 - clamp01(sicherheit)) +          # mehr Garantien = weniger Risiko
-        0.25 * clamp01(aussen) +                    # mehr Abhängigkeit = mehr Risiko
-        0.20 * clamp01(einfluss) +                  # mehr externer Einfluss = mehr Risiko
-        0.20 * clamp01(sanktion) +                  # mehr Verwundbarkeit = mehr Risiko
-        0.10 * (1 - clamp01(diplo))                 # mehr Resilienz = weniger Risiko
+    financial = c01(
+        0.35 * c01(col("auslandsverschuldung", 0.5)) +
+        0.25 * c01(col("kapitalmarkt_abhaengigkeit", 0.5)) +
+        0.20 * c01(col("investoren_anteil", 0.5)) +
+        0.20 * c01(col("fremdwaehrungs_refinanzierung", 0.5))
     )
-    political_security = clamp01(political_security)
-
-    # 11) Strategische Autonomie (NEU, positive KPI)
-    strategische_autonomie = (
-        0.30 * (1 - clamp01(p.get("aussenpolitische_abhaengigkeit", 0.5))) +
-        0.25 * (1 - clamp01(p.get("sanktionsverwundbarkeit", 0.5))) +
-        0.20 * (1 - clamp01(p.get("externer_einfluss", 0.5))) +
-        0.15 * clamp01(p.get("sicherheitsgarantien", 0.5)) +
-        0.10 * clamp01(p.get("diplomatische_resilienz", 0.5))
+    tech = c01(
+        0.35 * c01(col("halbleiter_abhaengigkeit", 0.5)) +
+        0.30 * c01(col("software_cloud_abhaengigkeit", 0.5)) +
+        0.20 * c01(col("ip_lizenzen_abhaengigkeit", 0.5)) +
+        0.15 * c01(col("schluesseltechnologie_importe", 0.5))
     )
-    strategische_autonomie = clamp01(strategische_autonomie)
 
-    # 12) GESAMTRISIKO
-    total = (
-        0.22 * macro +
-        0.18 * geo +
-        0.15 * governance +
-        0.10 * handel +
-        0.06 * supply_chain +
-        0.06 * financial +
-        0.05 * tech +
-        0.05 * energie +
-        0.07 * currency +
-        0.06 * political_security
+    # 8) Energie
+    energie = c01(col("energie", 0.5))
+
+    # 9) Währung & Zahlungen (eigene Defaults wie in der Skalarversion)
+    currency = c01(
+        0.30 * c01(col("USD_Dominanz", 0.7)) +
+        0.25 * c01(col("Sanktions_Exposure", 0.1) * 2.0) +
+        0.20 * c01(col("FX_Schockempfindlichkeit", 0.5) / 2.0) +
+        0.15 * c01(col("fremdwaehrungs_refinanzierung", 0.5)) +
+        0.10 * c01(col("kapitalmarkt_abhaengigkeit", 0.5)) -
+        0.10 * c01(col("Alternativnetz_Abdeckung", 0.5))
+    )
+
+    # 10) Politische & sicherheitspolitische Abhängigkeit
+    sicherheit = c01(col("sicherheitsgarantien", 0.5))
+    aussen = c01(col("aussenpolitische_abhaengigkeit", 0.5))
+    einfluss = c01(col("externer_einfluss", 0.5))
+    sanktion = c01(col("sanktionsverwundbarkeit", 0.5))
+    diplo = c01(col("diplomatische_resilienz", 0.5))
+
+    political_security = c01(
+        0.25 * (1 - sicherheit) + 0.25 * aussen + 0.20 * einfluss +
+        0.20 * sanktion + 0.10 * (1 - diplo)
     )
 
-    return {
-        "macro": macro,
-        "geo": geo,
-        "governance": governance,
-        "handel": handel,
-        "supply_chain": supply_chain,
-        "financial": financial,
-        "tech": tech,
-        "energie": energie,
-        "currency": currency,
-        "political_security": political_security,
-        "strategische_autonomie": strategische_autonomie,
-        "total": total,
+    # 11) Strategische Autonomie
+    strategische_autonomie = c01(
+        0.30 * (1 - aussen) + 0.25 * (1 - sanktion) + 0.20 * (1 - einfluss) +
+        0.15 * sicherheit + 0.10 * diplo
+    )
+
+    dims = {
+        "macro": macro, "geo": geo, "governance": governance, "handel": handel,
+        "supply_chain": supply_chain, "financial": financial, "tech": tech,
+        "energie": energie, "currency": currency, "political_security": political_security,
     }
 
+    # 12) GESAMTRISIKO
+    total = np.zeros(X.shape[0])
+    for dim, w in TOTAL_WEIGHTS.items():
+        total = total + w * dims[dim]
+
+    dims["strategische_autonomie"] = strategische_autonomie
+    dims["total"] = total
+    return np.column_stack([dims[k] for k in SCORE_KEYS])
+
+
+# -------------------------
+# Memoisierung je Preset-Version
+# -------------------------
+
+_SCORE_CACHE: "OrderedDict[tuple, np.ndarray]" = OrderedDict()
+_SCORE_CACHE_MAX = 4096
+
+# presets_version -> DataFrame
+_TABLE_CACHE: "OrderedDict[str, pd.DataFrame]" = OrderedDict()
+_TABLE_CACHE_MAX = 16
+
+
+def _params_key(p: dict) -> tuple:
+    key = tuple(p.get(k) for k in RISK_PARAM_KEYS)
+    try:
+        hash(key)
+    except TypeError:
+        key = tuple(repr(v) for v in key)
+    return key
+
+
+def presets_version(presets: Dict[str, dict]) -> str:
+    """Inhalts-Hash der Presets (ändert sich nur, wenn sich score-relevante Werte ändern)."""
+    h = hashlib.blake2b(digest_size=16)
+    for land in sorted(presets):
+        h.update(str(land).encode("utf-8"))
+        h.update(json.dumps(_params_key(presets[land]), default=str).encode("utf-8"))
+    return h.hexdigest()
+
+
+def _cached_score_rows(param_dicts: list) -> np.ndarray:
+    keys = [_params_key(p) for p in param_dicts]
+    rows = [None] * len(keys)
+    missing = []
+    for i, k in enumerate(keys):
+        row = _SCORE_CACHE.get(k)
+        if row is None:
+            missing.append(i)
+        else:
+            _SCORE_CACHE.move_to_end(k)
+            rows[i] = row
+
+    if missing:
+        S = compute_risk_scores_matrix(params_to_matrix(param_dicts[i] for i in missing))
+        for i, row in zip(missing, S):
+            _SCORE_CACHE[keys[i]] = row
+            rows[i] = row
+
+    # erst nach dem Einsammeln kürzen: Zeilen des laufenden Aufrufs bleiben gültig
+    while len(_SCORE_CACHE) > _SCORE_CACHE_MAX:
+        _SCORE_CACHE.popitem(last=False)
+    return np.vstack(rows) if rows else np.empty((0, len(SCORE_KEYS)))
+
+
+def risk_scores_table(presets: Dict[str, dict]) -> pd.DataFrame:
+    """
+    Alle Risiko-Scores für alle Länder (Index = Land, Spalten = SCORE_KEYS).
+    Tabellen werden je Preset-Version (presets_version) gehalten; bei einer
+    neuen Version werden nur Länder mit geänderten Parametern neu berechnet
+    (ein Kernel-Aufruf). Heatmaps, EWS, Storyline und Cluster teilen sich
+    denselben Cache.
+    """
+    lands = list(presets.keys())
+    version = presets_version(presets)
+    table = _TABLE_CACHE.get(version)
+    if table is None:
+        S = _cached_score_rows([presets[l] for l in lands])
+        table = pd.DataFrame(S, index=lands, columns=SCORE_KEYS)
+        _TABLE_CACHE[version] = table
+        while len(_TABLE_CACHE) > _TABLE_CACHE_MAX:
+            _TABLE_CACHE.popitem(last=False)
+    else:
+        _TABLE_CACHE.move_to_end(version)
+    return table.reindex(lands).copy()
+
+
+def compute_risk_scores(p: dict) -> Dict[str, float]:
+    """Scores für ein Land (Wrapper um den vektorisierten Kernel)."""
+    row = _cached_score_rows([p])[0]
+    return {k: float(v) for k, v in zip(SCORE_KEYS, row)}
+
 
 # -------------------------
 # Kategorien
@@ -0,0 +1,141 @@
+# risk_dashboard/core/rule_engine.py
+"""
+Kleine Regel-Engine für Schwellenwert-Klassifikationen.
+
+Regeln werden einmal deklariert (Label + Bedingungen, erste passende Regel
+gewinnt), zu np.select-Masken kompiliert und spaltenweise ausgewertet.
+Eine Regel ohne Treffer fällt auf das Default-Label zurück; NaN erfüllt
+keine Bedingung.
+"""
+from typing import Dict, List, Union
+
+import numpy as np
+import pandas as pd
+
+OPS = {
+    "<": np.less,
+    "<=": np.less_equal,
+    ">": np.greater,
+    ">=": np.greater_equal,
+    "==": np.equal,
+    "!=": np.not_equal,
+}
+
+# Spaltenname, unter dem eine einzelne Series / ein Skalar ausgewertet wird
+VALUE_COL = "value"
+
+
+# ---------------------------------------------------------
+# Regelkatalog
+# ---------------------------------------------------------
+
+# regime_model.classify_regime_from_score
+REGIME_SCORE_RULES = [
+    {"label": "Krise", "when": [(VALUE_COL, "<=", -1.5)]},
+    {"label": "Rezession", "when": [(VALUE_COL, "<=", -0.5)]},
+    {"label": "Stagnation", "when": [(VALUE_COL, "<=", 0.5)]},
+    {"label": "Expansion", "when": [(VALUE_COL, "<=", 1.5)]},
+]
+REGIME_SCORE_DEFAULT = "Boom"
+
+# risk_engine.classify_scenario_from_score
+SCENARIO_SCORE_RULES = [
+    {"label": "Rezession", "when": [(VALUE_COL, "<", 0.25)]},
+    {"label": "Stagflation", "when": [(VALUE_COL, "<", 0.45)]},
+    {"label": "Soft Landing", "when": [(VALUE_COL, "<", 0.60)]},
+    {"label": "Reflation", "when": [(VALUE_COL, "<", 0.80)]},
+]
+SCENARIO_SCORE_DEFAULT = "Boom"
+
+
+def historical_regime_rules(inflation_threshold: float = 3.0) -> List[dict]:
+    """Regeln für profiles_ui.detect_historical_regimes."""
+    return [
+        {"label": "high_inflation", "when": [("inflation", ">", inflation_threshold)]},
+        {"label": "high_volatility", "when": [("volatility", ">", 0.2)]},
+        {"label": "recession", "when": [("gdp", "<", 0.0)]},
+    ]
+
+
+HISTORICAL_REGIME_DEFAULT = "normal"
+
+
+# ---------------------------------------------------------
+# Kompilieren & Auswerten
+# ---------------------------------------------------------
+
+def compile_rules(rules: List[dict], default: str) -> dict:
+    """Prüft die Regeln und übersetzt Operatoren in NumPy-ufuncs."""
+    compiled = []
+    for rule in rules:
+        conds = rule["when"]
+        if isinstance(conds, tuple):
+            conds = [conds]
+        parsed = []
+        for col, op, threshold in conds:
+            if op not in OPS:
+                raise ValueError(f"Unbekannter Operator '{op}' in Regel '{rule['label']}'.")
+            parsed.append((col, OPS[op], float(threshold)))
+        compiled.append((rule["label"], parsed))
+
+    return {
+        "rules": compiled,
+        "default": default,
+        "columns": sorted({col for _, conds in compiled for col, _, _ in conds}),
+    }
+
+
+def _column_arrays(data, columns) -> Dict[str, np.ndarray]:
+    if isinstance(data, pd.DataFrame):
+        return {c: pd.to_numeric(data[c], errors="coerce").to_numpy(dtype=float) for c in columns}
+    arr = pd.to_numeric(pd.Series(np.atleast_1d(np.asarray(data))), errors="coerce").to_numpy(dtype=float)
+    return {c: arr for c in columns}
+
+
+def evaluate_rules(data: Union[pd.DataFrame, pd.Series, np.ndarray], compiled: dict) -> np.ndarray:
+    """
+    Wertet kompilierte Regeln auf allen Zeilen gleichzeitig aus.
+    data: DataFrame (Spalten laut Regeln) oder Series/Array (Spalte VALUE_COL).
+    Liefert ein object-Array mit Labels.
+    """
+    cols = _column_arrays(data, compiled["columns"])
+    n = len(next(iter(cols.values()))) if cols else len(data)
+
+    masks, labels = [], []
+    with np.errstate(invalid="ignore"):
+        for label, conds in compiled["rules"]:
+            mask = np.ones(n, dtype=bool)
+            for col, op, threshold in conds:
+                mask &= op(cols[col], threshold)
+            masks.append(mask)
+            labels.append(label)
+
+    out = np.select(masks, labels, default=compiled["default"]) if masks else np.full(n, compiled["default"])
+    return out.astype(object)
+
+
+def classify(data, rules: List[dict], default: str, name: str = None):
+    """
+    Komfortfunktion: kompiliert und wertet aus.
+    Series/DataFrame -> Series mit gleichem Index, Skalar -> str.
+    """
+    compiled = compile_rules(rules, default)
+    labels = evaluate_rules(data, compiled)
+    if np.ndim(data) == 0:
+        return labels[0]
+    index = data.index if isinstance(data, (pd.Series, pd.DataFrame)) else None
+    return pd.Series(list(labels), index=index, name=name)
+
+
+_REGIME_SCORE = compile_rules(REGIME_SCORE_RULES, REGIME_SCORE_DEFAULT)
+_SCENARIO_SCORE = compile_rules(SCENARIO_SCORE_RULES, SCENARIO_SCORE_DEFAULT)
+
+
+def classify_regime_scores(scores) -> np.ndarray:
+    """Vektorisierte Variante von regime_model.classify_regime_from_score."""
+    return evaluate_rules(scores, _REGIME_SCORE)
+
+
+def classify_scenario_scores(scores) -> np.ndarray:
+    """Vektorisierte Variante von risk_engine.classify_scenario_from_score."""
+    return evaluate_rules(scores, _SCENARIO_SCORE)
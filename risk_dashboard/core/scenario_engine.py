@@ -60,31 +60,113 @@ def generate_date_range(start="2026-01-01", periods=24, freq="ME"):
         raise
 
 
+# Baseline-Pfade (Start, Ende) je Variable; linear interpoliert
+BASELINE_PATHS = {
+    "BIP (Mrd USD)": (23000.0, 26000.0),
+    "Inflation (%)": (2.0, 2.2),
+    "Arbeitslosenquote (%)": (4.0, 3.8),
+    "Zinssatz (%)": (3.5, 3.0),
+}
+
+# Alias der Schock-Parameter von build_scenario -> Variable
+SHOCK_PARAMS = {
+    "bip_shock": "BIP (Mrd USD)",
+    "inflation_shock": "Inflation (%)",
+    "unemployment_shock": "Arbeitslosenquote (%)",
+    "interest_shock": "Zinssatz (%)",
+}
+
+
 # ---------------------------------------------------------
-# 1. BASELINE-SZENARIO
+# 0. ARRAY-KERN (Variablen x Perioden, Szenarien x Variablen)
 # ---------------------------------------------------------
-def build_baseline_scenario(start="2026-01-01", periods=24):
-    dates = generate_date_range(start, periods)
+def build_baseline_array(periods=24, variables=None) -> np.ndarray:
+    """Baseline als Array (Variablen x Perioden)."""
+    variables = variables or VARIABLES
+    starts = np.array([BASELINE_PATHS[v][0] for v in variables])
+    ends = np.array([BASELINE_PATHS[v][1] for v in variables])
+    return np.linspace(starts, ends, periods, axis=1)
+
 
-    data = []
+def build_shock_matrix(scenarios: dict, variables=None):
+    """
+    Szenarien als Schockmatrix (Szenarien x Variablen), multiplikative Faktoren.
+    scenarios: dict name -> dict {Variable oder Schock-Parameter (z.B. "bip_shock"): Faktor}
+    Fehlende Variablen bleiben bei 1.0 (kein Schock).
+    """
+    variables = variables or VARIABLES
+    col = {v: j for j, v in enumerate(variables)}
+    names = list(scenarios.keys())
+    shocks = np.ones((len(names), len(variables)))
+    for i, name in enumerate(names):
+        for key, factor in (scenarios[name] or {}).items():
+            target = SHOCK_PARAMS.get(key, key)
+            if target in col:
+                shocks[i, col[target]] = float(factor)
+    return names, shocks
+
+
+def evaluate_scenarios(baseline: np.ndarray, shocks: np.ndarray) -> np.ndarray:
+    """
+    Wertet alle Szenarien per Broadcasting aus.
+    baseline: (Variablen x Perioden); shocks: (Szenarien x Variablen) oder
+    (Szenarien x Variablen x Perioden) für zeitabhängige Schockpfade.
+    Ergebnis: (Szenarien x Variablen x Perioden)
+    """
+    shocks = np.asarray(shocks, dtype=float)
+    if shocks.ndim == 2:
+        shocks = shocks[:, :, None]
+    return shocks * baseline[None, :, :]
+
+
+def scenarios_to_frame(values: np.ndarray, dates, variables=None, scenario_names=None) -> pd.DataFrame:
+    """
+    Long-Format fürs UI: Spalten date, variable_Label, value (+ scenario).
+    values: (Variablen x Perioden) oder (Szenarien x Variablen x Perioden)
+    """
+    variables = variables or VARIABLES
+    values = np.asarray(values, dtype=float)
+    if values.ndim == 2:
+        values = values[None]
+    n_scen, n_var, n_per = values.shape
+
+    df = pd.DataFrame({
+        "date": np.tile(np.asarray(dates), n_scen * n_var),
+        "variable_Label": np.tile(np.repeat(np.asarray(variables, dtype=object), n_per), n_scen),
+        "value": values.reshape(-1),
+    })
+    if scenario_names is not None:
+        df.insert(0, "scenario", np.repeat(np.asarray(scenario_names, dtype=object), n_var * n_per))
+    return df
+
+
+def compare_scenarios(scenarios: dict, start="2026-01-01", periods=24, as_frame=True):
+    """
+    Vergleicht beliebig viele Szenarien in einem Broadcasting-Schritt.
+    Liefert (values, summary) bzw. (long-DataFrame, summary); summary enthält die
+    prozentuale Abweichung zur Baseline am Horizontende (Szenarien x Variablen).
+    """
+    dates = generate_date_range(start, periods)
+    baseline = build_baseline_array(periods)
+    names, shocks = build_shock_matrix(scenarios)
+    values = evaluate_scenarios(baseline, shocks)
 
-    # Beispielhafte Baseline-Pfade (kannst du ersetzen)
-    bip = np.linspace(23000, 26000, periods)
-    inflation = np.linspace(2.0, 2.2, periods)
-    unemployment = np.linspace(4.0, 3.8, periods)
-    interest = np.linspace(3.5, 3.0, periods)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        dev = values[:, :, -1] / baseline[None, :, -1] - 1.0
+    summary = pd.DataFrame(dev * 100.0, index=names, columns=VARIABLES)
+    summary.index.name = "scenario"
 
-    series = [bip, inflation, unemployment, interest]
+    if not as_frame:
+        return values, summary
+    return scenarios_to_frame(values, dates, scenario_names=names), summary
 
-    for var, values in zip(VARIABLES, series):
-        for d, v in zip(dates, values):
-            data.append({
-                "date": d,
-                "variable_Label": var,
-                "value": float(v)
-            })
 
-    return pd.DataFrame(data)
+# ---------------------------------------------------------
+# 1. BASELINE-SZENARIO
+# ---------------------------------------------------------
+def build_baseline_scenario(start="2026-01-01", periods=24):
+    dates = generate_date_range(start, periods)
+    return scenarios_to_frame(build_baseline_array(periods), dates)
 
 
 # ---------------------------------------------------------
@@ -104,20 +186,61 @@ def build_scenario(
     - bip_shock=0.95 → BIP -5%
     - inflation_shock=1.3 → Inflation +30%
     """
+    dates = generate_date_range(start, periods)
+    _, shocks = build_shock_matrix({"scenario": {
+        "bip_shock": bip_shock,
+        "inflation_shock": inflation_shock,
+        "unemployment_shock": unemployment_shock,
+        "interest_shock": interest_shock,
+    }})
+    values = evaluate_scenarios(build_baseline_array(periods), shocks)
+    return scenarios_to_frame(values, dates)
 
-    baseline = build_baseline_scenario(start, periods)
-    scenario = baseline.copy()
 
-    shock_map = {
-        "BIP (Mrd USD)": bip_shock,
-        "Inflation (%)": inflation_shock,
-        "Arbeitslosenquote (%)": unemployment_shock,
-        "Zinssatz (%)": interest_shock
-    }
+# ---------------------------------------------------------
+# 3. RISIKO-SZENARIEN (additive Schocks auf Risiko-Dimensionen)
+# ---------------------------------------------------------
+RISK_SCENARIOS = {
+    "Baseline": {},
+    "Rezession": {"macro": 0.20, "financial": 0.10, "handel": 0.10},
+    "Energiekrise": {"energie": 0.40, "macro": 0.10, "supply_chain": 0.15},
+    "Finanzkrise": {"financial": 0.30, "currency": 0.20, "macro": 0.15},
+    "Geopolitische Eskalation": {"geo": 0.30, "political_security": 0.25, "handel": 0.10},
+    "Lieferkettenbruch": {"supply_chain": 0.35, "handel": 0.20, "tech": 0.10},
+}
+
+
+def apply_risk_scenarios(base_scores: dict, scenarios=None) -> pd.DataFrame:
+    """
+    Wendet alle Risiko-Szenarien gleichzeitig an: Basisscores (D,) + Schockmatrix
+    (Szenarien x D), geclippt auf [0, 1]; 'total' wird neu gewichtet.
+    Liefert DataFrame (Szenarien x Dimensionen inkl. total).
+    """
+    from risk_dashboard.core.risk_model import TOTAL_WEIGHTS
+
+    scenarios = RISK_SCENARIOS if scenarios is None else scenarios
+    dims = [d for d in base_scores.keys() if d != "total"]
+    col = {d: j for j, d in enumerate(dims)}
+    names = list(scenarios.keys())
+
+    shocks = np.zeros((len(names), len(dims)))
+    for i, name in enumerate(names):
+        for dim, delta in (scenarios[name] or {}).items():
+            if dim in col:
+                shocks[i, col[dim]] = float(delta)
+
+    base = np.array([float(base_scores[d]) for d in dims])
+    scores = np.clip(base[None, :] + shocks, 0.0, 1.0)
+    w = np.array([TOTAL_WEIGHTS.get(d, 0.0) for d in dims])
+
+    out = pd.DataFrame(scores, index=names, columns=dims)
+    out["total"] = scores @ w
+    out.index.name = "scenario"
+    return out
 
-    scenario["value"] = scenario.apply(
-        lambda row: row["value"] * shock_map[row["variable_Label"]],
-        axis=1
-    )
 
-    return scenario
\ No newline at end of file
+def apply_risk_scenario(base_scores: dict, scen_name: str) -> dict:
+    """Einzelnes Risiko-Szenario (Wrapper um apply_risk_scenarios)."""
+    if scen_name not in RISK_SCENARIOS:
+        raise KeyError(f"Unbekanntes Szenario: {scen_name}")
+    return apply_risk_scenarios(base_scores, {scen_name: RISK_SCENARIOS[scen_name]}).iloc[0].to_dict()
@@ -0,0 +1,369 @@
+# risk_dashboard/core/screener_store.py
+"""
+Materialisierte Screener-Tabelle mit Abfrage-API.
+
+Ein nächtlicher Job (materialize_screener / `python -m risk_dashboard.core.screener_store`)
+lädt die Kurse des Universums mit einem Download, berechnet je Ticker
+Renditen über mehrere Horizonte, Volatilität, Drawdown, Momentum, Sharpe
+und KI-Score und legt das Ergebnis zusammen mit den Stammdaten (TER, AUM,
+Region, Assetklasse) als Parquet ab.
+
+Screener-Abfragen laufen danach nur noch auf der geladenen Tabelle:
+Filter sind vektorisierte Spalten-Prädikate (Kategorien über ihre Codes),
+Sortierungen ein lexsort bzw. argpartition für Top-N.
+"""
+import json
+import logging
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from risk_dashboard.core.ki_panel import panel_engine_ki_scores
+from risk_dashboard.core.metrics import performance_kernel
+from risk_dashboard.core.rule_engine import OPS
+
+logger = logging.getLogger(__name__)
+
+SCREENER_STORE_DIR = Path("cache") / "screener"
+
+# Horizonte in Handelstagen
+RETURN_HORIZONS = {"ret_1m": 21, "ret_3m": 63, "ret_6m": 126, "ret_1y": 252, "ret_3y": 756}
+
+# Kategorische Spalten (Codes statt Strings für schnelle Filter)
+CATEGORY_COLUMNS = ["region", "asset_class", "Sektor", "Land", "Replikation"]
+
+# name -> (mtime, table, column arrays)
+_TABLES: dict = {}
+
+
+# ---------------------------------------------------------
+# Universen
+# ---------------------------------------------------------
+
+def _first(entry: dict, *keys):
+    for k in keys:
+        if entry.get(k) not in (None, ""):
+            return entry[k]
+    return None
+
+
+def etf_universe() -> pd.DataFrame:
+    """
+    ETF-Stammdaten aus core/data/etf_database.json, ergänzt um db_assets.ETF_DB
+    (TER, Volumen/AUM, ISIN, Replikation, TD), sofern verfügbar.
+    """
+    path = Path(__file__).parent / "data" / "etf_database.json"
+    with open(path, "r", encoding="utf-8") as f:
+        entries = json.load(f)
+
+    try:
+        from core.data.db_assets import ETF_DB
+    except Exception:
+        ETF_DB = []
+
+    rows = {}
+    for e in list(entries) + list(ETF_DB):
+        ticker = _first(e, "ticker", "Ticker")
+        if not ticker:
+            continue
+        row = rows.setdefault(str(ticker).upper(), {"ticker": str(ticker).upper()})
+        for col, keys in {
+            "name": ("name", "Name"),
+            "yahoo": ("yahoo", "Yahoo"),
+            "isin": ("isin", "ISIN"),
+            "region": ("region", "Region"),
+            "asset_class": ("asset_class", "Kategorie"),
+            "ter": ("ter", "TER"),
+            "aum": ("aum", "AUM", "AUM_mio", "Volumen"),
+            "Replikation": ("Replikation",),
+            "TD": ("TD",),
+        }.items():
+            value = _first(e, *keys)
+            if value is not None and row.get(col) is None:
+                row[col] = value
+
+    df = pd.DataFrame(list(rows.values()))
+    for col in ("name", "yahoo", "isin", "region", "asset_class", "ter", "aum", "Replikation", "TD"):
+        if col not in df.columns:
+            df[col] = None
+    df["yahoo"] = df["yahoo"].fillna(df["ticker"])
+    df["ter"] = pd.to_numeric(df["ter"], errors="coerce")
+    df["aum"] = pd.to_numeric(df["aum"], errors="coerce")
+    return df
+
+
+def stock_universe() -> pd.DataFrame:
+    """Aktien-Stammdaten aus db_assets.STOCK_DB (Kennzahlen KGV, KUV, ... inklusive)."""
+    try:
+        from core.data.db_assets import STOCK_DB
+    except Exception:
+        STOCK_DB = []
+    df = pd.DataFrame(STOCK_DB)
+    if df.empty:
+        return pd.DataFrame(columns=["ticker", "yahoo"])
+    df = df.rename(columns={"Ticker": "ticker", "Yahoo": "yahoo", "Name": "name", "Region": "region"})
+    df["ticker"] = df["ticker"].astype(str).str.upper()
+    df["yahoo"] = df["yahoo"].fillna(df["ticker"]) if "yahoo" in df.columns else df["ticker"]
+    return df
+
+
+UNIVERSES = {"etf": etf_universe, "stocks": stock_universe}
+
+
+# ---------------------------------------------------------
+# Kennzahlen
+# ---------------------------------------------------------
+
+def compute_screener_metrics(prices: pd.DataFrame) -> pd.DataFrame:
+    """
+    Kennzahlen je Spalte eines Preis-Panels (Index = Datum), alle Spalten gemeinsam.
+    Renditen über RETURN_HORIZONS, Momentum 12-1, Volatilität 1J, sowie CAGR, Sharpe,
+    Sortino, Max Drawdown und Calmar über die gesamte Historie.
+    """
+    prices = prices.sort_index()
+    filled = prices.ffill()
+    last = filled.iloc[-1]
+    seen = prices.notna().cumsum()
+
+    def back(h):
+        if len(filled) <= h:
+            return pd.Series(np.nan, index=prices.columns)
+        # nur wenn die Spalte h Zeilen zurück schon Daten hatte
+        return filled.iloc[-1 - h].where(seen.iloc[-1 - h] > 0)
+
+    out = pd.DataFrame(index=prices.columns)
+    for col, h in RETURN_HORIZONS.items():
+        out[col] = last / back(h) - 1
+    out["momentum_12_1"] = back(21) / back(252) - 1
+
+    recent = performance_kernel(prices.iloc[-253:], kind="values")
+    full = performance_kernel(prices, kind="values", sharpe_basis="compound")
+    out["vol_1y"] = recent["vol"].to_numpy()
+    for col in ("cagr", "ann_return", "vol", "sharpe", "sortino", "max_drawdown", "max_dd_duration", "calmar"):
+        out[col] = full[col].to_numpy()
+    out["n_obs"] = full["n_obs"].to_numpy()
+    out["last_date"] = prices.apply(pd.Series.last_valid_index)
+
+    try:
+        out["ki_score"] = panel_engine_ki_scores(prices).to_numpy()
+    except Exception as e:
+        logger.warning("KI-Score für die Screener-Tabelle nicht berechenbar: %s", e)
+        out["ki_score"] = np.nan
+
+    return out
+
+
+# ---------------------------------------------------------
+# Materialisierung (nächtlicher Job)
+# ---------------------------------------------------------
+
+def _paths(name: str, store_dir=None):
+    store_dir = Path(store_dir) if store_dir is not None else SCREENER_STORE_DIR
+    return store_dir / f"screener_{name}.parquet", store_dir / f"screener_{name}.json"
+
+
+def build_screener_table(universe: pd.DataFrame, prices: pd.DataFrame) -> pd.DataFrame:
+    """Stammdaten + Kennzahlen, eine Zeile je Ticker, Kategorien mit Codes."""
+    yahoo = universe["yahoo"].astype(str).str.upper()
+    prices = prices.rename(columns=lambda c: str(c).upper())
+    metrics = compute_screener_metrics(prices.loc[:, prices.columns.isin(yahoo)])
+
+    metrics = metrics.reindex(yahoo.to_numpy())
+    metrics.index = universe.index
+    table = universe.join(metrics).reset_index(drop=True)
+    for col in CATEGORY_COLUMNS:
+        if col in table.columns:
+            table[col] = table[col].astype("category")
+            table[f"{col}_code"] = table[col].cat.codes.astype("int16")
+    return table
+
+
+def materialize_screener(name: str = "etf", prices: Optional[pd.DataFrame] = None,
+                         start: str = "2010-01-01", store_dir=None) -> pd.DataFrame:
+    """
+    Berechnet die Screener-Tabelle für ein Universum ('etf', 'stocks') und legt sie ab.
+    Ohne `prices` werden alle Kurse mit einem Download geladen.
+    """
+    universe = UNIVERSES[name]()
+    if universe.empty:
+        table = universe
+    else:
+        if prices is None:
+            from risk_dashboard.data_utils import fetch_prices_from_yf
+            prices = fetch_prices_from_yf(list(universe["yahoo"].astype(str)), start=start,
+                                          auto_adjust=True, threads=True)
+        table = build_screener_table(universe, prices)
+
+    parquet_path, meta_path = _paths(name, store_dir)
+    meta = {
+        "name": name,
+        "n_rows": int(len(table)),
+        "n_with_prices": int(table["n_obs"].notna().sum()) if "n_obs" in table.columns else 0,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+    }
+    try:
+        parquet_path.parent.mkdir(parents=True, exist_ok=True)
+        table.to_parquet(parquet_path)
+        with open(meta_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+    except Exception as e:
+        logger.warning("Screener-Tabelle %s konnte nicht gespeichert werden: %s", name, e)
+
+    _TABLES.pop((name, str(parquet_path)), None)
+    return table
+
+
+# ---------------------------------------------------------
+# Laden & Abfragen
+# ---------------------------------------------------------
+
+def _column_arrays(table: pd.DataFrame) -> Dict[str, np.ndarray]:
+    arrays = {}
+    for col in table.columns:
+        s = table[col]
+        if isinstance(s.dtype, pd.CategoricalDtype):
+            arrays[col] = s.cat.codes.to_numpy()
+        elif pd.api.types.is_numeric_dtype(s) and not pd.api.types.is_bool_dtype(s):
+            arrays[col] = s.to_numpy(dtype=float)
+        else:
+            arrays[col] = s.to_numpy(dtype=object)
+    return arrays
+
+
+def load_screener_table(name: str = "etf", store_dir=None) -> Optional[pd.DataFrame]:
+    """Materialisierte Tabelle (im Speicher gehalten, neu gelesen wenn die Datei neuer ist)."""
+    parquet_path, _ = _paths(name, store_dir)
+    if not parquet_path.exists():
+        return None
+    key = (name, str(parquet_path))
+    mtime = parquet_path.stat().st_mtime
+    hit = _TABLES.get(key)
+    if hit is None or hit[0] != mtime:
+        table = pd.read_parquet(parquet_path)
+        _TABLES[key] = (mtime, table, _column_arrays(table))
+    return _TABLES[key][1]
+
+
+def _arrays_for(table: pd.DataFrame) -> Dict[str, np.ndarray]:
+    for _, t, arrays in _TABLES.values():
+        if t is table:
+            return arrays
+    return _column_arrays(table)
+
+
+def _predicate(table: pd.DataFrame, arrays: dict, col: str, op: str, value, keep_na: bool) -> np.ndarray:
+    arr = arrays[col]
+    s = table[col]
+
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        cats = s.cat.categories
+        values = value if op in ("in", "not in") else [value]
+        codes = np.array([cats.get_loc(v) for v in values if v in cats], dtype=arr.dtype)
+        mask = np.isin(arr, codes)
+        if op in ("!=", "not in"):
+            mask = ~mask & (arr >= 0)
+        elif op not in ("==", "in"):
+            raise ValueError(f"Operator '{op}' ist für Kategorie '{col}' nicht erlaubt.")
+        return mask | (keep_na & (arr < 0))
+
+    if op in ("in", "not in"):
+        mask = np.isin(arr, list(value))
+        return ~mask if op == "not in" else mask
+    if op == "between":
+        lo, hi = value
+        with np.errstate(invalid="ignore"):
+            mask = (arr >= lo) & (arr <= hi)
+    elif op in OPS:
+        if arr.dtype == object:
+            mask = OPS[op](arr, value).astype(bool)
+        else:
+            with np.errstate(invalid="ignore"):
+                mask = OPS[op](arr, float(value))
+    else:
+        raise ValueError(f"Unbekannter Operator '{op}'.")
+
+    if keep_na and arr.dtype != object:
+        mask |= np.isnan(arr)
+    return mask
+
+
+def query_screener(filters: Optional[List[tuple]] = None, sort_by=None, ascending=False,
+                   limit: Optional[int] = None, columns: Optional[List[str]] = None,
+                   name: str = "etf", table: Optional[pd.DataFrame] = None, store_dir=None) -> pd.DataFrame:
+    """
+    Filtert und sortiert die Screener-Tabelle.
+
+    filters : Liste von (Spalte, Operator, Wert[, keep_na]); Operatoren wie in
+              rule_engine.OPS sowie "in", "not in", "between". Leere Werte
+              (None, "", "Alle") werden ignoriert. keep_na=True lässt fehlende
+              Werte durch (z.B. TER unbekannt).
+    sort_by   : Spalte oder Liste von Spalten; ascending als bool oder Liste.
+                Fehlende Werte stehen immer am Ende.
+    limit     : Top-N (bei einer Sortierspalte per argpartition).
+    """
+    if table is None:
+        table = load_screener_table(name, store_dir)
+        if table is None:
+            return pd.DataFrame()
+    arrays = _arrays_for(table)
+
+    mask = np.ones(len(table), dtype=bool)
+    for f in filters or []:
+        col, op, value = f[:3]
+        keep_na = bool(f[3]) if len(f) > 3 else False
+        if value is None or (isinstance(value, str) and value in ("", "Alle")) or col not in arrays:
+            continue
+        mask &= _predicate(table, arrays, col, op, value, keep_na)
+    idx = np.flatnonzero(mask)
+
+    if sort_by is not None:
+        keys = [sort_by] if isinstance(sort_by, str) else list(sort_by)
+        asc = [ascending] * len(keys) if isinstance(ascending, bool) else list(ascending)
+        sort_arrays = []
+        for col, a in zip(keys, asc):
+            arr = arrays[col][idx]
+            if arr.dtype == object:
+                arr = pd.Series(arr).rank(method="dense").to_numpy()
+            arr = arr.astype(float)
+            arr = np.where(np.isnan(arr), np.inf, arr if a else -arr)
+            sort_arrays.append(arr)
+
+        if limit is not None and len(keys) == 1 and limit < len(idx):
+            top = np.argpartition(sort_arrays[0], limit - 1)[:limit]
+            idx = idx[top[np.argsort(sort_arrays[0][top], kind="stable")]]
+        else:
+            idx = idx[np.lexsort(sort_arrays[::-1])]
+
+    if limit is not None:
+        idx = idx[:limit]
+
+    out = table.iloc[idx]
+    return out[columns] if columns is not None else out
+
+
+def rank_screener(table: pd.DataFrame, weights: Dict[str, float]) -> pd.Series:
+    """Score = Σ Gewicht * z-Score(Spalte) (ddof=0) über die übergebenen Zeilen."""
+    score = np.zeros(len(table))
+    for col, w in weights.items():
+        if col not in table.columns:
+            continue
+        x = table[col].to_numpy(dtype=float)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            z = (x - np.nanmean(x)) / np.nanstd(x)
+        score += w * np.nan_to_num(z)
+    return pd.Series(score, index=table.index, name="Score")
+
+
+def clear_screener_cache():
+    """Leert den In-Memory-Cache (abgelegte Dateien bleiben erhalten)."""
+    _TABLES.clear()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    for universe_name in UNIVERSES:
+        t = materialize_screener(universe_name)
+        logger.info("Screener %s: %d Zeilen", universe_name, len(t))
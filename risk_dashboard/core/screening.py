@@ -1,18 +1,187 @@
+import warnings
+
+import numpy as np
 import pandas as pd
 from typing import Tuple, Dict, List, Any
 from risk_dashboard.ui.helpers import passes_liquidity, normalize_ticker
 
+# ---------------------------------------------------------
+# Faktor-Engine (Querschnitt, alle Rebalancing-Termine auf einmal)
+# ---------------------------------------------------------
+#
+# Momentum wird wie bisher auf der eigenen Historie jeder Aktie gemessen
+# (n Beobachtungen zurück, nicht n Kalenderzeilen). Dazu werden die gültigen
+# Kurse jeder Spalte linksbündig verdichtet; für jeden Termin ergibt sich die
+# Position der letzten Beobachtung aus der kumulierten Anzahl, und alle
+# Horizonte sind ein Gather auf der verdichteten Matrix.
+
+MOMENTUM_HORIZONS = {"momentum_3m": 63, "momentum_6m": 126, "momentum_12m": 252}
+MOMENTUM_WEIGHTS = {"momentum_3m": 0.3, "momentum_6m": 0.3, "momentum_12m": 0.4}
+SCORE_WEIGHTS = {"momentum": 0.4, "quality": 0.3, "value": 0.3}
+MIN_HISTORY = 60
+MIN_VOLUME = 10000
+
+
+def rebalance_dates(index: pd.DatetimeIndex, freq: str = "ME") -> pd.DatetimeIndex:
+    """Letzter Handelstag je Periode (freq wie resample: 'ME', 'QE', 'YE', 'W-FRI')."""
+    index = pd.DatetimeIndex(index).sort_values()
+    last = pd.Series(index, index=index).resample(freq).last().dropna()
+    return pd.DatetimeIndex(last.to_numpy())
+
+
+def _as_dates(index: pd.Index, dates) -> pd.Index:
+    """Termine im Typ des Kursindex (nur Datumsindizes werden nach DatetimeIndex gewandelt)."""
+    return pd.DatetimeIndex(dates) if isinstance(index, pd.DatetimeIndex) else pd.Index(dates)
+
+
+def _compact(prices: pd.DataFrame, dates: pd.DatetimeIndex) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (C, K): C = gültige Kurse je Spalte linksbündig (NaN-Padding unten),
+    K = Anzahl gültiger Kurse bis einschließlich Termin (Termine x Spalten).
+    """
+    X = prices.to_numpy(dtype=float)
+    valid = np.isfinite(X)
+    n = valid.sum(axis=0)
+    C = np.full((max(int(n.max()) if n.size else 0, 1), X.shape[1]), np.nan)
+    for j in np.flatnonzero(n):
+        C[:n[j], j] = X[valid[:, j], j]
+    rows = prices.index.searchsorted(dates, side="right")
+    counts = np.vstack([np.zeros((1, X.shape[1]), dtype=int), np.cumsum(valid, axis=0)])
+    return C, counts[rows]
+
+
+def momentum_panel(prices: pd.DataFrame, dates=None) -> Dict[str, pd.DataFrame]:
+    """
+    3/6/12-Monats-Momentum und gewichtetes Momentum (wie momentum()) für alle
+    Spalten und Termine. Zu kurze Historien ergeben 0 (wie momentum()).
+    """
+    prices = prices.sort_index()
+    dates = prices.index if dates is None else _as_dates(prices.index, dates)
+    C, K = _compact(prices, dates)
+    last = np.take_along_axis(C, np.maximum(K - 1, 0), axis=0)
+
+    out = {}
+    combined = np.zeros(K.shape)
+    for name, h in MOMENTUM_HORIZONS.items():
+        back = np.take_along_axis(C, np.maximum(K - 1 - h, 0), axis=0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mom = np.where(K > h, last / back - 1, 0.0)
+        mom = np.where(np.isfinite(mom), mom, 0.0)
+        out[name] = pd.DataFrame(mom, index=dates, columns=prices.columns)
+        combined += MOMENTUM_WEIGHTS[name] * mom
+    out["momentum"] = pd.DataFrame(combined, index=dates, columns=prices.columns)
+    out["history"] = pd.DataFrame(K, index=dates, columns=prices.columns)
+    return out
+
+
+def _broadcast(values, dates, columns) -> np.ndarray:
+    """Statische Kennzahl (Series je Ticker) oder Panel (Termine x Ticker) -> Matrix."""
+    if isinstance(values, pd.DataFrame):
+        values = values.reindex(columns=columns)
+        return values.reindex(values.index.union(dates)).sort_index().ffill().loc[dates].to_numpy()
+    values = pd.Series(values).reindex(columns)
+    return np.broadcast_to(values.to_numpy(dtype=object), (len(dates), len(columns)))
+
+
+def _numeric(values) -> np.ndarray:
+    """Beliebige Werte -> float-Matrix, nicht Numerisches -> NaN."""
+    return pd.DataFrame(values).apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+
+
+def quality_scores(market_cap) -> np.ndarray:
+    """Wie quality(): mc / (1e9 + mc), ungültige oder negative Werte -> 0."""
+    mc = _numeric(market_cap)
+    with np.errstate(invalid="ignore"):
+        return np.where(mc >= 0, mc / (1e9 + np.where(mc >= 0, mc, 0.0)), 0.0)
+
+
+def value_scores(pe_ratio) -> np.ndarray:
+    """Wie value_score(): 1 / KGV bei positivem KGV, sonst 0."""
+    pe = _numeric(pe_ratio)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(pe > 0, 1.0 / np.where(pe > 0, pe, 1.0), 0.0)
+
+
+def _cross_section(raw: np.ndarray, eligible: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """z-Score (ddof=0) und Rang (1 = bester) je Zeile über die zulässigen Titel."""
+    x = np.where(eligible, raw, np.nan)
+    with warnings.catch_warnings(), np.errstate(invalid="ignore", divide="ignore"):
+        warnings.simplefilter("ignore", RuntimeWarning)      # Termine ohne zulässige Titel
+        mean = np.nanmean(x, axis=1, keepdims=True)
+        std = np.nanstd(x, axis=1, keepdims=True)
+        z = np.where(std > 0, (x - mean) / std, np.where(eligible, 0.0, np.nan))
+    rank = pd.DataFrame(x).rank(axis=1, ascending=False, method="first").to_numpy()
+    return z, rank
+
+
+def factor_panel(prices: pd.DataFrame, meta: Dict[str, Any] = None, dates=None,
+                 freq: str = "ME", min_history: int = MIN_HISTORY) -> Dict[str, Any]:
+    """
+    Momentum (3/6/12M, kombiniert), Quality, Value und Gesamt-Score für ein
+    Universum an allen Rebalancing-Terminen.
+
+    Parameters
+    ----------
+    prices : Kurse (Datum x Ticker)
+    meta : optional {"market_cap": ..., "pe_ratio": ..., "avg_daily_volume": ...},
+           jeweils Series je Ticker (statisch) oder DataFrame (Datum x Ticker)
+    dates : Termine; sonst rebalance_dates(prices.index, freq)
+    min_history : Mindestanzahl Kurse bis zum Termin (wie screen_and_rank)
+
+    Returns
+    -------
+    dict
+        raw / zscore / rank : dict Faktor -> DataFrame (Termine x Ticker)
+        eligible : DataFrame bool (Historie und Liquidität ausreichend)
+    """
+    prices = prices.sort_index()
+    dates = rebalance_dates(prices.index, freq) if dates is None else _as_dates(prices.index, dates)
+    columns = prices.columns
+    meta = meta or {}
+
+    mom = momentum_panel(prices, dates)
+    eligible = mom.pop("history").to_numpy() >= min_history
+    if "avg_daily_volume" in meta:
+        eligible &= _numeric(_broadcast(meta["avg_daily_volume"], dates, columns)) >= MIN_VOLUME
+
+    zeros = np.zeros((len(dates), len(columns)))
+    raw = {key: frame.to_numpy() for key, frame in mom.items()}
+    raw["quality"] = quality_scores(_broadcast(meta["market_cap"], dates, columns)) if "market_cap" in meta else zeros
+    raw["value"] = value_scores(_broadcast(meta["pe_ratio"], dates, columns)) if "pe_ratio" in meta else zeros
+    raw["score"] = sum(w * raw[key] for key, w in SCORE_WEIGHTS.items())
+
+    result = {"raw": {}, "zscore": {}, "rank": {}}
+    for key, values in raw.items():
+        z, rank = _cross_section(values, eligible)
+        result["raw"][key] = pd.DataFrame(np.where(eligible, values, np.nan), index=dates, columns=columns)
+        result["zscore"][key] = pd.DataFrame(z, index=dates, columns=columns)
+        result["rank"][key] = pd.DataFrame(rank, index=dates, columns=columns)
+    result["eligible"] = pd.DataFrame(eligible, index=dates, columns=columns)
+    return result
+
+
+def top_n_weights(scores: pd.DataFrame, top_n: int = 20) -> pd.DataFrame:
+    """Gleichgewichtete Top-N-Portfolios je Termin (Termine x Ticker, Zeilensumme 1)."""
+    rank = scores.rank(axis=1, ascending=False, method="first")
+    held = (rank <= top_n).to_numpy()
+    count = held.sum(axis=1, keepdims=True)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        weights = np.where(held, 1.0 / np.where(count > 0, count, 1), 0.0)
+    return pd.DataFrame(weights, index=scores.index, columns=scores.columns)
+
+
+# ---------------------------------------------------------
+# Skalare Varianten (einzelne Aktie)
+# ---------------------------------------------------------
+
 def momentum(series: pd.Series) -> float:
     # robust: berechne Renditen nur, wenn genügend Werte vorhanden und handle NaNs
     s = series.dropna()
     if s.empty:
         return 0.0
-    def pct(n):
-        if len(s) > n:
-            val = s.pct_change(n).iloc[-1]
-            return float(val) if pd.notna(val) else 0.0
-        return 0.0
-    return 0.3 * pct(63) + 0.3 * pct(126) + 0.4 * pct(252)
+    # positionsbasiert wie bisher: funktioniert für Datums-, Range- und String-Index
+    s = s.reset_index(drop=True)
+    return float(momentum_panel(s.to_frame(), s.index[-1:])["momentum"].iloc[0, 0])
 
 def quality(ticker_meta: Dict[str, Any]) -> float:
     mc = ticker_meta.get("market_cap") or 0
@@ -40,14 +209,13 @@ def screen_and_rank(
     price_history: dict[ticker] -> pd.Series (Adj Close)
     returns: (selected_tickers, scores_dict)
     """
-    scores: Dict[str, float] = {}
-
     # Wenn universe_meta ein dict ist, konvertiere zu DataFrame-ähnlicher Iteration
     if isinstance(universe_meta, dict):
         items = universe_meta.items()
     else:
         items = universe_meta.iterrows()
 
+    eligible: Dict[str, Dict[str, Any]] = {}
     for _, meta in items:
         # meta kann Series (DataFrame row) oder dict sein
         if isinstance(meta, pd.Series):
@@ -64,13 +232,22 @@ def screen_and_rank(
             continue
 
         series = price_history.get(t)
-        if series is None or len(series.dropna()) < 60:
+        if series is None or len(series.dropna()) < MIN_HISTORY:
             continue
 
-        m = momentum(series)
-        q = quality(meta_dict)
-        v = value_score(meta_dict)
-        scores[t] = 0.4 * m + 0.3 * q + 0.3 * v
+        eligible[t] = meta_dict
+
+    if not eligible:
+        return [], {}
+
+    # alle Faktoren in einem Durchlauf über das Panel (letzter Kurs jeder Aktie);
+    # positionsbasiert ausgerichtet, damit auch Reihen ohne Datumsindex funktionieren
+    prices = pd.DataFrame({t: price_history[t].dropna().reset_index(drop=True) for t in eligible})
+    meta_df = pd.DataFrame.from_dict(eligible, orient="index")
+    meta = {key: meta_df[key] for key in ("market_cap", "pe_ratio") if key in meta_df.columns}
+    factors = factor_panel(prices, meta, dates=prices.index[-1:], min_history=0)
+    score = factors["raw"]["score"].iloc[0]
+    scores: Dict[str, float] = {t: float(score[t]) for t in eligible}
 
     # sortiere nach Score und gib Top N zurück
     ranked = sorted(scores.items(), key=lambda kv: kv[1], reverse=True)
@@ -0,0 +1,158 @@
+# risk_dashboard/core/sensitivity.py
+"""
+Sensitivitäts-Service für die Risiko-Slider.
+
+Für ein Land wird der vektorisierte Score-Kernel einmal auf einem Gitter je
+Slider-Parameter ausgewertet (alle Parameter in einem Batch). Daraus entstehen
+Partial-Dependence-Kurven und ein Tornado-Ranking. Während ein Slider bewegt
+wird, kommen die Scores per Interpolation aus der Kurve; beim Loslassen wird
+exakt mit compute_risk_scores neu gerechnet.
+"""
+from __future__ import annotations
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from risk_dashboard.core.risk_model import (
+    RISK_PARAM_KEYS,
+    SCORE_KEYS,
+    _params_key,
+    compute_risk_scores,
+    compute_risk_scores_matrix,
+    params_to_matrix,
+)
+
+# Wertebereiche der Slider (alles andere: 0..1)
+PARAM_RANGES: Dict[str, tuple] = {k: (0.0, 1.0) for k in RISK_PARAM_KEYS}
+PARAM_RANGES.update({
+    "verschuldung": (0.0, 2.0),
+    "FX_Schockempfindlichkeit": (0.0, 2.0),
+    "Reserven_Monate": (0.0, 24.0),
+})
+
+DEFAULT_GRID_POINTS = 41
+
+_SURFACE_CACHE: "OrderedDict[tuple, dict]" = OrderedDict()
+_SURFACE_CACHE_MAX = 256
+
+
+# ---------------------------------------------------------
+# Response Surfaces
+# ---------------------------------------------------------
+
+def build_response_surface(params: dict, keys: Optional[List[str]] = None,
+                           n_points: int = DEFAULT_GRID_POINTS) -> dict:
+    """
+    Wertet alle Scores auf einem Gitter je Parameter aus (ein Kernel-Aufruf).
+
+    Returns
+    -------
+    dict
+        keys   : Liste der Parameter
+        grid   : (K x n_points) Gitterwerte
+        scores : (K x n_points x len(SCORE_KEYS)) Scores
+        base   : Scores der unveränderten Parameter
+        params : Kopie der Basis-Parameter
+    """
+    keys = list(keys) if keys is not None else list(RISK_PARAM_KEYS)
+    n_points = max(2, int(n_points))
+
+    cache_key = (_params_key(params), tuple(keys), n_points)
+    hit = _SURFACE_CACHE.get(cache_key)
+    if hit is not None:
+        _SURFACE_CACHE.move_to_end(cache_key)
+        return hit
+
+    base_row = params_to_matrix([params])[0]
+    grid = np.vstack([np.linspace(*PARAM_RANGES.get(k, (0.0, 1.0)), n_points) for k in keys])
+
+    # Ein Block pro Parameter: Basiszeile wiederholen, eine Spalte variieren
+    X = np.repeat(base_row[None, :], len(keys) * n_points, axis=0)
+    for i, k in enumerate(keys):
+        X[i * n_points:(i + 1) * n_points, RISK_PARAM_KEYS.index(k)] = grid[i]
+
+    S = compute_risk_scores_matrix(np.vstack([X, base_row[None, :]]))
+    surface = {
+        "keys": keys,
+        "grid": grid,
+        "scores": S[:-1].reshape(len(keys), n_points, len(SCORE_KEYS)),
+        "base": dict(zip(SCORE_KEYS, S[-1].tolist())),
+        "params": dict(params),
+    }
+
+    _SURFACE_CACHE[cache_key] = surface
+    while len(_SURFACE_CACHE) > _SURFACE_CACHE_MAX:
+        _SURFACE_CACHE.popitem(last=False)
+    return surface
+
+
+def country_surface(land: str, presets: Dict[str, dict], **kwargs) -> dict:
+    """Response Surface für ein Land aus den Presets."""
+    if land not in presets:
+        raise KeyError(f"Land '{land}' nicht in presets.")
+    return build_response_surface(presets[land], **kwargs)
+
+
+# ---------------------------------------------------------
+# Slider-Feedback
+# ---------------------------------------------------------
+
+def preview_scores(surface: dict, key: str, value: float) -> Dict[str, float]:
+    """
+    Schnelle Scores für einen bewegten Slider (lineare Interpolation auf dem Gitter).
+    Alle übrigen Parameter bleiben auf dem Stand der Surface.
+    """
+    if key not in surface["keys"]:
+        raise KeyError(f"Parameter '{key}' nicht in der Surface.")
+    i = surface["keys"].index(key)
+    grid = surface["grid"][i]
+    curves = surface["scores"][i]
+    return {
+        s: float(np.interp(value, grid, curves[:, j]))
+        for j, s in enumerate(SCORE_KEYS)
+    }
+
+
+def release_scores(params: dict, key: str, value: float) -> Dict[str, float]:
+    """Exakte Scores beim Loslassen des Sliders."""
+    new_params = dict(params)
+    new_params[key] = value
+    return compute_risk_scores(new_params)
+
+
+# ---------------------------------------------------------
+# Partial Dependence & Tornado
+# ---------------------------------------------------------
+
+def partial_dependence_frame(surface: dict, target: str = "total") -> pd.DataFrame:
+    """Long-Format: parameter | wert | score (für target)."""
+    j = SCORE_KEYS.index(target)
+    K, n = surface["grid"].shape
+    return pd.DataFrame({
+        "parameter": np.repeat(surface["keys"], n),
+        "wert": surface["grid"].reshape(-1),
+        "score": surface["scores"][:, :, j].reshape(-1),
+    })
+
+
+def tornado_ranking(surface: dict, target: str = "total") -> pd.DataFrame:
+    """
+    Tornado-Ranking: Score am unteren und oberen Rand jedes Slider-Bereichs,
+    sortiert nach Spannweite.
+    """
+    j = SCORE_KEYS.index(target)
+    curves = surface["scores"][:, :, j]
+    low = curves[:, 0]
+    high = curves[:, -1]
+
+    df = pd.DataFrame({
+        "parameter": surface["keys"],
+        "score_min": low,
+        "score_max": high,
+        "basis": surface["base"][target],
+        "spannweite": np.abs(high - low),
+        "max_effekt": curves.max(axis=1) - curves.min(axis=1),
+    })
+    return df.sort_values("max_effekt", ascending=False).reset_index(drop=True)
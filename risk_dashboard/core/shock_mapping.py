@@ -1,5 +1,10 @@
 # core/shock_mapping.py
 
+from itertools import combinations, product
+
+import numpy as np
+import pandas as pd
+
 SHOCK_MAP = {
     "Ã–lpreis +50%": {
         "macro": 0.2,
@@ -69,33 +74,146 @@ SHOCK_MAP = {
 }
 
 
+SHOCK_DIMS = [
+    "macro",
+    "geo",
+    "governance",
+    "handel",
+    "supply_chain",
+    "financial",
+    "tech",
+    "energie",
+    "currency",
+    "political_security",
+    "strategische_autonomie"
+]
+
+
+def compile_shock_matrix(shock_map=None):
+    """SHOCK_MAP -> (Ereignisnamen, Matrix Ereignisse x SHOCK_DIMS)."""
+    shock_map = SHOCK_MAP if shock_map is None else shock_map
+    events = list(shock_map.keys())
+    col = {d: j for j, d in enumerate(SHOCK_DIMS)}
+    M = np.zeros((len(events), len(SHOCK_DIMS)))
+    for i, name in enumerate(events):
+        for dim, base_value in shock_map[name].items():
+            M[i, col[dim]] = base_value
+    return events, M
+
+
+SHOCK_EVENTS, SHOCK_MATRIX = compile_shock_matrix()
+_EVENT_INDEX = {name: i for i, name in enumerate(SHOCK_EVENTS)}
+
+
+def events_to_intensity_matrix(event_lists):
+    """Liste von Ereignislisten -> Intensitätsmatrix (Kombinationen x SHOCK_EVENTS)."""
+    event_lists = list(event_lists)
+    I = np.zeros((len(event_lists), len(SHOCK_EVENTS)))
+    for r, event_list in enumerate(event_lists):
+        for event in event_list:
+            i = _EVENT_INDEX.get(event["type"])
+            if i is not None:
+                I[r, i] += event["intensity"]
+    return I
+
+
+def shocks_from_intensities(I):
+    """Batch: (Kombinationen x SHOCK_EVENTS) -> (Kombinationen x SHOCK_DIMS), nach oben auf 1 begrenzt."""
+    I = np.atleast_2d(np.asarray(I, dtype=float))
+    return np.minimum(I @ SHOCK_MATRIX, 1.0)
+
+
 def convert_events_to_shocks(event_list):
-    result = {
-        "macro": 0,
-        "geo": 0,
-        "governance": 0,
-        "handel": 0,
-        "supply_chain": 0,
-        "financial": 0,
-        "tech": 0,
-        "energie": 0,
-        "currency": 0,
-        "political_security": 0,
-        "strategische_autonomie": 0
-    }
+    shocks = shocks_from_intensities(events_to_intensity_matrix([event_list]))[0]
+    return {dim: float(v) for dim, v in zip(SHOCK_DIMS, shocks)}
+
+
+# ---------------------------------------------------------
+# Schocks auf Risiko-Scores anwenden
+# ---------------------------------------------------------
+
+def apply_shocks_to_scores(base_scores, shocks):
+    """
+    Basis-Scores (Länder x Dimensionen, DataFrame aus risk_scores_table oder
+    einzelnes Score-Dict) + Schockmatrix (Kombinationen x SHOCK_DIMS).
+
+    Schocks erhöhen die Risiko-Dimensionen und senken die strategische
+    Autonomie; Ergebnis wird auf [0, 1] geclippt, 'total' neu gewichtet.
+    Liefert Array (Länder x Kombinationen x SCORE_KEYS).
+    """
+    from risk_dashboard.core.risk_model import SCORE_KEYS, TOTAL_WEIGHTS
+
+    if isinstance(base_scores, pd.DataFrame):
+        B = base_scores[SCORE_KEYS].to_numpy(dtype=float)
+    else:
+        B = np.array([[float(base_scores[k]) for k in SCORE_KEYS]])
+
+    shocks = np.atleast_2d(np.asarray(shocks, dtype=float))
+    delta = np.zeros((shocks.shape[0], len(SCORE_KEYS)))
+    for j, dim in enumerate(SHOCK_DIMS):
+        sign = -1.0 if dim == "strategische_autonomie" else 1.0
+        delta[:, SCORE_KEYS.index(dim)] = sign * shocks[:, j]
+
+    out = np.clip(B[:, None, :] + delta[None, :, :], 0.0, 1.0)
+    w = np.array([TOTAL_WEIGHTS.get(k, 0.0) for k in SCORE_KEYS])
+    out[:, :, SCORE_KEYS.index("total")] = out @ w
+    return out
+
+
+def event_combinations(k=2, intensities=(0.5, 1.0), events=None):
+    """
+    Alle Kombinationen von genau k Ereignissen mit allen Intensitätsstufen.
+    Liefert (Liste der Ereignis-Tupel, Liste der Intensitäts-Tupel, Intensitätsmatrix).
+    """
+    events = SHOCK_EVENTS if events is None else [e for e in events if e in _EVENT_INDEX]
+    idx = np.array([[_EVENT_INDEX[e] for e in c] for c in combinations(events, k)], dtype=int)
+    levels = np.array(list(product(intensities, repeat=k)), dtype=float)
+
+    if idx.size == 0:
+        return [], [], np.zeros((0, len(SHOCK_EVENTS)))
+
+    n_c, n_l = len(idx), len(levels)
+    ev = np.repeat(idx, n_l, axis=0)
+    lv = np.tile(levels, (n_c, 1))
+
+    I = np.zeros((n_c * n_l, len(SHOCK_EVENTS)))
+    np.put_along_axis(I, ev, lv, axis=1)
+
+    names = [tuple(SHOCK_EVENTS[i] for i in row) for row in ev]
+    return names, [tuple(row) for row in lv.tolist()], I
+
+
+def worst_event_combinations(base_scores, k=2, intensities=(0.5, 1.0), target="total",
+                             top=10, events=None):
+    """
+    Erschöpfende Suche nach den k-Ereignis-Kombinationen mit dem höchsten
+    Ziel-Score (ein Matmul + Clip für alle Kombinationen und Länder).
 
-    for event in event_list:
-        name = event["type"]
-        intensity = event["intensity"]
+    base_scores: Score-Dict eines Landes oder DataFrame aus risk_scores_table.
+    Liefert DataFrame: Land | rang | ereignisse | intensitaeten | <target> | Scores.
+    """
+    from risk_dashboard.core.risk_model import SCORE_KEYS
 
-        if name not in SHOCK_MAP:
-            continue
+    names, levels, I = event_combinations(k, intensities, events)
+    if not names:
+        return pd.DataFrame(columns=["Land", "rang", "ereignisse", "intensitaeten"] + SCORE_KEYS)
 
-        for dim, base_value in SHOCK_MAP[name].items():
-            result[dim] += base_value * intensity
+    scored = apply_shocks_to_scores(base_scores, shocks_from_intensities(I))
+    lands = list(base_scores.index) if isinstance(base_scores, pd.DataFrame) else [None]
 
-    # clamp to [0,1]
-    for k in result:
-        result[k] = min(1.0, result[k])
+    j = SCORE_KEYS.index(target)
+    top = max(1, min(int(top), len(names)))
+    # Autonomie: "schlimmste" Kombination = niedrigster Wert
+    sign = 1.0 if target == "strategische_autonomie" else -1.0
 
-    return result
\ No newline at end of file
+    rows = []
+    for c, land in enumerate(lands):
+        vals = sign * scored[c, :, j]
+        best = np.argpartition(vals, top - 1)[:top]
+        best = best[np.argsort(vals[best], kind="stable")]
+        for rang, r in enumerate(best, start=1):
+            row = {"Land": land, "rang": rang,
+                   "ereignisse": " + ".join(names[r]), "intensitaeten": levels[r]}
+            row.update(dict(zip(SCORE_KEYS, scored[c, r].tolist())))
+            rows.append(row)
+    return pd.DataFrame(rows)
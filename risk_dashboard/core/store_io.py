@@ -0,0 +1,52 @@
+# risk_dashboard/core/store_io.py
+"""
+Ablage abgeleiteter Indizes als Parquet-Tabellen plus JSON-Metadaten
+(unter cache/...). Schreibfehler werden geloggt, der Aufrufer arbeitet
+dann mit dem Ergebnis im Speicher weiter.
+
+data_version liefert den Inhalts-Hash, mit dem die Stores prüfen, ob ein
+abgelegtes Ergebnis noch zu den Eingangsdaten passt.
+"""
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+def data_version(df: pd.DataFrame) -> str:
+    """Inhalts-Hash eines DataFrames (Index + Werte + Spaltennamen)."""
+    h = hashlib.blake2b(digest_size=12)
+    h.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    h.update(json.dumps([str(c) for c in df.columns]).encode("utf-8"))
+    return h.hexdigest()
+
+
+def save_store(frames: Dict[Path, pd.DataFrame], meta_path: Path, meta: dict) -> bool:
+    """Schreibt alle Tabellen und die Metadaten; False, wenn das Schreiben scheitert."""
+    meta_path = Path(meta_path)
+    try:
+        meta_path.parent.mkdir(parents=True, exist_ok=True)
+        for path, frame in frames.items():
+            frame.to_parquet(path)
+        with open(meta_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+        return True
+    except Exception as e:
+        logger.warning("Store %s konnte nicht gespeichert werden: %s", meta_path.parent, e)
+        return False
+
+
+def load_store(frame_paths, meta_path: Path) -> Optional[Tuple[list, dict]]:
+    """(Tabellen in Reihenfolge von frame_paths, Metadaten) oder None, wenn eine Datei fehlt."""
+    paths = [Path(p) for p in frame_paths]
+    meta_path = Path(meta_path)
+    if not (meta_path.exists() and all(p.exists() for p in paths)):
+        return None
+    with open(meta_path, "r", encoding="utf-8") as f:
+        meta = json.load(f)
+    return [pd.read_parquet(p) for p in paths], meta
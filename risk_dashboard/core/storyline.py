@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 from typing import Dict
-from core.risk_model import compute_risk_scores
+from risk_dashboard.core.risk_model import compute_risk_scores
 from core.lexicon import load_lexicon
 
 
@@ -0,0 +1,45 @@
+# risk_dashboard/core/transition_matrix.py
+"""
+Hilfsfunktionen für Regime-Transitionsmatrizen, gemeinsam genutzt von
+regime_model (Prognosen) und portfolio_sim.regime_mc (Simulation).
+"""
+import numpy as np
+import pandas as pd
+
+
+def align_transition_matrix(trans: pd.DataFrame, regimes=None) -> pd.DataFrame:
+    """
+    Bringt eine (evtl. unvollständige) crosstab-Transitionsmatrix in eine
+    quadratische, zeilen-normierte Form.
+    Regime ohne beobachteten Übergang bleiben in sich selbst (absorbierend).
+    """
+    if regimes is None:
+        regimes = list(dict.fromkeys(list(trans.index) + list(trans.columns)))
+    regimes = [r for r in regimes if pd.notna(r)]
+
+    P = trans.reindex(index=regimes, columns=regimes).fillna(0.0).to_numpy(dtype=float)
+    P = np.clip(P, 0.0, None)
+
+    row_sums = P.sum(axis=1)
+    empty = row_sums <= 0
+    P[empty, :] = 0.0
+    P[empty, np.flatnonzero(empty)] = 1.0
+    P = P / P.sum(axis=1, keepdims=True)
+
+    out = pd.DataFrame(P, index=regimes, columns=regimes)
+    out.index.name = "From"
+    out.columns.name = "To"
+    return out
+
+
+def stationary_distribution(P: np.ndarray) -> np.ndarray:
+    """Stationäre Verteilung pi mit pi @ P = pi (Least-Squares, robust bei Singularität)."""
+    P = np.asarray(P, dtype=float)
+    k = P.shape[0]
+    A = np.vstack([P.T - np.eye(k), np.ones((1, k))])
+    b = np.zeros(k + 1)
+    b[-1] = 1.0
+    pi, *_ = np.linalg.lstsq(A, b, rcond=None)
+    pi = np.clip(pi, 0.0, None)
+    s = pi.sum()
+    return pi / s if s > 0 else np.full(k, 1.0 / k)
@@ -292,7 +292,8 @@ def analyze_portfolio_components(etf_universe: Dict[str, Dict[str, Any]],
                                  eq: float, bd: float, cs: float,
                                  vol_map: Dict[str, float],
                                  ter_threshold_warn: float = 0.01,
-                                 herfindahl_warn: float = 0.15):
+                                 herfindahl_warn: float = 0.15,
+                                 overlap_warn: float = 0.30):
     """
     Erweiterte Analyse mit Validierung, TER-Fix Vorschlag, Warnregeln und Audit.
     """
@@ -353,6 +354,21 @@ def analyze_portfolio_components(etf_universe: Dict[str, Dict[str, Any]],
     else:
         explanations.append(f"Herfindahl Index: {herfindahl:.4f} → Diversifikation erscheint ausreichend.")
 
+    # Tatsächliche Holdings-Überschneidung (MinHash-Index über data/holdings, exakt nur für Kandidaten)
+    try:
+        from risk_dashboard.core.holdings_overlap import get_overlap_index, overlap_pairs
+        overlap_index = get_overlap_index()
+        candidates = [n for n in dict.fromkeys(df["ticker"].tolist() + df["key"].tolist())
+                      if n in overlap_index["names"]]
+        pairs = overlap_pairs(overlap_index, candidates, threshold=overlap_warn)
+        for _, pair in pairs[pairs["flagged"]].iterrows():
+            explanations.append(
+                f"Holdings-Überschneidung {pair['etf_a']} / {pair['etf_b']}: "
+                f"{pair['weighted_overlap']*100:.1f}% gemeinsames Gewicht → deutliche Überschneidung."
+            )
+    except Exception as e:
+        logger.debug("Holdings-Überschneidung nicht verfügbar: %s", e)
+
     for w in ter_warnings:
         explanations.append(f"TER Validierung: {w}")
 
@@ -371,7 +387,8 @@ def analyze_portfolio_components(etf_universe: Dict[str, Dict[str, Any]],
     # UI display
     st.subheader("Analyse Panel")
     for ex in explanations:
-        if "sehr hoch" in ex or "deutliche Konzentration" in ex or "fehlend" in ex or "TER Validierung" in ex:
+        if ("sehr hoch" in ex or "deutliche Konzentration" in ex or "deutliche Überschneidung" in ex
+                or "fehlend" in ex or "TER Validierung" in ex):
             st.error(ex)
         else:
             st.info(ex)
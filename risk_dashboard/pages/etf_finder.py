@@ -13,6 +13,10 @@ logger = logging.getLogger("risk_dashboard.pages.etf_finder")
 # Lokale Hilfsfunktionen
 
 from risk_dashboard.data_cache import load_price_data_cached
+from risk_dashboard.core.metrics import performance_kernel
+from risk_dashboard.core.screener_store import etf_universe, load_screener_table, query_screener
+from risk_dashboard.core.etf_similarity import get_similarity_index, similar_etfs
+from risk_dashboard.core.dca_analysis import dca_grid, dca_distribution, plot_dca_heatmap, plot_dca_distribution
 
 
 # Optional: falls du Metadaten scrapen willst
@@ -28,20 +32,14 @@ def compute_metrics(price_df):
 
     price_df = price_df.ffill().bfill().dropna(axis=1, how="all")
     rets = price_df.pct_change().dropna(how="all")
-    ann_ret = (1 + rets.mean()) ** 252 - 1
-    ann_vol = rets.std() * np.sqrt(252)
-    sharpe = ann_ret / ann_vol.replace(0, np.nan)
+    m = performance_kernel(rets, kind="returns", periods_per_year=252, sharpe_basis="compound")
     momentum_12m = price_df.iloc[-1] / price_df.shift(252).iloc[-1] - 1
-    # Max Drawdown per ticker
-    cum = (1 + rets).cumprod()
-    dd = cum.div(cum.cummax()) - 1
-    max_dd = dd.min()
     metrics = pd.DataFrame({
-        "CAGR": ann_ret,
-        "Vol": ann_vol,
-        "Sharpe": sharpe,
+        "CAGR": m["ann_return"],
+        "Vol": m["vol"],
+        "Sharpe": m["sharpe"],
         "Momentum12M": momentum_12m,
-        "MaxDD": max_dd
+        "MaxDD": m["max_drawdown"]
     })
     return metrics
 
@@ -112,27 +110,49 @@ except Exception:
     else:
         meta_df = pd.DataFrame(index=tickers, data={"TER":[None]*len(tickers), "AUM_mio":[None]*len(tickers)})
 
+# TER/AUM aus der materialisierten Screener-Tabelle ergänzen, wo die Metadaten fehlen
+meta_df = meta_df.reindex(tickers)
+screener_table = load_screener_table("etf")
+if screener_table is not None:
+    known = screener_table.set_index(screener_table["yahoo"].astype(str))
+    known = known[~known.index.duplicated()]
+    meta_df["TER"] = pd.to_numeric(meta_df["TER"], errors="coerce").fillna(known["ter"].reindex(tickers))
+    meta_df["AUM_mio"] = pd.to_numeric(meta_df["AUM_mio"], errors="coerce").fillna(known["aum"].reindex(tickers))
+
 # TER/AUM Filter (konservativ: None = nicht automatisch ausschließen)
 ter_thresh = 0.5   # in %
 min_aum_mio = 50   # in Mio
-good = []
-for t in tickers:
-    try:
-        ter = float(meta_df.loc[t, "TER"]) if pd.notna(meta_df.loc[t, "TER"]) else None
-    except Exception:
-        ter = None
-    try:
-        aum = float(meta_df.loc[t, "AUM_mio"]) if pd.notna(meta_df.loc[t, "AUM_mio"]) else None
-    except Exception:
-        aum = None
-    if (ter is None or ter <= ter_thresh) and (aum is None or aum >= min_aum_mio):
-        good.append(t)
+meta_table = pd.DataFrame({
+    "ticker": tickers,
+    "TER": pd.to_numeric(meta_df["TER"], errors="coerce").to_numpy(),
+    "AUM_mio": pd.to_numeric(meta_df["AUM_mio"], errors="coerce").to_numpy(),
+})
+good = set(query_screener(
+    filters=[("TER", "<=", ter_thresh, True), ("AUM_mio", ">=", min_aum_mio, True)],
+    table=meta_table,
+)["ticker"])
 
 filtered_tickers = [t for t in tickers if t in good]
 if not filtered_tickers and tickers:
     st.warning("Nach TER/AUM Filter sind keine ETFs übrig. Es wird das ursprüngliche Universe verwendet.")
     filtered_tickers = tickers.copy()
 
+# Ähnliche ETFs (günstigere / liquidere Alternativen) über Korrelationsdistanz
+with st.expander("Ähnliche ETFs finden"):
+    ref_ticker = st.text_input("Referenz-ETF (Ticker)", value=tickers[0] if tickers else "").strip()
+    if st.button("Ähnliche ETFs suchen") and ref_ticker:
+        sim_universe = list(dict.fromkeys([ref_ticker] + tickers + etf_universe()["yahoo"].astype(str).tolist()))
+        with st.spinner("Ähnlichkeitsindex aktualisieren..."):
+            sim_prices = load_price_data_cached(sim_universe, start="2010-01-01")
+        try:
+            sim_index = get_similarity_index(sim_prices, name="etf_finder")
+            similar = similar_etfs(sim_index, ref_ticker, k=10)
+            if screener_table is not None:
+                similar = similar.join(known[["name", "ter", "aum"]], on="ticker")
+            st.dataframe(similar)
+        except Exception as e:
+            st.warning(f"Keine ähnlichen ETFs gefunden: {e}")
+
 # Button: Screen & Rank
 if st.button("Screen & Rank"):
     if not filtered_tickers:
@@ -424,3 +444,18 @@ if st.button(f"Backtest Top {top_n} (aus ETF Finder)"):
 
                 # sichere Anzeige
                 st.write(result.get("metrics", {}))
+
+
+# Sparplan-Analyse: alle Startmonate und Haltedauern in einem Durchlauf
+with st.expander("Sparplan-Analyse (alle Startmonate)"):
+    dca_tickers = [t for t in (top5 or available_universe) if t in price_df.columns]
+    if not dca_tickers:
+        st.info("Keine Preisdaten verfügbar. Wähle zuerst ETFs im Finder.")
+    else:
+        dca_amount = st.number_input("Monatliche Rate", min_value=10.0, value=100.0, step=10.0)
+        dca_metric = st.selectbox("Kennzahl", ["irr", "multiple", "final_value", "max_drawdown"])
+        dca_weights = {t: weights.get(t, 0.0) for t in dca_tickers} if weights else None
+        grid = dca_grid(price_df[dca_tickers], amount=dca_amount, weights=dca_weights)
+        st.plotly_chart(plot_dca_heatmap(grid, dca_metric), use_container_width=True)
+        st.plotly_chart(plot_dca_distribution(grid, dca_metric), use_container_width=True)
+        st.dataframe(dca_distribution(grid, dca_metric))
@@ -2,10 +2,16 @@
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
-from core.data.assets import fetch_price_history
+from core.data.assets import ASSET_BENCHMARKS, fetch_price_panel, get_asset_metrics_many
+from core.backend.ki_score import compute_ki_score
+from ui.plots import plot_radar
 
 def ui_bond_analysis(ticker):
-    series = fetch_price_history(ticker, period="1y")
+    # Asset und Benchmarks mit einem Download
+    benchmarks = {"correlation_spy": ASSET_BENCHMARKS["correlation_spy"]}
+    ticker = (ticker or "").strip().upper()
+    panel = fetch_price_panel([ticker] + list(benchmarks.values()))
+    series = panel[ticker].dropna() if ticker in panel.columns else None
 
     if not isinstance(series, pd.Series) or len(series) < 120:
         return pd.DataFrame([["Keine Daten"]], columns=["Info"]), None
@@ -22,16 +28,21 @@ def ui_bond_analysis(ticker):
         return pd.DataFrame([["Faktoren ungültig"]]), None
 
     # Radar
-    fig = plot_radar({ticker: factors})
+    fig = plot_radar(factors)
 
     # Kennzahlen
     returns = series.pct_change().dropna()
+    m = get_asset_metrics_many([ticker], benchmarks=benchmarks, prices=panel).iloc[0]
     df = pd.DataFrame({
-        "Kennzahl": ["Yield (approx.)", "Volatilität", "Max Drawdown"],
+        "Kennzahl": ["Yield (approx.)", "Volatilität", "Max Drawdown",
+                     "Performance 1J %", "Sharpe", "Korrelation SPY"],
         "Wert": [
             returns.mean() * 252,
             returns.std() * (252 ** 0.5),
-            (series / series.cummax() - 1).min()
+            (series / series.cummax() - 1).min(),
+            m["performance_1y"],
+            m["sharpe"],
+            m["correlation_spy"]
         ]
     })
 
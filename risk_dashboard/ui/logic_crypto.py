@@ -2,10 +2,16 @@
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
-from core.data.assets import fetch_price_history
+from core.data.assets import ASSET_BENCHMARKS, fetch_price_panel, get_asset_metrics_many
+from core.backend.ki_score import compute_ki_score
+from ui.plots import plot_radar
 
 def ui_crypto_analysis(ticker):
-    series = fetch_price_history(ticker, period="1y")
+    # Asset und Benchmarks mit einem Download
+    benchmarks = ASSET_BENCHMARKS
+    ticker = (ticker or "").strip().upper()
+    panel = fetch_price_panel([ticker] + list(benchmarks.values()))
+    series = panel[ticker].dropna() if ticker in panel.columns else None
 
     if not isinstance(series, pd.Series) or len(series) < 120:
         return pd.DataFrame([["Keine Daten"]], columns=["Info"]), None
@@ -20,14 +26,20 @@ def ui_crypto_analysis(ticker):
     if not isinstance(factors, dict):
         return pd.DataFrame([["Faktoren ungültig"]]), None
 
-    fig = plot_radar({ticker: factors})
+    fig = plot_radar(factors)
 
     returns = series.pct_change().dropna()
+    m = get_asset_metrics_many([ticker], benchmarks=benchmarks, prices=panel).iloc[0]
     df = pd.DataFrame({
-        "Kennzahl": ["Volatilität", "Sharpe‑Ratio"],
+        "Kennzahl": ["Volatilität", "Sharpe‑Ratio", "Performance 1J %", "Max Drawdown %",
+                     "Korrelation SPY", "Korrelation Gold"],
         "Wert": [
             returns.std() * (252 ** 0.5),
-            returns.mean() / (returns.std() + 1e-9)
+            returns.mean() / (returns.std() + 1e-9),
+            m["performance_1y"],
+            m["max_drawdown"],
+            m["correlation_spy"],
+            m["correlation_gold"]
         ]
     })
 
@@ -2,9 +2,33 @@
 from core.data.db_assets import ETF_DB, STOCK_DB, find_asset
 import pandas as pd
 from ui.logic_ki import get_ki_score
+from risk_dashboard.core.screener_store import load_screener_table, query_screener
+
+ETF_COLUMNS = ["ISIN", "Name", "Region", "Kategorie", "TER", "Volumen", "Replikation", "TD", "KI‑Score"]
+
+
+def _etf_from_table(region, category):
+    """Abfrage auf der materialisierten Screener-Tabelle (None, wenn keine vorhanden)."""
+    table = load_screener_table("etf")
+    if table is None:
+        return None
+    df = query_screener(
+        filters=[("region", "==", region), ("asset_class", "==", category)],
+        sort_by="aum", ascending=False, table=table,
+    )
+    return df.rename(columns={
+        "isin": "ISIN", "name": "Name", "region": "Region", "asset_class": "Kategorie",
+        "ter": "TER", "aum": "Volumen", "ki_score": "KI‑Score",
+    }).reindex(columns=ETF_COLUMNS)
 
 
 def ui_etf_screener(region, category):
+    df = _etf_from_table(region, category)
+    if df is not None:
+        if df.empty:
+            return pd.DataFrame([["Keine Ergebnisse"]], columns=["Info"])
+        return df
+
     df = pd.DataFrame(ETF_DB)
 
     if region:
@@ -21,20 +45,23 @@ def ui_etf_screener(region, category):
 
     df = df.sort_values("Volumen", ascending=False)
 
-    return df[[
-        "ISIN",
-        "Name",
-        "Region",
-        "Kategorie",
-        "TER",
-        "Volumen",
-        "Replikation",
-        "TD",
-        "KI‑Score"
-    ]]
+    return df[ETF_COLUMNS]
+
+
+STOCK_COLUMNS = ["Ticker", "Name", "Sektor", "Land", "KGV", "KUV", "PEG", "Debt/Equity", "Cashflow", "Wachstum", "KI‑Score"]
 
 
 def ui_stock_screener(sector, country):
+    table = load_screener_table("stocks")
+    if table is not None:
+        df = query_screener(
+            filters=[("Sektor", "==", sector), ("Land", "==", None if country == "Global" else country)],
+            sort_by="KGV", ascending=True, table=table,
+        )
+        if df.empty:
+            return pd.DataFrame([["Keine Ergebnisse"]], columns=["Info"])
+        return df.rename(columns={"ticker": "Ticker", "name": "Name", "ki_score": "KI‑Score"}).reindex(columns=STOCK_COLUMNS)
+
     df = pd.DataFrame(STOCK_DB)
 
     if sector and sector != "Alle":
@@ -51,16 +78,4 @@ def ui_stock_screener(sector, country):
 
     df = df.sort_values("KGV")
 
-    return df[[
-        "Ticker",
-        "Name",
-        "Sektor",
-        "Land",
-        "KGV",
-        "KUV",
-        "PEG",
-        "Debt/Equity",
-        "Cashflow",
-        "Wachstum",
-        "KI‑Score"
-    ]]
\ No newline at end of file
+    return df[STOCK_COLUMNS]
\ No newline at end of file
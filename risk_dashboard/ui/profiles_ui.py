@@ -25,9 +25,13 @@ from risk_dashboard.core.config import load_profiles, save_profile, load_etf_uni
 from risk_dashboard.core.utils import resolve_components, analyze_portfolio_components, classify_etf
 from risk_dashboard.core.backtest import run_all_etf_backtests
 from risk_dashboard.ui.helpers  import render_backtest, normalize_ticker, detect_type, safe_backtest_call
+from risk_dashboard.core.rule_engine import (
+    compile_rules, evaluate_rules, historical_regime_rules, HISTORICAL_REGIME_DEFAULT
+)
 
 from risk_dashboard.data.etf_universes import ETF_UNIVERSES
 from risk_dashboard.core.holdings import load_ishares_holdings, etf_to_isin_map, load_holdings_with_fallback
+from risk_dashboard.core.exposure_engine import build_exposure_model, look_through
 from risk_dashboard.core.macro_pipeline import (
     detect_regime,
     select_etfs_for_regime,
@@ -296,6 +300,16 @@ def compute_etf_breakdown(etf_market_value: float, holdings_df: pd.DataFrame, po
     h["abs_weight_in_portfolio"] = h["weight_in_etf"] * (etf_market_value / portfolio_value) if portfolio_value > 0 else 0.0
     return h
 
+def compute_portfolio_breakdown(etf_market_values: Dict[str, float], holdings_map: Dict[str, pd.DataFrame],
+                                portfolio_value: float) -> Dict[str, pd.Series]:
+    """
+    Look-Through aller ETFs auf einmal: Wertpapier-, Länder- und Regionsgewichte
+    im Portfolio (Gewicht = Marktwert / Portfoliowert, Holdings-Gewichte wie geliefert).
+    """
+    model = build_exposure_model(holdings_map, normalize=False)
+    weights = {etf: (mv / portfolio_value if portfolio_value > 0 else 0.0) for etf, mv in etf_market_values.items()}
+    return look_through(model, weights)
+
 def load_etf_holdings(uploaded_file):
     # read
     df = pd.read_csv(uploaded_file)
@@ -725,6 +739,15 @@ def render_etf_tab(session_state):
 
         holdings_map[etf] = hdf.copy() if (isinstance(hdf, pd.DataFrame) and not hdf.empty) else pd.DataFrame()
 
+    # Look-Through über alle gewählten ETFs (gleichgewichtet, dünnbesetzte Matrizen)
+    if any(not h.empty for h in holdings_map.values()):
+        with st.expander("Look-Through-Exposure (gleichgewichtet)"):
+            exposure = compute_portfolio_breakdown({etf: 1.0 for etf in holdings_map}, holdings_map, float(len(holdings_map)))
+            col_country, col_region = st.columns(2)
+            col_country.dataframe(exposure["country"].rename("Gewicht").to_frame())
+            col_region.dataframe(exposure["region"].rename("Gewicht").to_frame())
+            st.dataframe(exposure["security"].head(20).rename("Gewicht").to_frame())
+
 
 
     # Console logs (für dev)
@@ -923,27 +946,17 @@ def detect_historical_regimes(
             logger.debug(f"WARN: macro_df missing '{col}' column; filling with {default_value}")
             macro_df[col] = default_value
 
-    # Beispiel-Logik: einfache Regime-Klassifikation
-    regimes = []
-    for _, row in macro_df.iterrows():
-        # sichere Zugriffe mit .get (falls später weitere Keys fehlen)
-        infl = row.get("inflation", defaults.get("inflation", 0.0))
-        gdp = row.get("gdp", defaults.get("gdp", 0.0))
-        vol = row.get("volatility", defaults.get("volatility", 0.0))
-
-        # einfache Regeln (anpassbar)
-        if pd.isna(infl):
-            infl = defaults.get("inflation", 0.0)
-        if infl > inflation_threshold:
-            regimes.append("high_inflation")
-        elif vol > 0.2:  # Beispiel: hohe Volatilität
-            regimes.append("high_volatility")
-        elif gdp < 0:
-            regimes.append("recession")
-        else:
-            regimes.append("normal")
+    # Regeln (anpassbar): rule_engine.historical_regime_rules
+    data = pd.DataFrame(index=macro_df.index)
+    for col in ("inflation", "gdp", "volatility"):
+        data[col] = macro_df[col] if col in macro_df.columns else defaults.get(col, 0.0)
+    data["inflation"] = pd.to_numeric(data["inflation"], errors="coerce").fillna(defaults.get("inflation", 0.0))
+    regimes = evaluate_rules(
+        data,
+        compile_rules(historical_regime_rules(inflation_threshold), HISTORICAL_REGIME_DEFAULT),
+    )
 
-    return pd.Series(regimes, index=macro_df.index, name="regime")
+    return pd.Series(list(regimes), index=macro_df.index, name="regime")
 
 
 def profile_form_ui() -> None: